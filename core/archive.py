@@ -0,0 +1,299 @@
+# archive.py
+import os
+import threading
+import sqlite3
+import json
+import zlib
+import hashlib
+import time
+import argparse
+import logging
+from typing import List, Dict, Optional, Iterator
+
+from config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Endpoints dont la réponse contient une liste de matches
+MATCH_ENDPOINTS = ('/matches', '/competitions/{id}/matches', '/teams/{id}/matches')
+STANDINGS_ENDPOINTS = ('/competitions/{id}/standings',)
+TEAMS_ENDPOINTS = ('/competitions/{id}/teams',)
+
+
+def _season_of(data: Dict) -> Optional[int]:
+    """Année de début de la saison d'un payload archivé (filters.season, sinon season.startDate)"""
+    season = (data.get('filters') or {}).get('season')
+    if not season:
+        season = ((data.get('season') or {}).get('startDate') or '')[:4]
+    try:
+        return int(season)
+    except (TypeError, ValueError):
+        return None
+
+
+class PayloadArchive:
+    """Archive compressée et adressée par contenu (SHA-256) des réponses brutes de l'API
+
+    Chaque corps de réponse est stocké une seule fois sous
+    objects/<2 premiers caractères>/<sha256>, compressé avec zstd si le module
+    zstandard est installé, zlib sinon. Un index SQLite relie chaque appel
+    (endpoint, paramètres, date) au contenu archivé, ce qui permet de
+    reconstruire les tables sans refaire d'appel réseau (voir reparse).
+    """
+
+    def __init__(self, root_dir: str = "api_archive"):
+        self.root_dir = root_dir
+        self.objects_dir = os.path.join(root_dir, 'objects')
+        self.index_path = os.path.join(root_dir, 'index.db')
+        self.codec = 'zstd' if zstandard is not None else 'zlib'
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.init_index()
+
+    def init_index(self):
+        """Initialiser l'index de l'archive"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payloads (
+            sha256 TEXT PRIMARY KEY,
+            codec TEXT,
+            size INTEGER,
+            stored_size INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS fetches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            endpoint TEXT,
+            url TEXT,
+            params TEXT,
+            sha256 TEXT,
+            fetched_at REAL
+        )
+        ''')
+
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_fetches_endpoint ON fetches(endpoint, fetched_at)')
+
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        """Obtenir une connexion à l'index"""
+        return sqlite3.connect(self.index_path)
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256[:2], sha256)
+
+    def _compress(self, content: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=10).compress(content)
+        return zlib.compress(content, 9)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError("Payload compressé en zstd: installez le module zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def store(self, endpoint: str, url: str, params: Dict, content: bytes) -> Optional[str]:
+        """Archiver un corps de réponse; renvoie son SHA-256"""
+        sha256 = hashlib.sha256(content).hexdigest()
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT 1 FROM payloads WHERE sha256 = ?", (sha256,))
+            if cursor.fetchone() is None:
+                path = self._object_path(sha256)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                compressed = self._compress(content)
+
+                # Écriture atomique: un objet présent est toujours complet
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(compressed)
+                os.replace(tmp_path, path)
+
+                cursor.execute('''
+                INSERT OR IGNORE INTO payloads (sha256, codec, size, stored_size)
+                VALUES (?, ?, ?, ?)
+                ''', (sha256, self.codec, len(content), len(compressed)))
+
+            cursor.execute('''
+            INSERT INTO fetches (endpoint, url, params, sha256, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (endpoint, url, json.dumps(params or {}, sort_keys=True), sha256, time.time()))
+
+            conn.commit()
+            conn.close()
+            return sha256
+
+        except Exception as e:
+            logger.error(f"Erreur archivage payload: {e}")
+            return None
+
+    def load(self, sha256: str) -> Optional[bytes]:
+        """Relire un corps de réponse archivé"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT codec FROM payloads WHERE sha256 = ?", (sha256,))
+            row = cursor.fetchone()
+            conn.close()
+
+            if row is None:
+                return None
+
+            with open(self._object_path(sha256), 'rb') as f:
+                return self._decompress(f.read(), row[0])
+
+        except Exception as e:
+            logger.error(f"Erreur lecture payload {sha256}: {e}")
+            return None
+
+    def iter_fetches(self, endpoints: List[str] = None) -> Iterator[Dict]:
+        """Appels archivés, du plus ancien au plus récent"""
+        conn = self.get_connection()
+        conn.row_factory = sqlite3.Row
+        cursor = conn.cursor()
+
+        query = "SELECT * FROM fetches"
+        params = []
+        if endpoints:
+            query += f" WHERE endpoint IN ({', '.join('?' for _ in endpoints)})"
+            params.extend(endpoints)
+        query += " ORDER BY fetched_at, id"
+
+        try:
+            for row in cursor.execute(query, params):
+                yield dict(row)
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict:
+        """Statistiques de l'archive"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM payloads")
+            payloads, size, stored_size = cursor.fetchone()
+
+            cursor.execute("SELECT endpoint, COUNT(*) FROM fetches GROUP BY endpoint")
+            fetches_by_endpoint = dict(cursor.fetchall())
+
+            conn.close()
+
+            return {
+                'payloads': payloads,
+                'size': size,
+                'stored_size': stored_size,
+                'fetches_by_endpoint': fetches_by_endpoint
+            }
+
+        except Exception as e:
+            logger.error(f"Erreur stats archive: {e}")
+            return {}
+
+    def reparse(self, scraper, database, endpoints: List[str] = None) -> Dict:
+        """Reconstruire matches, standings et équipes depuis l'archive, sans appel réseau
+
+        Les réponses sont rejouées dans l'ordre chronologique à travers les
+        parseurs du scraper (_parse_match_data, _parse_standings_data): la
+        version la plus récente de chaque match l'emporte.
+        """
+        endpoints = endpoints or list(MATCH_ENDPOINTS + STANDINGS_ENDPOINTS + TEAMS_ENDPOINTS)
+        counts = {'payloads': 0, 'matches': 0, 'standings': 0, 'teams': 0, 'errors': 0}
+
+        # Réécriture complète: profil SQLite de chargement en masse
+        with database.bulk_load():
+            for fetch in self.iter_fetches(endpoints):
+                content = self.load(fetch['sha256'])
+                if content is None:
+                    counts['errors'] += 1
+                    continue
+
+                try:
+                    data = json.loads(content)
+                except ValueError:
+                    counts['errors'] += 1
+                    continue
+
+                counts['payloads'] += 1
+
+                if fetch['endpoint'] in MATCH_ENDPOINTS:
+                    matches = []
+                    for match_data in data.get('matches', []):
+                        parsed_match = scraper._parse_match_data(match_data, scraper._championship_of(match_data))
+                        if parsed_match:
+                            matches.append(parsed_match)
+                    if matches:
+                        counts['matches'] += database.save_matches_batch(matches)
+
+                elif fetch['endpoint'] in STANDINGS_ENDPOINTS:
+                    competition = data.get('competition', {})
+                    championship = (Config.get_championship_by_code(competition.get('code'))
+                                    or Config.get_championship_by_code(competition.get('id')))
+                    standings = scraper._parse_standings_data(data)
+                    if championship and standings and database.save_standings(championship, standings,
+                                                                              _season_of(data)):
+                        counts['standings'] += len(standings)
+
+                elif fetch['endpoint'] in TEAMS_ENDPOINTS:
+                    competition = data.get('competition', {})
+                    championship = (Config.get_championship_by_code(competition.get('code'))
+                                    or Config.get_championship_by_code(competition.get('id')))
+                    counts['teams'] += database.save_teams(championship, data.get('teams', []))
+
+        logger.info(f"Reparse terminé: {counts['payloads']} payloads, {counts['matches']} matches, "
+                    f"{counts['standings']} lignes de classement")
+        return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive des réponses brutes de l'API")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help="Statistiques de l'archive")
+
+    reparse_parser = subparsers.add_parser('reparse', help="Reconstruire matches, standings et équipes depuis l'archive")
+    reparse_parser.add_argument('--endpoint', action='append', dest='endpoints',
+                                help="Limiter à un endpoint (ex: /competitions/{id}/matches)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    archive = PayloadArchive(Config.ARCHIVE_DIR)
+
+    if args.command == 'stats':
+        stats = archive.get_stats()
+        ratio = stats['stored_size'] / stats['size'] if stats.get('size') else 0
+        print(f"{stats['payloads']} payloads, {stats['size'] / 1024:.1f} Ko → "
+              f"{stats['stored_size'] / 1024:.1f} Ko ({ratio:.0%}, {archive.codec})")
+        for endpoint, count in sorted(stats['fetches_by_endpoint'].items()):
+            print(f"  {endpoint}: {count} appel(s)")
+        return
+
+    # Imports locaux: le reparse n'a besoin que des parseurs, pas du réseau
+    from database import FootballDatabase
+    from scraper import FootballAPIScraper
+
+    db = FootballDatabase(Config.DB_PATH)
+    counts = archive.reparse(FootballAPIScraper(db), db, args.endpoints)
+    print(f"Reparse: {counts['payloads']} payloads, {counts['matches']} matches, "
+          f"{counts['standings']} lignes de classement, {counts['teams']} équipes, {counts['errors']} erreur(s)")
+
+
+if __name__ == '__main__':
+    main()
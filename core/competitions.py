@@ -0,0 +1,200 @@
+# competitions.py
+import sqlite3
+import json
+import threading
+import time
+import logging
+from typing import List, Dict, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class CompetitionStore:
+    """Métadonnées des compétitions (/competitions/{id}) en mémoire et sur disque
+
+    Le document d'une compétition est récupéré au plus une fois par intervalle
+    (ttl) et partagé par la journée actuelle, la saison en cours, la liste des
+    saisons et le test de connexion. Un verrou par compétition évite que des
+    threads concurrents déclenchent chacun leur rafraîchissement. Si l'API est
+    indisponible, la dernière version connue est servie.
+    """
+
+    def __init__(self, fetch: Callable[[str], Optional[Dict]], db_path: str = "api_cache.db",
+                 ttl: int = 3600):
+        self.fetch = fetch
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._refresh_locks = {}
+        self.init_store()
+
+    def init_store(self):
+        """Initialiser la table des métadonnées"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS competition_metadata (
+            competition_id TEXT PRIMARY KEY,
+            data TEXT,
+            fetched_at REAL
+        )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        """Obtenir une connexion à la base des métadonnées"""
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def _normalize(data: Dict) -> Dict:
+        """Ne garder que les champs utiles du document /competitions/{id}"""
+        current_season = data.get('currentSeason') or {}
+        return {
+            'id': data.get('id'),
+            'code': data.get('code'),
+            'name': data.get('name'),
+            'current_season': {
+                'id': current_season.get('id'),
+                'start_date': current_season.get('startDate'),
+                'end_date': current_season.get('endDate'),
+                'current_matchday': current_season.get('currentMatchday')
+            },
+            'seasons': [season.get('startDate')[:4] for season in data.get('seasons', [])
+                        if season.get('startDate')]
+        }
+
+    def _load(self, competition_id: str) -> Optional[Dict]:
+        """Entrée en mémoire, à défaut sur disque"""
+        with self._lock:
+            entry = self._memory.get(competition_id)
+        if entry is not None:
+            return entry
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT data, fetched_at FROM competition_metadata WHERE competition_id = ?
+            ''', (competition_id,))
+            row = cursor.fetchone()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur lecture métadonnées {competition_id}: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        entry = {'metadata': json.loads(row[0]), 'fetched_at': row[1]}
+        with self._lock:
+            self._memory[competition_id] = entry
+        return entry
+
+    def _save(self, competition_id: str, metadata: Dict) -> Dict:
+        entry = {'metadata': metadata, 'fetched_at': time.time()}
+        with self._lock:
+            self._memory[competition_id] = entry
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+            INSERT OR REPLACE INTO competition_metadata (competition_id, data, fetched_at)
+            VALUES (?, ?, ?)
+            ''', (competition_id, json.dumps(metadata), entry['fetched_at']))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur écriture métadonnées {competition_id}: {e}")
+
+        return entry
+
+    def _is_fresh(self, entry: Optional[Dict]) -> bool:
+        return entry is not None and (time.time() - entry['fetched_at']) < self.ttl
+
+    def _refresh_lock(self, competition_id: str) -> threading.Lock:
+        with self._lock:
+            return self._refresh_locks.setdefault(competition_id, threading.Lock())
+
+    def get(self, competition_id: str) -> Optional[Dict]:
+        """Métadonnées d'une compétition (rafraîchies au plus une fois par ttl)"""
+        entry = self._load(competition_id)
+        if self._is_fresh(entry):
+            return entry['metadata']
+
+        with self._refresh_lock(competition_id):
+            # Un autre thread a pu rafraîchir pendant l'attente du verrou
+            entry = self._load(competition_id)
+            if self._is_fresh(entry):
+                return entry['metadata']
+
+            try:
+                data = self.fetch(competition_id)
+            except Exception as e:
+                logger.error(f"Erreur récupération métadonnées {competition_id}: {e}")
+                data = None
+
+            if data is None:
+                if entry is not None:
+                    logger.warning(f"Métadonnées {competition_id} expirées servies (API indisponible)")
+                    return entry['metadata']
+                return None
+
+            return self._save(competition_id, self._normalize(data))['metadata']
+
+    def refresh(self, competition_id: str) -> Optional[Dict]:
+        """Récupérer les métadonnées depuis l'API même si l'entrée est fraîche
+
+        Renvoie None si l'appel échoue (la dernière version connue n'est pas servie).
+        """
+        with self._refresh_lock(competition_id):
+            try:
+                data = self.fetch(competition_id)
+            except Exception as e:
+                logger.error(f"Erreur récupération métadonnées {competition_id}: {e}")
+                return None
+
+            if data is None:
+                return None
+            return self._save(competition_id, self._normalize(data))['metadata']
+
+    def is_fresh(self, competition_id: str) -> bool:
+        """Vrai si les métadonnées ont été récupérées avec succès depuis moins de ttl"""
+        return self._is_fresh(self._load(competition_id))
+
+    def current_season(self, competition_id: str) -> Optional[Dict]:
+        metadata = self.get(competition_id)
+        return metadata['current_season'] if metadata else None
+
+    def current_matchday(self, competition_id: str) -> Optional[int]:
+        current_season = self.current_season(competition_id)
+        return current_season.get('current_matchday') if current_season else None
+
+    def seasons(self, competition_id: str) -> List[str]:
+        metadata = self.get(competition_id)
+        return metadata['seasons'] if metadata else []
+
+    def invalidate(self, competition_id: str = None):
+        """Forcer le rafraîchissement d'une compétition (ou de toutes)"""
+        with self._lock:
+            if competition_id is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(competition_id, None)
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            if competition_id is None:
+                cursor.execute("DELETE FROM competition_metadata")
+            else:
+                cursor.execute("DELETE FROM competition_metadata WHERE competition_id = ?",
+                               (competition_id,))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur invalidation métadonnées: {e}")
@@ -8,10 +8,93 @@ load_dotenv()
 class Config:
     # API Configuration
     FOOTBALL_DATA_API_KEY = os.getenv('FOOTBALL_DATA_API_KEY', 'a85cd28d53094b7b9fceb53d1f8f3943')
-    FOOTBALL_DATA_URL = "https://api.football-data.org/v4"
+    # Pool de clés (séparées par des virgules), sinon la clé unique ci-dessus
+    FOOTBALL_DATA_API_KEYS = [key.strip() for key in os.getenv('FOOTBALL_DATA_API_KEYS', '').split(',')
+                              if key.strip()] or [FOOTBALL_DATA_API_KEY]
+    FOOTBALL_DATA_URL = os.getenv('FOOTBALL_DATA_URL', "https://api.football-data.org/v4")
+    # Durée de retrait d'une clé refusée (403) avant nouvel essai
+    API_KEY_DISABLE_SECONDS = 3600
+
+    # API rate limiting (free tier: 10 requests per minute)
+    MAX_REQUESTS_PER_MINUTE = int(os.getenv('MAX_REQUESTS_PER_MINUTE', 10))
+    MAX_CONCURRENT_REQUESTS = int(os.getenv('MAX_CONCURRENT_REQUESTS', 4))
+
+    # Priorité d'accès au quota (plus petit = plus urgent); une requête en attente
+    # gagne un cran toutes les PRIORITY_AGING_SECONDS pour ne jamais être affamée
+    REQUEST_PRIORITIES = {
+        'live': 0,
+        'fixtures': 1,
+        'standings': 2,
+        'interactive': 3,
+        'backfill': 4
+    }
+    PRIORITY_AGING_SECONDS = 30
+
+    # Résilience: tentatives (backoff exponentiel) et disjoncteurs par endpoint
+    REQUEST_RETRY_COUNT = int(os.getenv('REQUEST_RETRY_COUNT', 3))
+    CIRCUIT_BREAKER_THRESHOLD = 5
+    CIRCUIT_BREAKER_RECOVERY = 60
+
+    # Télémétrie du scraper: fichier réécrit périodiquement (.json, sinon texte Prometheus)
+    METRICS_EXPORT_PATH = os.getenv('SCRAPER_METRICS_FILE')
+    METRICS_EXPORT_INTERVAL = int(os.getenv('SCRAPER_METRICS_INTERVAL', 15))
+
+    # Suivi des matches en direct (secondes entre deux requêtes /matches?status=LIVE)
+    LIVE_POLL_INTERVAL = int(os.getenv('LIVE_POLL_INTERVAL', 20))
+    LIVE_IDLE_INTERVAL = int(os.getenv('LIVE_IDLE_INTERVAL', 300))
+
+    # Planificateur calé sur le calendrier (minutes, sauf mention)
+    SCHEDULER_PRE_KICKOFF = 10          # début du suivi dense avant le coup d'envoi
+    SCHEDULER_MATCH_DURATION = 120      # fin estimée du match (arrêts de jeu compris)
+    SCHEDULER_STANDINGS_DELAY = 30      # classement rafraîchi après la fin de la journée
+    SCHEDULER_FIXTURES_INTERVAL = int(os.getenv('SCHEDULER_FIXTURES_INTERVAL', 360))
+    SCHEDULER_LOOKAHEAD_DAYS = 7        # calendrier rafraîchi de J-1 à J+7
 
     # Database
     DB_PATH = "football_data.db"
+    # Une connexion persistante par thread (sinon une connexion par appel)
+    DB_CONNECTION_POOL = os.getenv('DB_CONNECTION_POOL', '1') != '0'
+    DB_STATEMENT_CACHE_SIZE = 256
+    # Profil de performance SQLite: journal_mode réglé à l'initialisation (persistant),
+    # les PRAGMA suivants à chaque connexion
+    DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'WAL')
+    DB_PRAGMAS = {
+        'synchronous': 'NORMAL',      # fsync aux checkpoints seulement (sûr en WAL)
+        'cache_size': -32000,         # Kio (négatif), soit ~32 Mo par connexion
+        'mmap_size': 268435456,       # 256 Mo lus via mmap
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,        # ms d'attente d'un verrou avant "database is locked"
+        'wal_autocheckpoint': 1000    # pages
+    }
+    # Matches écrits par transaction dans FootballDatabase.upsert_matches
+    DB_UPSERT_CHUNK_SIZE = 500
+    # Réglages remplacés pendant FootballDatabase.bulk_load() (chaque clé doit figurer ci-dessus)
+    DB_BULK_PRAGMAS = {
+        'synchronous': 'OFF',
+        'cache_size': -131072,        # ~128 Mo
+        'wal_autocheckpoint': 10000
+    }
+    # Lots d'au moins DB_BULK_MIN_ROWS matches écrits sous bulk_load() par les jobs de backfill
+    DB_BULK_MIN_ROWS = 200
+    # Payloads API bruts (table match_payloads): zlib avec un dictionnaire fait
+    # d'échantillons de payloads existants (DB_PAYLOAD_ZDICT_MIN_SAMPLES au moins)
+    DB_PAYLOAD_COMPRESSION_LEVEL = 6
+    DB_PAYLOAD_ZDICT_SIZE = 32768     # octets (fenêtre zlib)
+    DB_PAYLOAD_ZDICT_MIN_SAMPLES = 50
+    DB_PAYLOAD_ZDICT_MAX_SAMPLES = 400
+
+    # Cache HTTP des réponses API (TTL en secondes par type d'endpoint)
+    CACHE_DB_PATH = "api_cache.db"
+    CACHE_MEMORY_MAX_ENTRIES = 512      # entrées gardées en mémoire (LRU), le reste est lu sur disque
+    CACHE_TTL = {
+        'competition': 3600,
+        'standings': 300,
+        'matchday': 120
+    }
+
+    # Archive compressée des réponses brutes (rejouable via `python core/archive.py reparse`)
+    ARCHIVE_ENABLED = os.getenv('ARCHIVE_PAYLOADS', '1') != '0'
+    ARCHIVE_DIR = "api_archive"
 
     # Championships IDs (football-data.org)
     CHAMPIONSHIP_IDS = {
@@ -45,4 +128,12 @@ class Config:
 
     @classmethod
     def get_championship_id(cls, championship):
-        return cls.CHAMPIONSHIP_IDS.get(championship, {}).get('id')
\ No newline at end of file
+        return cls.CHAMPIONSHIP_IDS.get(championship, {}).get('id')
+
+    @classmethod
+    def get_championship_by_code(cls, code):
+        """Retrouver le nom d'un championnat depuis son code numérique ou son id"""
+        for championship, ids in cls.CHAMPIONSHIP_IDS.items():
+            if code in (ids.get('code'), ids.get('id')):
+                return championship
+        return None
\ No newline at end of file
@@ -0,0 +1,98 @@
+# coverage.py
+import logging
+from datetime import datetime, date, timedelta
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = '%Y-%m-%d'
+
+
+class IntervalIndex:
+    """Ensemble de plages de jours fusionnées (bornes incluses)"""
+
+    def __init__(self, ranges: List[Tuple[date, date]] = None):
+        self.ranges = []
+        for start, end in ranges or []:
+            self.add(start, end)
+
+    def add(self, start: date, end: date):
+        """Ajouter une plage en fusionnant les plages chevauchantes ou contiguës"""
+        if end < start:
+            return
+
+        merged = []
+        for current_start, current_end in self.ranges:
+            if current_end + timedelta(days=1) < start or end + timedelta(days=1) < current_start:
+                merged.append((current_start, current_end))
+            else:
+                start = min(start, current_start)
+                end = max(end, current_end)
+        merged.append((start, end))
+        self.ranges = sorted(merged)
+
+    def gaps(self, start: date, end: date) -> List[Tuple[date, date]]:
+        """Plages de [start, end] non couvertes par l'index"""
+        gaps = []
+        cursor = start
+
+        for current_start, current_end in self.ranges:
+            if current_end < cursor:
+                continue
+            if current_start > end:
+                break
+            if current_start > cursor:
+                gaps.append((cursor, current_start - timedelta(days=1)))
+            cursor = max(cursor, current_end + timedelta(days=1))
+            if cursor > end:
+                break
+
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+
+class CoveragePlanner:
+    """Planifier un scraping incrémental à partir du journal scraping_log
+
+    Les plages déjà scrapées avec succès sont ignorées, sauf les jours qui
+    contiennent encore des matches non terminés et la période récente
+    (à partir d'hier), dont les données peuvent encore changer.
+    """
+
+    def __init__(self, database):
+        self.db = database
+
+    def plan(self, championship: str, date_from: str, date_to: str,
+             today: date = None) -> List[Tuple[str, str]]:
+        """Plages (date_from, date_to) à récupérer pour couvrir la période demandée"""
+        start = datetime.strptime(date_from, DATE_FORMAT).date()
+        end = datetime.strptime(date_to, DATE_FORMAT).date()
+        today = today or date.today()
+
+        covered = IntervalIndex()
+        for logged_from, logged_to in self.db.get_scraping_coverage(championship):
+            try:
+                covered.add(datetime.strptime(logged_from, DATE_FORMAT).date(),
+                            datetime.strptime(logged_to, DATE_FORMAT).date())
+            except (TypeError, ValueError):
+                continue
+
+        to_fetch = IntervalIndex(covered.gaps(start, end))
+
+        # Fenêtres volatiles: matches encore programmés / en direct
+        for match_day in self.db.get_unfinished_match_dates(championship, date_from, date_to):
+            day = datetime.strptime(match_day, DATE_FORMAT).date()
+            to_fetch.add(day, day)
+
+        # Période récente: scores et programme susceptibles d'évoluer
+        recent_start = max(start, today - timedelta(days=1))
+        to_fetch.add(recent_start, end)
+
+        ranges = [(range_start.strftime(DATE_FORMAT), range_end.strftime(DATE_FORMAT))
+                  for range_start, range_end in to_fetch.ranges]
+
+        skipped_days = (end - start).days + 1 - sum((e - s).days + 1 for s, e in to_fetch.ranges)
+        logger.info(f"Plan incrémental {championship}: {len(ranges)} plage(s) à récupérer, "
+                    f"{skipped_days} jour(s) déjà couverts")
+        return ranges
@@ -1,16 +1,273 @@
 # database.py
+import argparse
+import atexit
+import os
 import sqlite3
 import json
+import hashlib
+import threading
+import weakref
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
 
+from config import Config
+
 logger = logging.getLogger(__name__)
 
+# Champs du payload API ignorés par le hash de contenu (horodatage de l'API)
+MATCH_HASH_IGNORED_KEYS = ('lastUpdated',)
+
+# Limite de variables par requête SQLite (anciennes versions: 999)
+SQLITE_MAX_VARIABLES = 900
+
+# Colonnes chargées par get_matches (matches.raw_data, JSON des champs parsés, se décode à la demande)
+MATCH_COLUMNS = ('id', 'match_id', 'championship', 'date', 'home_team', 'away_team', 'home_score',
+                 'away_score', 'status', 'matchday', 'venue', 'referee', 'content_hash',
+                 'created_at', 'updated_at')
+
+# Dans les matches lus, 'id' est l'identifiant API du match (comme dans le
+# JSON parsé), pas le rowid de la table
+MATCH_COLUMN_SQL = {'id': 'matches.match_id'}
+
+# Colonnes affichées par les interfaces (pas de décodage du JSON raw_data)
+MATCH_VIEW_COLUMNS = ['match_id', 'championship', 'date', 'home_team', 'away_team', 'home_score',
+                      'away_score', 'status', 'matchday', 'venue', 'referee']
+
+# Upsert en place: la ligne garde son id et son created_at (contrairement à INSERT OR REPLACE)
+MATCH_UPSERT_SQL = '''
+INSERT INTO matches
+(match_id, championship, date, home_team, away_team, home_score, away_score,
+ status, matchday, venue, referee, raw_data, content_hash, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+ON CONFLICT(match_id) DO UPDATE SET
+    championship = excluded.championship,
+    date = excluded.date,
+    home_team = excluded.home_team,
+    away_team = excluded.away_team,
+    home_score = excluded.home_score,
+    away_score = excluded.away_score,
+    status = excluded.status,
+    matchday = excluded.matchday,
+    venue = excluded.venue,
+    referee = excluded.referee,
+    raw_data = excluded.raw_data,
+    content_hash = excluded.content_hash,
+    updated_at = CURRENT_TIMESTAMP
+WHERE matches.content_hash IS NOT excluded.content_hash
+'''
+
+STANDING_UPSERT_SQL = '''
+INSERT INTO standings
+(championship, season, position, team, team_id, played_games, won, draw, lost,
+ points, goals_for, goals_against, goal_difference, raw_data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(championship, season, team_id) DO UPDATE SET
+    position = excluded.position,
+    team = excluded.team,
+    played_games = excluded.played_games,
+    won = excluded.won,
+    draw = excluded.draw,
+    lost = excluded.lost,
+    points = excluded.points,
+    goals_for = excluded.goals_for,
+    goals_against = excluded.goals_against,
+    goal_difference = excluded.goal_difference,
+    raw_data = excluded.raw_data
+'''
+
+MATCH_PAYLOAD_UPSERT_SQL = '''
+INSERT INTO match_payloads (match_id, dictionary_id, size, payload)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(match_id) DO UPDATE SET
+    dictionary_id = excluded.dictionary_id,
+    size = excluded.size,
+    payload = excluded.payload
+'''
+
+
+def payload_json(payload) -> bytes:
+    """Sérialisation compacte d'un payload API (avant compression)"""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+
+
+def payload_compressor(zdict: Optional[bytes] = None):
+    """Compresseur zlib modèle: copié pour chaque payload (charger le dictionnaire coûte plus
+    cher que de compresser un payload)"""
+    if zdict:
+        return zlib.compressobj(Config.DB_PAYLOAD_COMPRESSION_LEVEL, zdict=zdict)
+    return zlib.compressobj(Config.DB_PAYLOAD_COMPRESSION_LEVEL)
+
+
+def compress_payload(data: bytes, compressor) -> bytes:
+    compressor = compressor.copy()
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_payload(blob: bytes, zdict: Optional[bytes] = None):
+    """Payload API décodé depuis match_payloads.payload"""
+    decompressor = zlib.decompressobj(zdict=zdict) if zdict else zlib.decompressobj()
+    return json.loads(decompressor.decompress(blob) + decompressor.flush())
+
+
+def sample_prefix_dictionary(samples: List[bytes], size: int = None) -> bytes:
+    """Dictionnaire zlib (zdict) fait d'échantillons de payloads bout à bout
+
+    Aucun apprentissage: le dictionnaire n'est qu'un préfixe de contenu que
+    zlib place avant chaque payload, où il peut référencer les clés,
+    structures et valeurs récurrentes (noms d'équipes, arbitres,
+    compétitions). zlib n'exploite que les `size` derniers octets (fenêtre
+    de 32 Kio) et les références proches coûtent moins cher: les
+    échantillons sont concaténés puis seule la fin est conservée.
+    """
+    size = size or Config.DB_PAYLOAD_ZDICT_SIZE
+    return b''.join(samples)[-size:]
+
+
+def match_content_hash(match_data: Dict) -> str:
+    """Hash stable du contenu normalisé d'un match (clés triées, horodatages exclus)"""
+    normalized = dict(match_data)
+    raw_data = normalized.get('raw_data')
+    if isinstance(raw_data, dict):
+        normalized['raw_data'] = {key: value for key, value in raw_data.items()
+                                  if key not in MATCH_HASH_IGNORED_KEYS}
+    payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class LazyMatch(dict):
+    """Match renvoyé par get_matches: colonnes chargées, JSON décodé au premier accès
+
+    Les colonnes de la table sont des clés ordinaires (itération, DataFrame).
+    Les autres champs parsés (api_id, competition, half_time_*...) ne sont
+    décodés depuis matches.raw_data qu'au premier accès à une clé absente,
+    et le payload API ('raw_data') n'est lu dans match_payloads qu'au premier
+    accès à cette clé. Les colonnes priment sur les champs décodés.
+    """
+
+    def __init__(self, columns: Dict, fields_json: Optional[str] = None, payload_loader=None):
+        super().__init__(columns)
+        self._fields_json = fields_json
+        self._payload_loader = payload_loader
+
+    def _resolve(self, key) -> bool:
+        """Décoder ce qui peut fournir key; True si key est alors présente"""
+        if self._fields_json is not None:
+            fields_json, self._fields_json = self._fields_json, None
+            try:
+                for name, value in json.loads(fields_json).items():
+                    self.setdefault(name, value)
+            except (ValueError, AttributeError) as e:
+                logger.warning(f"raw_data illisible pour le match {dict.get(self, 'match_id')}: {e}")
+            if dict.__contains__(self, key):
+                return True
+
+        if key == 'raw_data' and self._payload_loader is not None:
+            payload_loader, self._payload_loader = self._payload_loader, None
+            dict.__setitem__(self, 'raw_data', payload_loader())
+            return True
+
+        return dict.__contains__(self, key)
+
+    def __missing__(self, key):
+        if self._resolve(key):
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self, key) or self._resolve(key)
+
+    def get(self, key, default=None):
+        if dict.__contains__(self, key) or self._resolve(key):
+            return dict.__getitem__(self, key)
+        return default
+
+
+class PooledConnection(sqlite3.Connection):
+    """Connexion SQLite réutilisée par le thread qui l'a ouverte
+
+    close() ne ferme pas la connexion: la transaction en cours est annulée
+    (comme à la fermeture d'une connexion sqlite3) et la connexion reste
+    disponible pour le prochain get_connection() du même thread, avec son
+    schéma déjà analysé et son cache de requêtes préparées.
+    """
+
+    # Profil de PRAGMA appliqué (None: aucun, False: normal, True: chargement en masse)
+    bulk_profile = None
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+        self.row_factory = None
+
+    def dispose(self):
+        """Fermer réellement la connexion"""
+        super().close()
+
+
+class ConnectionPool:
+    """Une connexion persistante par thread et par base
+
+    Les connexions d'un thread terminé sont libérées avec lui; close_all()
+    ferme celles encore ouvertes (arrêt de l'application).
+    """
+
+    def __init__(self, db_path: str, cached_statements: int = 256):
+        self.db_path = db_path
+        self.cached_statements = cached_statements
+        self.connections_opened = 0
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> PooledConnection:
+        conn = getattr(self._local, 'connection', None)
+        if conn is None:
+            # Utilisée par un seul thread; check_same_thread=False pour que close_all()
+            # puisse la fermer depuis le thread principal
+            conn = sqlite3.connect(self.db_path, factory=PooledConnection, check_same_thread=False,
+                                   cached_statements=self.cached_statements)
+            self._local.connection = conn
+            with self._lock:
+                self._connections.add(conn)
+                self.connections_opened += 1
+        elif conn.in_transaction:
+            # Appel précédent interrompu par une exception avant close()
+            conn.close()
+        conn.row_factory = None
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.dispose()
+            except sqlite3.Error as e:
+                logger.error(f"Erreur fermeture connexion: {e}")
+        self._local = threading.local()
+
+    @property
+    def open_connections(self) -> int:
+        return len(self._connections)
+
 
 class FootballDatabase:
-    def __init__(self, db_path="football_data.db"):
+    def __init__(self, db_path="football_data.db", pooled: bool = None):
         self.db_path = db_path
+        pooled = Config.DB_CONNECTION_POOL if pooled is None else pooled
+        self.pool = ConnectionPool(db_path, Config.DB_STATEMENT_CACHE_SIZE) if pooled else None
+        if self.pool is not None:
+            atexit.register(self.close)
+        # Profondeur de bulk_load() par thread: seul le thread qui écrit change de profil
+        self._bulk_local = threading.local()
+        # Dictionnaires zlib des payloads et compresseurs modèles, par id (immuables une fois écrits)
+        self._payload_dictionaries = {}
+        self._payload_compressors = {}
+        self._payload_lock = threading.Lock()
         self.init_database()
 
     def init_database(self):
@@ -18,6 +275,13 @@ class FootballDatabase:
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        # Mode de journal: persistant dans le fichier, réglé une fois
+        if Config.DB_JOURNAL_MODE:
+            try:
+                cursor.execute(f"PRAGMA journal_mode = {Config.DB_JOURNAL_MODE}")
+            except sqlite3.Error as e:
+                logger.warning(f"journal_mode {Config.DB_JOURNAL_MODE} refusé: {e}")
+
         # Table des matches
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS matches (
@@ -34,10 +298,12 @@ class FootballDatabase:
             venue TEXT,
             referee TEXT,
             raw_data TEXT,
+            content_hash TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         ''')
+        self._ensure_column(cursor, 'matches', 'content_hash', 'TEXT')
 
         # Table des classements
         cursor.execute('''
@@ -86,6 +352,40 @@ class FootballDatabase:
         )
         ''')
 
+        # Table des équipes (préchargées par compétition, effectif inclus dans raw_data)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS teams (
+            team_id INTEGER PRIMARY KEY,
+            championship TEXT,
+            name TEXT,
+            short_name TEXT,
+            tla TEXT,
+            crest TEXT,
+            venue TEXT,
+            founded INTEGER,
+            club_colors TEXT,
+            coach TEXT,
+            squad_size INTEGER,
+            raw_data TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
+        # Événements des matches en direct (buts, changements de statut)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            match_id TEXT,
+            championship TEXT,
+            event_type TEXT,
+            home_score INTEGER,
+            away_score INTEGER,
+            status TEXT,
+            details TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
         # Table des journées scrapées
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS scraping_log (
@@ -100,11 +400,65 @@ class FootballDatabase:
         )
         ''')
 
+        # Jobs de backfill (reprenables) et leurs fenêtres
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT,
+            championship TEXT,
+            date_from TEXT,
+            date_to TEXT,
+            season INTEGER,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS scrape_job_windows (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id INTEGER,
+            kind TEXT DEFAULT 'dates',
+            date_from TEXT,
+            date_to TEXT,
+            status TEXT DEFAULT 'pending',
+            matches_count INTEGER DEFAULT 0,
+            error_message TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(job_id, kind, date_from, date_to)
+        )
+        ''')
+
+        # Payloads API bruts des matches (JSON compact compressé zlib), chargés à la demande;
+        # matches.raw_data ne contient que les champs parsés
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_payloads (
+            match_id TEXT PRIMARY KEY,
+            dictionary_id INTEGER,
+            size INTEGER,
+            payload BLOB
+        )
+        ''')
+
+        # Dictionnaires zlib: conservés tant qu'un payload les référence
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS payload_dictionaries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            data BLOB,
+            samples INTEGER,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''')
+
         # Index pour optimiser les requêtes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_championship ON matches(championship)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_date ON matches(date)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_matches_team ON matches(home_team, away_team)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_standings_championship ON standings(championship)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_teams_championship ON teams(championship)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_match_events_match ON match_events(match_id, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_job_windows_job ON scrape_job_windows(job_id, status)')
 
         conn.commit()
         conn.close()
@@ -112,98 +466,286 @@ class FootballDatabase:
         logger.info(f"Base de données initialisée: {self.db_path}")
 
     def get_connection(self):
-        """Obtenir une connexion à la base de données"""
-        return sqlite3.connect(self.db_path)
+        """Obtenir une connexion à la base de données
 
-    def save_match(self, match_data: Dict) -> bool:
-        """Sauvegarder un match dans la base"""
+        Avec le pool (Config.DB_CONNECTION_POOL), la connexion du thread
+        courant est réutilisée et conn.close() la rend au pool. Le profil de
+        performance (Config.DB_PRAGMAS, ou DB_BULK_PRAGMAS pendant bulk_load)
+        est appliqué à l'ouverture et à chaque changement de mode.
+        """
+        bulk = getattr(self._bulk_local, 'depth', 0) > 0
+        if self.pool is None:
+            conn = sqlite3.connect(self.db_path)
+            self._apply_profile(conn, bulk)
+            return conn
+
+        conn = self.pool.acquire()
+        if conn.bulk_profile is not bulk:
+            self._apply_profile(conn, bulk)
+            conn.bulk_profile = bulk
+        return conn
+
+    @staticmethod
+    def _apply_profile(conn, bulk: bool):
+        pragmas = dict(Config.DB_PRAGMAS, **Config.DB_BULK_PRAGMAS) if bulk else Config.DB_PRAGMAS
+        for name, value in pragmas.items():
+            try:
+                conn.execute(f"PRAGMA {name} = {value}")
+            except sqlite3.Error as e:
+                logger.warning(f"PRAGMA {name} = {value} refusé: {e}")
+
+    @contextmanager
+    def bulk_load(self, checkpoint: bool = True):
+        """Profil allégé (Config.DB_BULK_PRAGMAS) pendant un gros chargement
+
+        Ne s'applique qu'aux connexions obtenues par le thread appelant
+        jusqu'à la sortie du bloc (les blocs peuvent s'imbriquer): les
+        lectures de l'interface et les écritures des autres threads gardent
+        le profil normal. À réserver aux écritures elles-mêmes, jamais autour
+        d'attentes réseau. En WAL avec synchronous=OFF, un crash de
+        l'application ne perd rien, une coupure système peut perdre les
+        dernières transactions: les jobs de backfill sont reprenables. À la
+        sortie, le profil normal est rétabli et, avec checkpoint, le WAL est
+        reversé dans la base.
+        """
+        depth = getattr(self._bulk_local, 'depth', 0)
+        self._bulk_local.depth = depth + 1
+        try:
+            yield self
+        finally:
+            self._bulk_local.depth = depth
+            if depth == 0 and checkpoint:
+                self.checkpoint()
+
+    def checkpoint(self):
+        """Reverser le WAL dans la base et le tronquer (sans effet hors WAL)"""
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Erreur checkpoint WAL: {e}")
 
-            cursor.execute('''
-            INSERT OR REPLACE INTO matches 
-            (match_id, championship, date, home_team, away_team, home_score, away_score, 
-             status, matchday, venue, referee, raw_data, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                match_data.get('id'),
-                match_data.get('competition'),
-                match_data.get('date'),
-                match_data.get('home_team'),
-                match_data.get('away_team'),
-                match_data.get('home_score'),
-                match_data.get('away_score'),
-                match_data.get('status'),
-                match_data.get('matchday'),
-                match_data.get('venue'),
-                match_data.get('referee'),
-                json.dumps(match_data)
-            ))
+    def close(self):
+        """Fermer les connexions du pool (arrêt de l'application)"""
+        if self.pool is not None:
+            self.pool.close_all()
 
+    @staticmethod
+    def _ensure_column(cursor, table: str, column: str, column_type: str):
+        """Ajouter une colonne à une table existante (migration des anciennes bases)"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        if column not in [row[1] for row in cursor.fetchall()]:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+            logger.info(f"Colonne {table}.{column} ajoutée")
+
+    @staticmethod
+    def _match_row(match_data: Dict, content_hash: str) -> Tuple:
+        # Le payload API (raw_data) est stocké à part, dans match_payloads
+        fields = {key: value for key, value in match_data.items() if key != 'raw_data'}
+        return (
+            match_data.get('id'),
+            match_data.get('competition'),
+            match_data.get('date'),
+            match_data.get('home_team'),
+            match_data.get('away_team'),
+            match_data.get('home_score'),
+            match_data.get('away_score'),
+            match_data.get('status'),
+            match_data.get('matchday'),
+            match_data.get('venue'),
+            match_data.get('referee'),
+            json.dumps(fields),
+            content_hash
+        )
+
+    def _payload_dictionary(self, conn, dictionary_id: Optional[int]) -> Optional[bytes]:
+        """Dictionnaire zlib d'id donné (mis en cache)"""
+        if dictionary_id is None:
+            return None
+        zdict = self._payload_dictionaries.get(dictionary_id)
+        if zdict is None:
+            row = conn.execute("SELECT data FROM payload_dictionaries WHERE id = ?",
+                               (dictionary_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Dictionnaire de payloads {dictionary_id} introuvable")
+            zdict = self._payload_dictionaries[dictionary_id] = bytes(row[0])
+        return zdict
+
+    def _current_payload_compressor(self, conn, samples: List[bytes] = None, rebuild: bool = False):
+        """(id du dictionnaire, compresseur modèle) pour les nouveaux payloads"""
+        dictionary_id, zdict = self._current_payload_dictionary(conn, samples, rebuild)
+        compressor = self._payload_compressors.get(dictionary_id)
+        if compressor is None:
+            compressor = self._payload_compressors[dictionary_id] = payload_compressor(zdict)
+        return dictionary_id, compressor
+
+    def _current_payload_dictionary(self, conn, samples: List[bytes] = None,
+                                    rebuild: bool = False) -> Tuple[Optional[int], Optional[bytes]]:
+        """Dictionnaire à utiliser pour les nouveaux payloads: (id, données) ou (None, None)
+
+        S'il n'en existe pas encore (ou si rebuild), un dictionnaire est
+        construit à partir de samples quand ils sont assez nombreux. Il est
+        enregistré par une connexion dédiée: la transaction de l'appelant
+        n'est jamais validée ici.
+        """
+        with self._payload_lock:
+            row = conn.execute("SELECT MAX(id) FROM payload_dictionaries").fetchone()
+            dictionary_id = row[0] if row else None
+            if (dictionary_id is None or rebuild) and samples \
+                    and len(samples) >= Config.DB_PAYLOAD_ZDICT_MIN_SAMPLES:
+                # Échantillons répartis sur tout le lot
+                step = max(1, len(samples) // Config.DB_PAYLOAD_ZDICT_MAX_SAMPLES)
+                picked = samples[::step][:Config.DB_PAYLOAD_ZDICT_MAX_SAMPLES]
+                zdict = sample_prefix_dictionary(picked)
+                dictionary_id = self._store_payload_dictionary(zdict, len(picked))
+                self._payload_dictionaries[dictionary_id] = zdict
+                logger.info(f"Dictionnaire de payloads {dictionary_id} construit à partir de "
+                            f"{len(picked)} payloads ({len(zdict)} octets)")
+        return dictionary_id, self._payload_dictionary(conn, dictionary_id)
+
+    def _store_payload_dictionary(self, zdict: bytes, samples: int) -> int:
+        """Enregistrer un dictionnaire dans sa propre transaction; renvoie son id"""
+        conn = sqlite3.connect(self.db_path, timeout=Config.DB_PRAGMAS.get('busy_timeout', 5000) / 1000)
+        try:
+            cursor = conn.execute("INSERT INTO payload_dictionaries (data, samples) VALUES (?, ?)",
+                                  (zdict, samples))
             conn.commit()
+            return cursor.lastrowid
+        finally:
             conn.close()
-            return True
 
-        except Exception as e:
-            logger.error(f"Erreur sauvegarde match: {e}")
-            return False
+    def _payload_rows(self, conn, payloads: Dict[str, bytes]) -> Dict[str, Tuple]:
+        """Lignes de match_payloads pour des payloads sérialisés (payload_json), par match_id"""
+        if not payloads:
+            return {}
+        dictionary_id, compressor = self._current_payload_compressor(conn, list(payloads.values()))
+        return {match_id: (match_id, dictionary_id, len(data), compress_payload(data, compressor))
+                for match_id, data in payloads.items()}
+
+    def save_match(self, match_data: Dict) -> bool:
+        """Sauvegarder un match dans la base"""
+        counts = self.upsert_matches([match_data])
+        return counts['errors'] == 0 and sum(counts.values()) > 0
 
     def save_matches_batch(self, matches: List[Dict]) -> int:
-        """Sauvegarder plusieurs matches en batch"""
-        saved_count = 0
+        """Sauvegarder plusieurs matches en batch (nombre de matches à jour en base)"""
+        counts = self.upsert_matches(matches)
+        return counts['inserted'] + counts['updated'] + counts['unchanged']
+
+    def upsert_matches(self, matches: List[Dict]) -> Dict[str, int]:
+        """Écrire uniquement les matches nouveaux ou modifiés
+
+        Les hash de contenu du lot sont comparés en une requête (par tranche)
+        à ceux déjà en base: un match identique n'est pas réécrit. Les autres
+        sont écrits par executemany en INSERT ... ON CONFLICT DO UPDATE (id et
+        created_at conservés), une transaction par tranche de
+        Config.DB_UPSERT_CHUNK_SIZE matches. Le payload API de chaque match
+        est écrit compressé dans match_payloads, dans la même transaction.
+        Renvoie les compteurs inserted / updated / unchanged / errors.
+        """
+        counts = {'inserted': 0, 'updated': 0, 'unchanged': 0, 'errors': 0}
+        if not matches:
+            return counts
+
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
 
+            # Dernière version de chaque match du lot
+            hashed = {}
             for match_data in matches:
-                try:
-                    cursor.execute('''
-                    INSERT OR REPLACE INTO matches 
-                    (match_id, championship, date, home_team, away_team, home_score, away_score, 
-                     status, matchday, venue, referee, raw_data, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-                    ''', (
-                        match_data.get('id'),
-                        match_data.get('competition'),
-                        match_data.get('date'),
-                        match_data.get('home_team'),
-                        match_data.get('away_team'),
-                        match_data.get('home_score'),
-                        match_data.get('away_score'),
-                        match_data.get('status'),
-                        match_data.get('matchday'),
-                        match_data.get('venue'),
-                        match_data.get('referee'),
-                        json.dumps(match_data)
-                    ))
-                    saved_count += 1
-                except Exception as e:
-                    logger.error(f"Erreur sauvegarde match {match_data.get('id')}: {e}")
+                hashed[match_data.get('id')] = (match_data, match_content_hash(match_data))
+
+            match_ids = list(hashed)
+            existing = {}
+            for i in range(0, len(match_ids), SQLITE_MAX_VARIABLES):
+                chunk = match_ids[i:i + SQLITE_MAX_VARIABLES]
+                cursor.execute(f'''
+                SELECT match_id, content_hash FROM matches
+                WHERE match_id IN ({', '.join('?' for _ in chunk)})
+                ''', chunk)
+                existing.update(cursor.fetchall())
+
+            changed = []
+            payloads = {}
+            for match_id, (match_data, content_hash) in hashed.items():
+                if match_id in existing and existing[match_id] == content_hash:
+                    counts['unchanged'] += 1
+                else:
+                    changed.append((match_id, self._match_row(match_data, content_hash)))
+                    if match_data.get('raw_data') is not None:
+                        payloads[match_id] = payload_json(match_data['raw_data'])
+
+            payload_rows = self._payload_rows(conn, payloads)
+
+            chunk_size = max(1, Config.DB_UPSERT_CHUNK_SIZE)
+            for i in range(0, len(changed), chunk_size):
+                chunk = changed[i:i + chunk_size]
+                written = self._upsert_chunk(conn, MATCH_UPSERT_SQL, chunk, 'match',
+                                             MATCH_PAYLOAD_UPSERT_SQL, payload_rows)
+                for match_id, _ in written:
+                    counts['updated' if match_id in existing else 'inserted'] += 1
+                counts['errors'] += len(chunk) - len(written)
 
-            conn.commit()
             conn.close()
 
         except Exception as e:
             logger.error(f"Erreur batch save: {e}")
 
-        return saved_count
+        return counts
+
+    @staticmethod
+    def _upsert_chunk(conn, sql: str, rows: List[Tuple], label: str,
+                      side_sql: str = None, side_rows: Dict = None) -> List[Tuple]:
+        """Écrire une tranche de (clé, ligne) en une transaction; renvoie les lignes écrites
 
-    def save_standings(self, championship: str, standings: List[Dict]):
-        """Sauvegarder le classement"""
+        side_rows[clé], s'il existe, est écrit par side_sql dans la même
+        transaction (payload d'un match). Si executemany échoue, la tranche
+        est annulée puis rejouée ligne à ligne pour n'écarter que les lignes
+        en erreur.
+        """
+        side_rows = side_rows or {}
+        try:
+            conn.executemany(sql, [row for _, row in rows])
+            if side_sql:
+                conn.executemany(side_sql, [side_rows[key] for key, _ in rows if key in side_rows])
+            conn.commit()
+            return rows
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.warning(f"Tranche de {len(rows)} {label}(s) rejouée ligne à ligne: {e}")
+
+        written = []
+        conn.execute("BEGIN")
+        for key, row in rows:
+            try:
+                conn.execute("SAVEPOINT upsert_row")
+                conn.execute(sql, row)
+                if side_sql and key in side_rows:
+                    conn.execute(side_sql, side_rows[key])
+                conn.execute("RELEASE upsert_row")
+                written.append((key, row))
+            except sqlite3.Error as e:
+                conn.execute("ROLLBACK TO upsert_row")
+                conn.execute("RELEASE upsert_row")
+                logger.error(f"Erreur sauvegarde {label} {key}: {e}")
+        conn.commit()
+        return written
+
+    def save_standings(self, championship: str, standings: List[Dict], season: int = None):
+        """Sauvegarder le classement (upsert en place par équipe, en une transaction)
+
+        Sans saison explicite, le classement est rangé sous l'année courante.
+        """
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
 
-            current_season = datetime.now().year
+            current_season = season or datetime.now().year
 
+            rows = []
             for standing in standings:
-                cursor.execute('''
-                INSERT OR REPLACE INTO standings 
-                (championship, season, position, team, team_id, played_games, won, draw, lost,
-                 points, goals_for, goals_against, goal_difference, raw_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+                rows.append((standing.get('team_id'), (
                     championship,
                     str(current_season),
                     standing.get('position'),
@@ -218,56 +760,195 @@ class FootballDatabase:
                     standing.get('goals_against'),
                     standing.get('goal_difference'),
                     json.dumps(standing)
-                ))
+                )))
 
-            conn.commit()
+            written = self._upsert_chunk(conn, STANDING_UPSERT_SQL, rows, 'classement')
             conn.close()
-            return True
+            return len(written) == len(rows)
 
         except Exception as e:
             logger.error(f"Erreur sauvegarde classement: {e}")
             return False
 
+    def save_teams(self, championship: Optional[str], teams: List[Dict]) -> int:
+        """Sauvegarder des équipes (document /teams de l'API, effectif compris)
+
+        Sans championnat (équipe récupérée seule), celui déjà connu est conservé.
+        """
+        saved_count = 0
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            for team in teams:
+                if not team.get('id'):
+                    continue
+                coach = team.get('coach') or {}
+                cursor.execute('''
+                INSERT INTO teams
+                (team_id, championship, name, short_name, tla, crest, venue, founded,
+                 club_colors, coach, squad_size, raw_data, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(team_id) DO UPDATE SET
+                    championship = COALESCE(excluded.championship, teams.championship),
+                    name = excluded.name,
+                    short_name = excluded.short_name,
+                    tla = excluded.tla,
+                    crest = excluded.crest,
+                    venue = excluded.venue,
+                    founded = excluded.founded,
+                    club_colors = excluded.club_colors,
+                    coach = excluded.coach,
+                    squad_size = excluded.squad_size,
+                    raw_data = excluded.raw_data,
+                    updated_at = CURRENT_TIMESTAMP
+                ''', (
+                    team.get('id'),
+                    championship,
+                    team.get('name'),
+                    team.get('shortName'),
+                    team.get('tla'),
+                    team.get('crest'),
+                    team.get('venue'),
+                    team.get('founded'),
+                    team.get('clubColors'),
+                    coach.get('name'),
+                    len(team.get('squad') or []),
+                    json.dumps(team)
+                ))
+                saved_count += 1
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"Erreur sauvegarde équipes: {e}")
+
+        return saved_count
+
+    def get_team(self, team_id: int) -> Optional[Dict]:
+        """Document complet d'une équipe (None si elle n'a jamais été chargée)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT raw_data FROM teams WHERE team_id = ?", (team_id,))
+            row = cursor.fetchone()
+            conn.close()
+
+            return json.loads(row[0]) if row and row[0] else None
+
+        except Exception as e:
+            logger.error(f"Erreur récupération équipe {team_id}: {e}")
+            return None
+
+    def get_teams(self, championship: str) -> List[Dict]:
+        """Équipes d'un championnat (colonnes résumées, sans l'effectif)"""
+        try:
+            conn = self.get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            SELECT team_id, championship, name, short_name, tla, crest, venue, founded,
+                   club_colors, coach, squad_size, updated_at
+            FROM teams WHERE championship = ?
+            ORDER BY name
+            ''', (championship,))
+
+            teams = [dict(row) for row in cursor.fetchall()]
+            conn.close()
+            return teams
+
+        except Exception as e:
+            logger.error(f"Erreur récupération équipes: {e}")
+            return []
+
     def get_matches(self, championship: str = None,
                     date_from: str = None, date_to: str = None,
-                    limit: int = 100) -> List[Dict]:
-        """Récupérer les matches depuis la base"""
+                    limit: int = 100, columns: List[str] = None,
+                    with_raw: bool = False) -> List[Dict]:
+        """Récupérer les matches depuis la base
+
+        columns: colonnes de matches à charger (MATCH_COLUMNS); les matches
+        sont alors des dict limités à ces colonnes. Sans projection, toutes
+        les colonnes sont chargées et les autres champs parsés se décodent à
+        la demande (LazyMatch). with_raw: payload API décodé immédiatement
+        sous 'raw_data' (sinon au premier accès, et jamais avec columns).
+        """
         try:
+            if columns is not None:
+                unknown = [column for column in columns if column not in MATCH_COLUMNS]
+                if unknown:
+                    raise ValueError(f"colonnes inconnues {unknown} (raw_data: utiliser with_raw=True)")
+                selected = list(dict.fromkeys(columns))
+            else:
+                selected = list(MATCH_COLUMNS)
+
             conn = self.get_connection()
-            conn.row_factory = sqlite3.Row
             cursor = conn.cursor()
 
-            query = "SELECT * FROM matches WHERE 1=1"
+            select = [MATCH_COLUMN_SQL.get(column, f"matches.{column}") for column in selected]
+            if columns is None or with_raw:
+                select += ["matches.match_id", "matches.raw_data"]
+            if with_raw:
+                select += ["match_payloads.dictionary_id", "match_payloads.payload"]
+
+            query = f"SELECT {', '.join(select)} FROM matches"
+            if with_raw:
+                query += " LEFT JOIN match_payloads ON match_payloads.match_id = matches.match_id"
+            query += " WHERE 1=1"
             params = []
 
             if championship:
-                query += " AND championship = ?"
+                query += " AND matches.championship = ?"
                 params.append(championship)
 
             if date_from:
-                query += " AND date >= ?"
+                query += " AND matches.date >= ?"
                 params.append(date_from)
 
             if date_to:
-                query += " AND date <= ?"
+                query += " AND matches.date <= ?"
                 params.append(date_to)
 
-            query += " ORDER BY date DESC LIMIT ?"
+            query += " ORDER BY matches.date DESC LIMIT ?"
             params.append(limit)
 
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
             matches = []
+            width = len(selected)
             for row in rows:
-                match_data = dict(row)
-                # Parser les données JSON si nécessaire
-                if 'raw_data' in match_data and match_data['raw_data']:
+                match_data = dict(zip(selected, row))
+
+                if not with_raw:
+                    if columns is None:
+                        match_id, fields_json = row[width:]
+                        match_data = LazyMatch(match_data, fields_json,
+                                               lambda match_id=match_id: self.get_match_payload(match_id))
+                    matches.append(match_data)
+                    continue
+
+                match_id, fields_json, dictionary_id, payload = row[width:]
+
+                # Chargement complet: champs parsés et payload API décodés tout de suite
+                fields = {}
+                if fields_json:
+                    try:
+                        fields = json.loads(fields_json)
+                    except ValueError as e:
+                        logger.warning(f"raw_data illisible pour le match {match_id}: {e}")
+                if columns is None:
+                    for name, value in fields.items():
+                        match_data.setdefault(name, value)
+                match_data['raw_data'] = fields.get('raw_data')
+                if payload is not None:
                     try:
-                        raw = json.loads(match_data['raw_data'])
-                        match_data.update(raw)
-                    except:
-                        pass
+                        match_data['raw_data'] = decompress_payload(
+                            payload, self._payload_dictionary(conn, dictionary_id))
+                    except (zlib.error, ValueError) as e:
+                        logger.error(f"Payload illisible pour le match {match_id}: {e}")
                 matches.append(match_data)
 
             conn.close()
@@ -277,6 +958,27 @@ class FootballDatabase:
             logger.error(f"Erreur récupération matches: {e}")
             return []
 
+    def get_match_payload(self, match_id: str) -> Optional[Dict]:
+        """Payload API brut d'un match (None s'il n'a pas été stocké)"""
+        try:
+            conn = self.get_connection()
+            row = conn.execute("SELECT dictionary_id, payload FROM match_payloads WHERE match_id = ?",
+                               (match_id,)).fetchone()
+            if row is None:
+                # Base pas encore compactée: payload imbriqué dans matches.raw_data
+                legacy = conn.execute("SELECT raw_data FROM matches WHERE match_id = ?",
+                                      (match_id,)).fetchone()
+                conn.close()
+                return json.loads(legacy[0]).get('raw_data') if legacy and legacy[0] else None
+
+            payload = decompress_payload(row[1], self._payload_dictionary(conn, row[0]))
+            conn.close()
+            return payload
+
+        except Exception as e:
+            logger.error(f"Erreur lecture payload {match_id}: {e}")
+            return None
+
     def get_standings(self, championship: str) -> List[Dict]:
         """Récupérer le classement depuis la base"""
         try:
@@ -387,15 +1089,289 @@ class FootballDatabase:
         except Exception as e:
             logger.error(f"Erreur log scraping: {e}")
 
+    def log_match_events(self, events: List[Dict]):
+        """Enregistrer des événements de matches en direct"""
+        if not events:
+            return
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            for event in events:
+                cursor.execute('''
+                INSERT INTO match_events
+                (match_id, championship, event_type, home_score, away_score, status, details)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    event.get('match_id'),
+                    event.get('championship'),
+                    event.get('event_type'),
+                    event.get('home_score'),
+                    event.get('away_score'),
+                    event.get('status'),
+                    json.dumps(event.get('details') or {})
+                ))
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"Erreur enregistrement événements: {e}")
+
+    def get_match_events(self, match_id: str = None, limit: int = 100) -> List[Dict]:
+        """Derniers événements en direct (d'un match ou de tous)"""
+        try:
+            conn = self.get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            query = "SELECT * FROM match_events"
+            params = []
+            if match_id:
+                query += " WHERE match_id = ?"
+                params.append(match_id)
+            query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params.append(limit)
+
+            cursor.execute(query, params)
+            events = [dict(row) for row in cursor.fetchall()]
+            conn.close()
+            return events
+
+        except Exception as e:
+            logger.error(f"Erreur récupération événements: {e}")
+            return []
+
+    def get_scraping_coverage(self, championship: str) -> List[Tuple[str, str]]:
+        """Plages (date_from, date_to) déjà scrapées avec succès"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            SELECT date_from, date_to FROM scraping_log
+            WHERE championship = ? AND status = 'success'
+            ORDER BY date_from
+            ''', (championship,))
+
+            ranges = cursor.fetchall()
+
+            conn.close()
+            return ranges
+
+        except Exception as e:
+            logger.error(f"Erreur lecture couverture scraping: {e}")
+            return []
+
+    def get_unfinished_match_dates(self, championship: str,
+                                   date_from: str, date_to: str) -> List[str]:
+        """Jours (YYYY-MM-DD) contenant des matches non terminés (programmés, en direct...)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            SELECT DISTINCT substr(date, 1, 10) FROM matches
+            WHERE championship = ?
+              AND substr(date, 1, 10) BETWEEN ? AND ?
+              AND status NOT IN ('finished', 'cancelled')
+            ORDER BY 1
+            ''', (championship, date_from, date_to))
+
+            dates = [row[0] for row in cursor.fetchall()]
+
+            conn.close()
+            return dates
+
+        except Exception as e:
+            logger.error(f"Erreur lecture matches non terminés: {e}")
+            return []
+
+    def get_fixtures(self, date_from: str, date_to: str,
+                     championships: List[str] = None) -> List[Dict]:
+        """Calendrier léger (coup d'envoi UTC, statut, journée) entre deux dates ISO"""
+        try:
+            conn = self.get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            query = '''
+            SELECT match_id, championship, date, status, matchday FROM matches
+            WHERE date >= ? AND date <= ?
+            '''
+            params = [date_from, date_to]
+
+            if championships:
+                query += f" AND championship IN ({', '.join('?' for _ in championships)})"
+                params.extend(championships)
+
+            query += " ORDER BY date"
+
+            cursor.execute(query, params)
+            fixtures = [dict(row) for row in cursor.fetchall()]
+
+            conn.close()
+            return fixtures
+
+        except Exception as e:
+            logger.error(f"Erreur lecture calendrier: {e}")
+            return []
+
+    def create_scrape_job(self, kind: str, championship: str, windows: List[Tuple[str, str, str]],
+                          date_from: str = None, date_to: str = None, season: int = None) -> Optional[int]:
+        """Créer un job de backfill et ses fenêtres (kind, date_from, date_to)"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            INSERT INTO scrape_jobs (kind, championship, date_from, date_to, season, status)
+            VALUES (?, ?, ?, ?, ?, 'pending')
+            ''', (kind, championship, date_from, date_to, season))
+            job_id = cursor.lastrowid
+
+            cursor.executemany('''
+            INSERT OR IGNORE INTO scrape_job_windows (job_id, kind, date_from, date_to)
+            VALUES (?, ?, ?, ?)
+            ''', [(job_id, window_kind, window_from, window_to)
+                  for window_kind, window_from, window_to in windows])
+
+            conn.commit()
+            conn.close()
+            return job_id
+
+        except Exception as e:
+            logger.error(f"Erreur création job: {e}")
+            return None
+
+    def add_job_windows(self, job_id: int, windows: List[Tuple[str, str, str]]):
+        """Ajouter des fenêtres à un job existant"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.executemany('''
+            INSERT OR IGNORE INTO scrape_job_windows (job_id, kind, date_from, date_to)
+            VALUES (?, ?, ?, ?)
+            ''', [(job_id, window_kind, window_from, window_to)
+                  for window_kind, window_from, window_to in windows])
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"Erreur ajout fenêtres job {job_id}: {e}")
+
+    def get_scrape_jobs(self, statuses: List[str] = None) -> List[Dict]:
+        """Lister les jobs (avec l'avancement de leurs fenêtres)"""
+        try:
+            conn = self.get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            query = '''
+            SELECT j.*,
+                   COUNT(w.id) AS windows_total,
+                   SUM(CASE WHEN w.status IN ('done', 'expanded') THEN 1 ELSE 0 END) AS windows_done,
+                   SUM(CASE WHEN w.status = 'failed' THEN 1 ELSE 0 END) AS windows_failed
+            FROM scrape_jobs j
+            LEFT JOIN scrape_job_windows w ON w.job_id = j.id
+            '''
+            params = []
+            if statuses:
+                query += f" WHERE j.status IN ({', '.join('?' for _ in statuses)})"
+                params.extend(statuses)
+            query += " GROUP BY j.id ORDER BY j.id"
+
+            cursor.execute(query, params)
+            jobs = [dict(row) for row in cursor.fetchall()]
+
+            conn.close()
+            return jobs
+
+        except Exception as e:
+            logger.error(f"Erreur lecture jobs: {e}")
+            return []
+
+    def get_scrape_job(self, job_id: int) -> Optional[Dict]:
+        """Récupérer un job"""
+        jobs = [job for job in self.get_scrape_jobs() if job['id'] == job_id]
+        return jobs[0] if jobs else None
+
+    def get_job_windows(self, job_id: int, statuses: List[str] = None) -> List[Dict]:
+        """Fenêtres d'un job, dans l'ordre des dates"""
+        try:
+            conn = self.get_connection()
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+
+            query = "SELECT * FROM scrape_job_windows WHERE job_id = ?"
+            params = [job_id]
+            if statuses:
+                query += f" AND status IN ({', '.join('?' for _ in statuses)})"
+                params.extend(statuses)
+            query += " ORDER BY date_from"
+
+            cursor.execute(query, params)
+            windows = [dict(row) for row in cursor.fetchall()]
+
+            conn.close()
+            return windows
+
+        except Exception as e:
+            logger.error(f"Erreur lecture fenêtres job {job_id}: {e}")
+            return []
+
+    def update_job_window(self, job_id: int, kind: str, date_from: str, date_to: str,
+                          status: str, matches_count: int = 0, error: str = None):
+        """Checkpoint: enregistrer l'état d'une fenêtre de job"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            UPDATE scrape_job_windows
+            SET status = ?, matches_count = ?, error_message = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ? AND kind = ? AND date_from = ? AND date_to = ?
+            ''', (status, matches_count, error, job_id, kind, date_from, date_to))
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"Erreur checkpoint job {job_id}: {e}")
+
+    def set_scrape_job_status(self, job_id: int, status: str):
+        """Changer le statut d'un job"""
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute('''
+            UPDATE scrape_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?
+            ''', (status, job_id))
+
+            conn.commit()
+            conn.close()
+
+        except Exception as e:
+            logger.error(f"Erreur statut job {job_id}: {e}")
+
     def clear_championship_data(self, championship: str):
         """Effacer les données d'un championnat"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
 
+            cursor.execute('''
+            DELETE FROM match_payloads
+            WHERE match_id IN (SELECT match_id FROM matches WHERE championship = ?)
+            ''', (championship,))
             cursor.execute("DELETE FROM matches WHERE championship = ?", (championship,))
             cursor.execute("DELETE FROM standings WHERE championship = ?", (championship,))
             cursor.execute("DELETE FROM team_stats WHERE championship = ?", (championship,))
+            cursor.execute("DELETE FROM teams WHERE championship = ?", (championship,))
 
             conn.commit()
             conn.close()
@@ -405,4 +1381,186 @@ class FootballDatabase:
 
         except Exception as e:
             logger.error(f"Erreur effacement données: {e}")
-            return False
\ No newline at end of file
+            return False
+
+    def get_storage_report(self) -> Dict:
+        """Taille du fichier et des données de matches (octets)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+        wal_path = f"{self.db_path}-wal"
+        report = {
+            'file_bytes': cursor.execute("PRAGMA page_count").fetchone()[0] * page_size,
+            'free_bytes': cursor.execute("PRAGMA freelist_count").fetchone()[0] * page_size,
+            'wal_bytes': os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+        }
+
+        report['matches'], report['matches_raw_data_bytes'] = cursor.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(raw_data)), 0) FROM matches").fetchone()
+        report['payloads'], report['payload_bytes'], report['payload_json_bytes'] = cursor.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0), COALESCE(SUM(size), 0) FROM match_payloads"
+        ).fetchone()
+        report['dictionaries'], report['dictionary_bytes'] = cursor.execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM payload_dictionaries").fetchone()
+
+        # Octets par table et index (table virtuelle dbstat, si SQLite la fournit)
+        try:
+            cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY SUM(pgsize) DESC")
+            report['tables'] = dict(cursor.fetchall())
+        except sqlite3.Error:
+            report['tables'] = {}
+
+        conn.close()
+        return report
+
+    def _payload_samples(self, conn) -> List[bytes]:
+        """Payloads récents (sérialisés) servant d'échantillons au dictionnaire, du plus ancien au plus récent"""
+        limit = Config.DB_PAYLOAD_ZDICT_MAX_SAMPLES
+        samples = []
+
+        # Anciennes lignes: payload imbriqué dans matches.raw_data
+        for (raw_data,) in conn.execute('''
+        SELECT raw_data FROM matches WHERE raw_data LIKE '%"raw_data": {%'
+        ORDER BY id DESC LIMIT ?
+        ''', (limit,)).fetchall():
+            try:
+                samples.append(payload_json(json.loads(raw_data)['raw_data']))
+            except (ValueError, KeyError, TypeError):
+                continue
+
+        for dictionary_id, payload in conn.execute('''
+        SELECT dictionary_id, payload FROM match_payloads ORDER BY rowid DESC LIMIT ?
+        ''', (max(0, limit - len(samples)),)).fetchall():
+            samples.append(payload_json(decompress_payload(payload, self._payload_dictionary(conn, dictionary_id))))
+
+        # Les plus récents en fin de dictionnaire (références les plus proches)
+        samples.reverse()
+        return samples
+
+    def compact_payloads(self, rebuild: bool = False, vacuum: bool = True) -> Dict:
+        """Migrer les anciennes lignes vers match_payloads puis réduire le fichier
+
+        1. construit un dictionnaire à partir des payloads déjà en base si
+           aucun n'existe (ou si rebuild);
+        2. sort le payload API imbriqué dans matches.raw_data (anciennes
+           bases) vers match_payloads, par tranches de
+           Config.DB_UPSERT_CHUNK_SIZE matches;
+        3. recompresse les payloads écrits sans le dictionnaire courant et
+           supprime les dictionnaires qui ne servent plus;
+        4. VACUUM pour rendre au système les pages libérées.
+        Renvoie les compteurs et les rapports de taille avant / après.
+        """
+        result = {'before': self.get_storage_report(), 'migrated': 0, 'recompressed': 0}
+        chunk_size = max(1, Config.DB_UPSERT_CHUNK_SIZE)
+        conn = self.get_connection()
+
+        dictionary_id = conn.execute("SELECT MAX(id) FROM payload_dictionaries").fetchone()[0]
+        samples = self._payload_samples(conn) if dictionary_id is None or rebuild else None
+        dictionary_id, compressor = self._current_payload_compressor(conn, samples, rebuild=rebuild)
+
+        last_id = 0
+        while True:
+            rows = conn.execute('''
+            SELECT id, match_id, raw_data FROM matches WHERE id > ? ORDER BY id LIMIT ?
+            ''', (last_id, chunk_size)).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            updates, payload_rows = [], []
+            for row_id, match_id, raw_data in rows:
+                try:
+                    fields = json.loads(raw_data) if raw_data else None
+                except ValueError:
+                    continue
+                if not isinstance(fields, dict) or 'raw_data' not in fields:
+                    continue
+                payload = fields.pop('raw_data')
+                updates.append((json.dumps(fields), row_id))
+                if payload is not None:
+                    data = payload_json(payload)
+                    payload_rows.append((match_id, dictionary_id, len(data), compress_payload(data, compressor)))
+
+            if updates:
+                conn.executemany(MATCH_PAYLOAD_UPSERT_SQL, payload_rows)
+                conn.executemany("UPDATE matches SET raw_data = ? WHERE id = ?", updates)
+                conn.commit()
+                result['migrated'] += len(updates)
+
+        if dictionary_id is not None:
+            last_match_id = ''
+            while True:
+                rows = conn.execute('''
+                SELECT match_id, dictionary_id, payload FROM match_payloads
+                WHERE dictionary_id IS NOT ? AND match_id > ? ORDER BY match_id LIMIT ?
+                ''', (dictionary_id, last_match_id, chunk_size)).fetchall()
+                if not rows:
+                    break
+                last_match_id = rows[-1][0]
+
+                payload_rows = []
+                for match_id, stored_id, payload in rows:
+                    data = payload_json(decompress_payload(payload, self._payload_dictionary(conn, stored_id)))
+                    payload_rows.append((match_id, dictionary_id, len(data), compress_payload(data, compressor)))
+                conn.executemany(MATCH_PAYLOAD_UPSERT_SQL, payload_rows)
+                conn.commit()
+                result['recompressed'] += len(payload_rows)
+
+            conn.execute('''
+            DELETE FROM payload_dictionaries
+            WHERE id != ? AND id NOT IN (SELECT dictionary_id FROM match_payloads
+                                         WHERE dictionary_id IS NOT NULL)
+            ''', (dictionary_id,))
+            conn.commit()
+
+        if vacuum:
+            conn.execute("VACUUM")
+        conn.close()
+        if vacuum:
+            self.checkpoint()
+
+        result['after'] = self.get_storage_report()
+        logger.info(f"Compactage: {result['migrated']} matches migrés, {result['recompressed']} payloads "
+                    f"recompressés, {result['before']['file_bytes']} -> {result['after']['file_bytes']} octets")
+        return result
+
+
+def _print_storage_report(title: str, report: Dict):
+    print(f"{title}:")
+    print(f"  fichier            {report['file_bytes']:>12,} octets (libres {report['free_bytes']:,}, "
+          f"WAL {report['wal_bytes']:,})")
+    print(f"  matches.raw_data   {report['matches_raw_data_bytes']:>12,} octets ({report['matches']} matches)")
+    print(f"  match_payloads     {report['payload_bytes']:>12,} octets ({report['payloads']} payloads, "
+          f"{report['payload_json_bytes']:,} en JSON)")
+    print(f"  dictionnaires      {report['dictionary_bytes']:>12,} octets ({report['dictionaries']})")
+    for name, size in list(report['tables'].items())[:8]:
+        print(f"    {name:<34} {size:>12,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintenance de la base SQLite des matches")
+    parser.add_argument('--db', default=Config.DB_PATH, help="Chemin de la base")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('size', help="Taille de la base et des données de matches")
+    compact_parser = subparsers.add_parser('compact', help="Sortir les payloads bruts vers match_payloads et compacter")
+    compact_parser.add_argument('--rebuild', action='store_true',
+                                help="Reconstruire le dictionnaire zlib à partir des payloads récents")
+    compact_parser.add_argument('--no-vacuum', action='store_true')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    db = FootballDatabase(args.db)
+    if args.command == 'size':
+        _print_storage_report("Base", db.get_storage_report())
+    elif args.command == 'compact':
+        result = db.compact_payloads(rebuild=args.rebuild, vacuum=not args.no_vacuum)
+        print(f"{result['migrated']} matches migrés, {result['recompressed']} payloads recompressés")
+        _print_storage_report("Avant", result['before'])
+        _print_storage_report("Après", result['after'])
+    db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+# db_bench.py
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List
+
+from config import Config
+from database import FootballDatabase, match_content_hash
+
+logger = logging.getLogger(__name__)
+
+
+def sample_match(index: int, championship: str = 'Premier League') -> Dict:
+    """Match parsé factice (même forme que FootballAPIScraper._parse_match_data)"""
+    day = 1 + index % 28
+    return {
+        'id': str(900000 + index),
+        'api_id': 900000 + index,
+        'date': f"2024-{1 + (index // 28) % 12:02d}-{day:02d}T15:00:00Z",
+        'home_team': f"Home {index % 20}",
+        'away_team': f"Away {(index + 7) % 20}",
+        'home_score': index % 4,
+        'away_score': index % 3,
+        'status': 'finished',
+        'competition': championship,
+        'matchday': 1 + index % 38,
+        'venue': 'Stadium',
+        'referee': 'Referee',
+        'half_time_home': index % 2,
+        'half_time_away': 0,
+        'raw_data': {'id': 900000 + index, 'status': 'FINISHED', 'utcDate': '2024-01-01T15:00:00Z',
+                     'homeTeam': {'name': f"Home {index % 20}"}, 'awayTeam': {'name': f"Away {(index + 7) % 20}"},
+                     'score': {'fullTime': {'home': index % 4, 'away': index % 3}}}
+    }
+
+
+def _timed(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - started) / calls
+
+
+def bench_connections(calls: int = 2000, threads: int = 4) -> List[Dict]:
+    """Coût par appel de FootballDatabase avec et sans pool de connexions"""
+    results = []
+    with tempfile.TemporaryDirectory(prefix='football_db_bench_') as tmp_dir:
+        for pooled in (False, True):
+            db = FootballDatabase(os.path.join(tmp_dir, f"bench_{int(pooled)}.db"), pooled=pooled)
+            db.save_teams('Premier League', [{'id': 1, 'name': 'Team 1'}])
+
+            read = _timed(lambda i: db.get_team(1), calls)
+            write = _timed(lambda i: db.save_match(sample_match(i)), max(1, calls // 10))
+
+            # Lectures concurrentes (threads du pipeline, sessions Streamlit)
+            def reader():
+                for _ in range(calls // threads):
+                    db.get_team(1)
+
+            workers = [threading.Thread(target=reader) for _ in range(threads)]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            concurrent_read = (time.perf_counter() - started) / max(1, calls // threads * threads)
+
+            results.append({
+                'mode': 'pool' if pooled else 'connexion par appel',
+                'read_us': read * 1e6,
+                'write_us': write * 1e6,
+                'concurrent_read_us': concurrent_read * 1e6,
+                'connections': (db.pool.connections_opened if db.pool is not None
+                                else calls + max(1, calls // 10) + calls // threads * threads)
+            })
+            db.close()
+
+    return results
+
+
+def _legacy_batch(db: FootballDatabase, matches: List[Dict]):
+    """Ancienne écriture de lot: un INSERT OR REPLACE par match (payload API imbriqué
+    dans raw_data), une transaction"""
+    conn = db.get_connection()
+    for match_data in matches:
+        conn.execute('''
+        INSERT OR REPLACE INTO matches
+        (match_id, championship, date, home_team, away_team, home_score, away_score,
+         status, matchday, venue, referee, raw_data, content_hash, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ''', db._match_row(match_data, match_content_hash(match_data))[:11]
+             + (json.dumps(match_data), match_content_hash(match_data)))
+    conn.commit()
+    conn.close()
+
+
+def bench_upsert(rows: int = 5000) -> List[Dict]:
+    """Insertion puis mise à jour de rows matches: boucle save_match, ancien lot, upsert_matches"""
+    results = []
+    fresh = [sample_match(i) for i in range(rows)]
+    modified = [dict(match, home_score=match['home_score'] + 1) for match in fresh]
+
+    with tempfile.TemporaryDirectory(prefix='football_db_bench_') as tmp_dir:
+        writers = {
+            'save_match (boucle)': lambda db, matches: [db.save_match(match) for match in matches],
+            'INSERT OR REPLACE (lot)': _legacy_batch,
+            'upsert_matches': lambda db, matches: db.upsert_matches(matches)
+        }
+        for index, (name, write) in enumerate(writers.items()):
+            db = FootballDatabase(os.path.join(tmp_dir, f"bench_upsert_{index}.db"))
+
+            started = time.perf_counter()
+            write(db, fresh)
+            insert = time.perf_counter() - started
+
+            conn = db.get_connection()
+            before = dict(conn.execute("SELECT match_id, id FROM matches").fetchall())
+            conn.close()
+
+            started = time.perf_counter()
+            write(db, modified)
+            update = time.perf_counter() - started
+
+            conn = db.get_connection()
+            after = dict(conn.execute("SELECT match_id, id FROM matches").fetchall())
+            conn.close()
+
+            results.append({
+                'writer': name,
+                'insert_rows_per_second': rows / insert,
+                'update_rows_per_second': rows / update,
+                'ids_preserved': before == after
+            })
+            db.close()
+
+    return results
+
+
+@contextmanager
+def _sqlite_profile(name: str):
+    """Profil de connexion à comparer: 'defaut' (réglages SQLite d'origine), 'profil' ou 'bulk'"""
+    saved = Config.DB_JOURNAL_MODE, Config.DB_PRAGMAS
+    if name == 'defaut':
+        Config.DB_JOURNAL_MODE, Config.DB_PRAGMAS = 'DELETE', {}
+    try:
+        yield
+    finally:
+        Config.DB_JOURNAL_MODE, Config.DB_PRAGMAS = saved
+
+
+class _LockCounter(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        if 'locked' in record.getMessage():
+            self.count += 1
+
+
+def bench_profile(rows: int = 2000, duration: float = 3.0, readers: int = 2) -> List[Dict]:
+    """Écritures ligne à ligne (un commit par match) et lectures concurrentes selon le profil SQLite"""
+    results = []
+    lock_counter = _LockCounter()
+    logging.getLogger('database').addHandler(lock_counter)
+
+    with tempfile.TemporaryDirectory(prefix='football_db_bench_') as tmp_dir:
+        for name in ('defaut', 'profil', 'bulk'):
+            with _sqlite_profile(name):
+                db = FootballDatabase(os.path.join(tmp_dir, f"bench_{name}.db"))
+                lock_counter.count = 0
+
+                started = time.perf_counter()
+                if name == 'bulk':
+                    with db.bulk_load():
+                        for i in range(rows):
+                            db.save_match(sample_match(i))
+                else:
+                    for i in range(rows):
+                        db.save_match(sample_match(i))
+                ingest = time.perf_counter() - started
+
+                # Un thread écrit pendant que d'autres lisent (scraping + interface)
+                stop_event = threading.Event()
+                counters = {'writes': 0, 'reads': 0}
+
+                def writer():
+                    i = rows
+                    while not stop_event.is_set():
+                        db.save_match(sample_match(i))
+                        counters['writes'] += 1
+                        i += 1
+
+                def reader():
+                    while not stop_event.is_set():
+                        db.get_matches(championship='Premier League', limit=50)
+                        counters['reads'] += 1
+
+                workers = [threading.Thread(target=writer)] + [threading.Thread(target=reader)
+                                                               for _ in range(readers)]
+                for worker in workers:
+                    worker.start()
+                time.sleep(duration)
+                stop_event.set()
+                for worker in workers:
+                    worker.join()
+
+                results.append({
+                    'profile': name,
+                    'ingest_rows_per_second': rows / ingest,
+                    'writes_per_second': counters['writes'] / duration,
+                    'reads_per_second': counters['reads'] / duration,
+                    'locked_errors': lock_counter.count
+                })
+                db.close()
+
+    logging.getLogger('database').removeHandler(lock_counter)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de la couche SQLite (FootballDatabase)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    connections_parser = subparsers.add_parser('connections', help="Coût par appel avec et sans pool de connexions")
+    connections_parser.add_argument('--calls', type=int, default=2000)
+    connections_parser.add_argument('--threads', type=int, default=4)
+
+    profile_parser = subparsers.add_parser('profile', help="Débit selon le profil SQLite (défaut, WAL, bulk)")
+    profile_parser.add_argument('--rows', type=int, default=2000)
+    profile_parser.add_argument('--duration', type=float, default=3.0, help="Durée du test concurrent (s)")
+    profile_parser.add_argument('--readers', type=int, default=2)
+
+    upsert_parser = subparsers.add_parser('upsert', help="Écriture de matches en masse (insertion et mise à jour)")
+    upsert_parser.add_argument('--rows', type=int, default=5000)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s %(levelname)s %(message)s')
+
+    if args.command == 'connections':
+        results = bench_connections(args.calls, args.threads)
+        print(f"{'Mode':<22} {'Lecture':>10} {'Écriture':>10} {'Lecture x' + str(args.threads):>12} {'Connexions':>11}")
+        for result in results:
+            print(f"{result['mode']:<22} {result['read_us']:>8.1f}µs {result['write_us']:>8.1f}µs "
+                  f"{result['concurrent_read_us']:>10.1f}µs {result['connections']:>11}")
+
+    elif args.command == 'profile':
+        results = bench_profile(args.rows, args.duration, args.readers)
+        print(f"{'Profil':<8} {'Ingestion':>14} {'Écritures':>12} {'Lectures':>12} {'Verrous':>8}")
+        for result in results:
+            print(f"{result['profile']:<8} {result['ingest_rows_per_second']:>10.0f} l/s "
+                  f"{result['writes_per_second']:>10.0f}/s {result['reads_per_second']:>10.0f}/s "
+                  f"{result['locked_errors']:>8}")
+
+    elif args.command == 'upsert':
+        results = bench_upsert(args.rows)
+        print(f"{'Écriture':<24} {'Insertion':>12} {'Mise à jour':>12} {'id conservés':>13}")
+        for result in results:
+            print(f"{result['writer']:<24} {result['insert_rows_per_second']:>8.0f} l/s "
+                  f"{result['update_rows_per_second']:>8.0f} l/s {'oui' if result['ids_preserved'] else 'non':>13}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,839 @@
+# emulator.py
+import argparse
+import hashlib
+import json
+import random
+import tempfile
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, date, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Écart maximal dateFrom / dateTo accepté par /matches (comme l'API réelle)
+MAX_DATE_RANGE_DAYS = 10
+
+TEAM_CITIES = [
+    'Northbridge', 'Eastwick', 'Port Alden', 'Riverton', 'Highmoor', 'Ashford', 'Kingsport',
+    'Westfield', 'Larkspur', 'Redcliff', 'Stonehaven', 'Marlow', 'Bellmont', 'Oakridge',
+    'Fairhaven', 'Greystone', 'Silverlake', 'Brookdale', 'Windmere', 'Crestview', 'Elmhurst',
+    'Thornbury', 'Castlerock', 'Millbrook'
+]
+TEAM_PREFIXES = {'PL': 'FC', 'FL1': 'AS', 'PD': 'CD', 'SA': 'AC', 'BL1': 'SV'}
+KICKOFF_SLOTS = [(5, 12, 30), (5, 15, 0), (5, 17, 30), (5, 20, 0), (6, 14, 0), (6, 16, 30), (6, 19, 0)]
+
+
+def _season_of(day: date) -> int:
+    """Année de début de la saison (août → mai) contenant ce jour"""
+    return day.year if day.month >= 7 else day.year - 1
+
+
+def _parse_day(value: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+class FixtureGenerator:
+    """Données synthétiques déterministes au format de l'API v4
+
+    Pour chaque championnat de Config.CHAMPIONSHIP_IDS: teams_per_competition
+    équipes, un calendrier aller-retour (un match par paire et par phase) à
+    raison d'une journée par week-end d'août à mai, et des scores tirés
+    d'une graine fixe. Le statut de chaque match est calculé à la volée par
+    rapport à l'heure courante (SCHEDULED, IN_PLAY, PAUSED, FINISHED) et le
+    score en cours suit des minutes de buts fixées d'avance: un suivi live
+    voit donc les buts arriver au fil du match.
+
+    padding ajoute ce nombre d'octets à chaque match pour simuler des
+    réponses plus lourdes.
+    """
+
+    def __init__(self, seed: int = 42, teams_per_competition: int = 20, seasons: int = 5,
+                 padding: int = 0):
+        self.seed = seed
+        self.teams_per_competition = max(2, teams_per_competition - teams_per_competition % 2)
+        self.season_count = seasons
+        self.padding = padding
+        self.competitions = {}
+        for championship, ids in Config.CHAMPIONSHIP_IDS.items():
+            competition = {'id': ids['code'], 'code': ids['id'], 'name': championship}
+            self.competitions[ids['code']] = competition
+            self.competitions[ids['id']] = competition
+        self._teams = {}
+        self._seasons = {}
+        self._lock = threading.Lock()
+
+    def competition_ref(self, competition_id) -> Optional[Dict]:
+        """Compétition à partir de son code ('PL') ou de son id numérique (2021)"""
+        if isinstance(competition_id, str) and competition_id.isdigit():
+            competition_id = int(competition_id)
+        return self.competitions.get(competition_id)
+
+    def current_season_year(self, now: datetime = None) -> int:
+        return _season_of((now or datetime.now(timezone.utc)).date())
+
+    def season_years(self, now: datetime = None) -> List[int]:
+        current = self.current_season_year(now)
+        return list(range(current, current - self.season_count, -1))
+
+    def teams(self, competition: Dict) -> List[Dict]:
+        """Équipes (effectif compris) d'une compétition"""
+        with self._lock:
+            teams = self._teams.get(competition['id'])
+            if teams is None:
+                rng = random.Random(f"{self.seed}:teams:{competition['id']}")
+                cities = rng.sample(TEAM_CITIES, self.teams_per_competition)
+                prefix = TEAM_PREFIXES.get(competition['code'], 'FC')
+                teams = []
+                for index, city in enumerate(cities):
+                    team_id = competition['id'] * 100 + index + 1
+                    teams.append({
+                        'id': team_id,
+                        'name': f"{prefix} {city}",
+                        'shortName': city,
+                        'tla': city.replace(' ', '')[:3].upper(),
+                        'crest': f"https://crests.football-data.org/{team_id}.png",
+                        'address': f"1 Stadium Road {city}",
+                        'website': f"http://www.{city.replace(' ', '').lower()}.example",
+                        'founded': rng.randint(1870, 1960),
+                        'clubColors': rng.choice(['Red / White', 'Blue / White', 'Black / Yellow',
+                                                  'Green / White', 'Navy / Sky Blue']),
+                        'venue': f"{city} Stadium",
+                        'coach': {'id': team_id * 10, 'name': f"Coach {city}", 'nationality': 'England'},
+                        'squad': [
+                            {'id': team_id * 100 + number, 'name': f"Player {number} {city}",
+                             'position': ('Goalkeeper', 'Defence', 'Midfield', 'Offence')[min(number // 7, 3)],
+                             'dateOfBirth': f"{rng.randint(1988, 2005)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+                             'nationality': 'England'}
+                            for number in range(1, 26)
+                        ],
+                        'lastUpdated': '2024-06-01T00:00:00Z'
+                    })
+                self._teams[competition['id']] = teams
+            return teams
+
+    def team(self, team_id: int) -> Optional[Tuple[Dict, Dict]]:
+        """(compétition, équipe) pour un id d'équipe"""
+        competition = self.competition_ref(team_id // 100)
+        if competition is None:
+            return None
+        for team in self.teams(competition):
+            if team['id'] == team_id:
+                return competition, team
+        return None
+
+    def season_start(self, season_year: int) -> date:
+        """Premier samedi après le 8 août"""
+        start = date(season_year, 8, 9)
+        return start + timedelta(days=(5 - start.weekday()) % 7)
+
+    def season_end(self, season_year: int) -> date:
+        """Lendemain de la dernière journée"""
+        return self.season_start(season_year) + timedelta(weeks=(self.teams_per_competition - 1) * 2)
+
+    def _fixtures(self, competition: Dict, season_year: int) -> List[Dict]:
+        """Squelette de la saison: affiches, coups d'envoi et minutes des buts"""
+        key = (competition['id'], season_year)
+        with self._lock:
+            fixtures = self._seasons.get(key)
+        if fixtures is not None:
+            return fixtures
+
+        teams = self.teams(competition)
+        count = len(teams)
+        rng = random.Random(f"{self.seed}:season:{competition['id']}:{season_year}")
+        start = self.season_start(season_year)
+
+        # Méthode du cercle: chaque équipe rencontre toutes les autres une fois par phase
+        rotation = list(range(count))
+        rounds = []
+        for _ in range(count - 1):
+            pairs = [(rotation[i], rotation[count - 1 - i]) for i in range(count // 2)]
+            rounds.append(pairs)
+            rotation = [rotation[0]] + [rotation[-1]] + rotation[1:-1]
+        rounds += [[(away, home) for home, away in pairs] for pairs in rounds]
+
+        fixtures = []
+        for matchday, pairs in enumerate(rounds, start=1):
+            weekend = start + timedelta(weeks=matchday - 1)
+            for index, (home, away) in enumerate(pairs):
+                weekday, hour, minute = KICKOFF_SLOTS[index % len(KICKOFF_SLOTS)]
+                day = weekend + timedelta(days=weekday - 5)
+                kickoff = datetime(day.year, day.month, day.day, hour, minute, tzinfo=timezone.utc)
+                fixtures.append({
+                    'id': int(f"{season_year}{competition['id']}{len(fixtures) + 1:03d}"),
+                    'matchday': matchday,
+                    'kickoff': kickoff,
+                    'home': teams[home],
+                    'away': teams[away],
+                    'home_goals': sorted(rng.randint(1, 90) for _ in range(rng.choice([0, 0, 1, 1, 1, 2, 2, 3, 4]))),
+                    'away_goals': sorted(rng.randint(1, 90) for _ in range(rng.choice([0, 0, 1, 1, 2, 2, 3]))),
+                    'referee': f"Referee {rng.randint(1, 40)}"
+                })
+
+        with self._lock:
+            self._seasons[key] = fixtures
+        return fixtures
+
+    def _render(self, competition: Dict, season_year: int, fixture: Dict, now: datetime) -> Dict:
+        """Match au format v4, dans son état à l'instant now"""
+        elapsed = (now - fixture['kickoff']).total_seconds() / 60
+        if elapsed < 0:
+            status, minute = 'SCHEDULED', None
+        elif elapsed >= 110:
+            status, minute = 'FINISHED', 90
+        elif 47 <= elapsed < 62:
+            status, minute = 'PAUSED', 45
+        else:
+            status = 'IN_PLAY'
+            minute = min(90, int(elapsed if elapsed < 47 else elapsed - 17))
+
+        def score_at(goals: List[int], until: Optional[int]) -> Optional[int]:
+            return None if until is None else sum(1 for goal in goals if goal <= until)
+
+        home_score = score_at(fixture['home_goals'], minute)
+        away_score = score_at(fixture['away_goals'], minute)
+        half_minute = None if minute is None else min(minute, 45)
+        winner = None
+        if status == 'FINISHED':
+            winner = ('HOME_TEAM' if home_score > away_score
+                      else 'AWAY_TEAM' if away_score > home_score else 'DRAW')
+
+        season_start = self.season_start(season_year)
+        match = {
+            'area': {'id': 2072, 'name': 'Europe', 'code': 'EUR'},
+            'competition': {'id': competition['id'], 'name': competition['name'],
+                            'code': competition['code'], 'type': 'LEAGUE'},
+            'season': {'id': season_year * 10 + competition['id'] % 10,
+                       'startDate': season_start.isoformat(),
+                       'endDate': self.season_end(season_year).isoformat(),
+                       'currentMatchday': fixture['matchday']},
+            'id': fixture['id'],
+            'utcDate': fixture['kickoff'].strftime(ISO_FORMAT),
+            'status': status,
+            'minute': minute if status == 'IN_PLAY' else None,
+            'matchday': fixture['matchday'],
+            'stage': 'REGULAR_SEASON',
+            'group': None,
+            'lastUpdated': now.strftime(ISO_FORMAT) if status in ('IN_PLAY', 'PAUSED')
+            else fixture['kickoff'].strftime(ISO_FORMAT),
+            'homeTeam': {key: fixture['home'][key] for key in ('id', 'name', 'shortName', 'tla', 'crest')},
+            'awayTeam': {key: fixture['away'][key] for key in ('id', 'name', 'shortName', 'tla', 'crest')},
+            'score': {
+                'winner': winner,
+                'duration': 'REGULAR',
+                'fullTime': {'home': home_score, 'away': away_score},
+                'halfTime': {'home': score_at(fixture['home_goals'], half_minute),
+                             'away': score_at(fixture['away_goals'], half_minute)}
+            },
+            'odds': {'msg': 'Activate Odds-Package in User-Panel to retrieve odds.'},
+            'venue': fixture['home']['venue'],
+            'referees': [{'id': 1, 'name': fixture['referee'], 'type': 'REFEREE', 'nationality': 'England'}]
+        }
+        if self.padding:
+            match['padding'] = 'x' * self.padding
+        return match
+
+    def matches(self, competition: Dict, season_year: int, now: datetime = None) -> List[Dict]:
+        """Tous les matches d'une saison, dans leur état à l'instant now"""
+        now = now or datetime.now(timezone.utc)
+        return [self._render(competition, season_year, fixture, now)
+                for fixture in self._fixtures(competition, season_year)]
+
+    def matches_between(self, competition: Dict, date_from: date, date_to: date,
+                        now: datetime = None) -> List[Dict]:
+        """Matches dont le coup d'envoi tombe entre deux dates incluses"""
+        now = now or datetime.now(timezone.utc)
+        matches = []
+        for season_year in sorted({_season_of(date_from), _season_of(date_to)}):
+            for fixture in self._fixtures(competition, season_year):
+                if date_from <= fixture['kickoff'].date() <= date_to:
+                    matches.append(self._render(competition, season_year, fixture, now))
+        return matches
+
+    def current_matchday(self, competition: Dict, now: datetime = None) -> int:
+        now = now or datetime.now(timezone.utc)
+        fixtures = self._fixtures(competition, self.current_season_year(now))
+        started = [fixture['matchday'] for fixture in fixtures if fixture['kickoff'] <= now]
+        return max(started) if started else 1
+
+    def competition(self, competition: Dict, now: datetime = None) -> Dict:
+        """Document /competitions/{id}"""
+        now = now or datetime.now(timezone.utc)
+        seasons = []
+        for season_year in self.season_years(now):
+            start = self.season_start(season_year)
+            seasons.append({
+                'id': season_year * 10 + competition['id'] % 10,
+                'startDate': start.isoformat(),
+                'endDate': self.season_end(season_year).isoformat(),
+                'currentMatchday': (self.current_matchday(competition, now)
+                                    if season_year == self.current_season_year(now)
+                                    else (self.teams_per_competition - 1) * 2),
+                'winner': None
+            })
+        return {
+            'area': {'id': 2072, 'name': 'Europe', 'code': 'EUR'},
+            'id': competition['id'],
+            'name': competition['name'],
+            'code': competition['code'],
+            'type': 'LEAGUE',
+            'emblem': f"https://crests.football-data.org/{competition['code']}.png",
+            'currentSeason': seasons[0],
+            'seasons': seasons,
+            'lastUpdated': now.strftime(ISO_FORMAT)
+        }
+
+    def standings(self, competition: Dict, season_year: int, matchday: int = None,
+                  now: datetime = None) -> Dict:
+        """Document /competitions/{id}/standings (classements TOTAL, HOME et AWAY)"""
+        now = now or datetime.now(timezone.utc)
+        tables = {kind: {team['id']: {'team': team, 'playedGames': 0, 'won': 0, 'draw': 0, 'lost': 0,
+                                      'goalsFor': 0, 'goalsAgainst': 0, 'form': []}
+                         for team in self.teams(competition)}
+                  for kind in ('TOTAL', 'HOME', 'AWAY')}
+
+        for match in self.matches(competition, season_year, now):
+            if match['status'] != 'FINISHED' or (matchday and match['matchday'] > matchday):
+                continue
+            home_goals, away_goals = match['score']['fullTime']['home'], match['score']['fullTime']['away']
+            for kind, team_id, scored, conceded in (
+                    ('HOME', match['homeTeam']['id'], home_goals, away_goals),
+                    ('AWAY', match['awayTeam']['id'], away_goals, home_goals)):
+                for table in (tables['TOTAL'], tables[kind]):
+                    row = table[team_id]
+                    row['playedGames'] += 1
+                    row['goalsFor'] += scored
+                    row['goalsAgainst'] += conceded
+                    result = 'W' if scored > conceded else 'L' if scored < conceded else 'D'
+                    row[{'W': 'won', 'D': 'draw', 'L': 'lost'}[result]] += 1
+                    row['form'].append(result)
+
+        standings = []
+        for kind, table in tables.items():
+            rows = []
+            for row in table.values():
+                team = row['team']
+                rows.append({
+                    'team': {key: team[key] for key in ('id', 'name', 'shortName', 'tla', 'crest')},
+                    'playedGames': row['playedGames'],
+                    'form': ','.join(reversed(row['form'][-5:])) or None,
+                    'won': row['won'],
+                    'draw': row['draw'],
+                    'lost': row['lost'],
+                    'points': row['won'] * 3 + row['draw'],
+                    'goalsFor': row['goalsFor'],
+                    'goalsAgainst': row['goalsAgainst'],
+                    'goalDifference': row['goalsFor'] - row['goalsAgainst']
+                })
+            rows.sort(key=lambda item: (-item['points'], -item['goalDifference'], -item['goalsFor'],
+                                        item['team']['name']))
+            for position, item in enumerate(rows, start=1):
+                item['position'] = position
+            standings.append({'stage': 'REGULAR_SEASON', 'type': kind, 'group': None,
+                              'table': [dict(position=item.pop('position'), **item) for item in rows]})
+
+        document = self.competition(competition, now)
+        return {
+            'filters': {'season': str(season_year)},
+            'area': document['area'],
+            'competition': {key: document[key] for key in ('id', 'name', 'code', 'type', 'emblem')},
+            'season': next((season for season in document['seasons']
+                            if season['startDate'].startswith(str(season_year))), document['currentSeason']),
+            'standings': standings
+        }
+
+
+class ArchiveReplay:
+    """Réponses archivées (PayloadArchive) rejouées à l'identique
+
+    Index (chemin, paramètres) → dernière réponse archivée; le chemin est
+    relatif à la racine de l'API (/matches, /competitions/PL/standings...).
+    """
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.index = {}
+        for fetch in archive.iter_fetches():
+            path = urlsplit(fetch['url']).path
+            if '/v4' in path:
+                path = path.split('/v4', 1)[1]
+            params = json.loads(fetch['params'] or '{}')
+            self.index[self.make_key(path, params)] = fetch['sha256']
+        logger.info(f"Archive: {len(self.index)} réponses rejouables")
+
+    @staticmethod
+    def make_key(path: str, params: Dict) -> str:
+        return f"{path.rstrip('/')}?" + '&'.join(f"{name}={params[name]}" for name in sorted(params))
+
+    def lookup(self, path: str, params: Dict) -> Optional[bytes]:
+        sha256 = self.index.get(self.make_key(path, params))
+        return self.archive.load(sha256) if sha256 else None
+
+
+class _QuotaWindow:
+    __slots__ = ('started_at', 'count')
+
+    def __init__(self, started_at: float):
+        self.started_at = started_at
+        self.count = 0
+
+
+class FootballDataEmulator:
+    """Serveur HTTP local imitant football-data.org v4, pour tests et benchmarks hors ligne
+
+    Endpoints servis: /matches, /competitions/{id}, /competitions/{id}/matches,
+    /competitions/{id}/standings, /competitions/{id}/teams, /teams/{id} et
+    /teams/{id}/matches, avec ou sans préfixe /v4. Les réponses viennent de
+    l'archive (ArchiveReplay) si une réponse y correspond exactement, sinon du
+    FixtureGenerator.
+
+    Comportement réglable:
+      - latency / jitter: délai de réponse en secondes (moyenne, écart max);
+      - requests_per_minute: quota par clé X-Auth-Token sur une fenêtre
+        fixe d'une minute, annoncé dans X-Requests-Available-Minute et
+        X-RequestCounter-Reset, avec 429 au-delà (0 = illimité);
+      - throttle_rate / error_rate: proportion de 429 et de 503 injectés;
+      - api_keys: clés acceptées (les autres reçoivent 403), toutes si None.
+
+    Pointer le scraper dessus: FOOTBALL_DATA_URL=<base_url>.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, generator: FixtureGenerator = None,
+                 archive_replay: ArchiveReplay = None, latency: float = 0.0, jitter: float = 0.0,
+                 requests_per_minute: int = 10, throttle_rate: float = 0.0, error_rate: float = 0.0,
+                 api_keys: List[str] = None, seed: int = 42):
+        self.generator = generator or FixtureGenerator(seed=seed)
+        self.archive_replay = archive_replay
+        self.latency = latency
+        self.jitter = jitter
+        self.requests_per_minute = requests_per_minute
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.api_keys = set(api_keys) if api_keys else None
+        self._random = random.Random(seed)
+        self._quota = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._durations = deque(maxlen=10000)
+        self._thread = None
+
+        self.server = ThreadingHTTPServer((host, port), _EmulatorHandler)
+        self.server.daemon_threads = True
+        self.server.emulator = self
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/v4"
+
+    def start(self) -> str:
+        """Lancer le serveur dans un thread de fond; renvoie son URL de base"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+            self._thread.start()
+            logger.info(f"Émulateur football-data.org sur {self.base_url}")
+        return self.base_url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    # Quota et incidents
+
+    def _consume_quota(self, api_key: Optional[str]) -> Tuple[bool, Dict[str, str]]:
+        """Compter une requête pour cette clé; renvoie (autorisée, en-têtes de quota)"""
+        if not self.requests_per_minute:
+            return True, {}
+
+        with self._lock:
+            now = time.monotonic()
+            window = self._quota.get(api_key)
+            if window is None or now - window.started_at >= 60:
+                window = self._quota[api_key] = _QuotaWindow(now)
+            window.count += 1
+            reset = max(1, int(round(60 - (now - window.started_at))))
+            available = self.requests_per_minute - window.count
+
+        headers = {'X-RequestCounter-Reset': str(reset)}
+        if available < 0:
+            return False, headers
+        headers['X-Requests-Available-Minute'] = str(available)
+        return True, headers
+
+    def _record(self, endpoint: str, status_code: int, size: int, duration: float):
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, {'requests': 0, 'bytes': 0, 'status': {}})
+            stats['requests'] += 1
+            stats['bytes'] += size
+            stats['status'][status_code] = stats['status'].get(status_code, 0) + 1
+            self._durations.append(duration)
+
+    def get_stats(self) -> Dict:
+        """Requêtes servies par endpoint (compteurs par code HTTP, octets) et latences"""
+        with self._lock:
+            durations = sorted(self._durations)
+            endpoints = {endpoint: {'requests': stats['requests'], 'bytes': stats['bytes'],
+                                    'status': dict(stats['status'])}
+                         for endpoint, stats in self._stats.items()}
+
+        def percentile(value: float) -> float:
+            return durations[min(len(durations) - 1, int(len(durations) * value))] if durations else 0.0
+
+        return {
+            'requests': sum(stats['requests'] for stats in endpoints.values()),
+            'throttled': sum(stats['status'].get(429, 0) for stats in endpoints.values()),
+            'bytes': sum(stats['bytes'] for stats in endpoints.values()),
+            'p50': percentile(0.5),
+            'p95': percentile(0.95),
+            'endpoints': endpoints
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+            self._durations.clear()
+            self._quota.clear()
+
+    # Routage
+
+    def handle(self, path: str, query: str, headers) -> Tuple[int, Dict[str, str], bytes, str]:
+        """Traiter un GET; renvoie (code HTTP, en-têtes, corps, classe d'endpoint)"""
+        if path.startswith('/v4'):
+            path = path[3:]
+        params = {name: values[-1] for name, values in parse_qs(query).items()}
+        parts = [part for part in path.strip('/').split('/') if part]
+        endpoint = '/' + '/'.join('{id}' if i % 2 else part for i, part in enumerate(parts))
+
+        api_key = headers.get('X-Auth-Token')
+        if self.api_keys is not None and api_key not in self.api_keys:
+            return 403, {}, self._error(403, "The resource you are looking for is restricted."), endpoint
+
+        allowed, quota_headers = self._consume_quota(api_key)
+        if not allowed or (self.throttle_rate and self._random.random() < self.throttle_rate):
+            reset = quota_headers.get('X-RequestCounter-Reset', '1')
+            quota_headers.setdefault('X-RequestCounter-Reset', reset)
+            quota_headers.pop('X-Requests-Available-Minute', None)
+            message = f"You reached your request limit. Wait {reset} seconds."
+            return 429, quota_headers, self._error(429, message), endpoint
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            return 503, dict(quota_headers, **{'Retry-After': '1'}), self._error(503, "Service unavailable"), endpoint
+
+        body = self.archive_replay.lookup(path, params) if self.archive_replay else None
+        status_code = 200
+        if body is None:
+            status_code, document = self._route(parts, params)
+            body = json.dumps(document).encode('utf-8')
+
+        response_headers = dict(quota_headers)
+        if status_code == 200:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            response_headers['ETag'] = etag
+            if headers.get('If-None-Match') == etag:
+                return 304, response_headers, b'', endpoint
+        return status_code, response_headers, body, endpoint
+
+    @staticmethod
+    def _error(status_code: int, message: str) -> bytes:
+        return json.dumps({'message': message, 'errorCode': status_code}).encode('utf-8')
+
+    def _route(self, parts: List[str], params: Dict[str, str]) -> Tuple[int, Dict]:
+        generator = self.generator
+        now = datetime.now(timezone.utc)
+
+        if parts == ['matches']:
+            return self._matches(params, now)
+
+        if len(parts) >= 2 and parts[0] == 'competitions':
+            competition = generator.competition_ref(parts[1])
+            if competition is None:
+                return 404, {'message': f"Resource {parts[1]} not found", 'errorCode': 404}
+
+            season_year = params.get('season')
+            if season_year is not None:
+                if not season_year.isdigit() or int(season_year) not in generator.season_years(now):
+                    return 404, {'message': 'Season not found', 'errorCode': 404}
+                season_year = int(season_year)
+            else:
+                season_year = generator.current_season_year(now)
+
+            if len(parts) == 2:
+                return 200, generator.competition(competition, now)
+
+            if parts[2] == 'matches':
+                matches = generator.matches(competition, season_year, now)
+                if params.get('matchday', '').isdigit():
+                    matches = [match for match in matches if match['matchday'] == int(params['matchday'])]
+                return 200, self._match_list(matches, params, competition)
+
+            if parts[2] == 'standings':
+                matchday = int(params['matchday']) if params.get('matchday', '').isdigit() else None
+                return 200, generator.standings(competition, season_year, matchday, now)
+
+            if parts[2] == 'teams':
+                document = generator.competition(competition, now)
+                return 200, {
+                    'count': len(generator.teams(competition)),
+                    'filters': {'season': str(season_year)},
+                    'competition': {key: document[key] for key in ('id', 'name', 'code', 'type', 'emblem')},
+                    'season': document['currentSeason'],
+                    'teams': generator.teams(competition)
+                }
+
+        if len(parts) >= 2 and parts[0] == 'teams' and parts[1].isdigit():
+            found = generator.team(int(parts[1]))
+            if found is None:
+                return 404, {'message': f"Resource {parts[1]} not found", 'errorCode': 404}
+            competition, team = found
+
+            if len(parts) == 2:
+                document = generator.competition(competition, now)
+                return 200, dict(team, runningCompetitions=[
+                    {key: document[key] for key in ('id', 'name', 'code', 'type', 'emblem')}])
+
+            if parts[2] == 'matches':
+                matches = [match for match in generator.matches(competition, generator.current_season_year(now), now)
+                           if team['id'] in (match['homeTeam']['id'], match['awayTeam']['id'])]
+                if params.get('status') == 'FINISHED':
+                    # Les plus récents d'abord, comme l'API
+                    matches = [match for match in matches if match['status'] == 'FINISHED'][::-1]
+                if params.get('limit', '').isdigit():
+                    matches = matches[:int(params['limit'])]
+                return 200, self._match_list(matches, params)
+
+        return 404, {'message': 'Resource not found', 'errorCode': 404}
+
+    def _matches(self, params: Dict[str, str], now: datetime) -> Tuple[int, Dict]:
+        """/matches: filtres competitions, dateFrom/dateTo, status et ids"""
+        generator = self.generator
+
+        if params.get('competitions'):
+            competitions = [generator.competition_ref(value) for value in params['competitions'].split(',')]
+            competitions = [competition for competition in competitions if competition is not None]
+        else:
+            competitions = list({competition['id']: competition
+                                 for competition in generator.competitions.values()}.values())
+
+        if 'ids' in params:
+            wanted = {value for value in params['ids'].split(',') if value}
+            matches = []
+            for competition in competitions:
+                for season_year in {int(value[:4]) for value in wanted if value[:4].isdigit()}:
+                    if season_year in generator.season_years(now):
+                        matches.extend(match for match in generator.matches(competition, season_year, now)
+                                       if str(match['id']) in wanted)
+            return 200, self._match_list(matches, params)
+
+        today = now.date()
+        date_from = _parse_day(params.get('dateFrom')) if 'dateFrom' in params else today
+        date_to = _parse_day(params.get('dateTo')) if 'dateTo' in params else today + timedelta(days=1)
+        if date_from is None or date_to is None or date_to < date_from:
+            return 400, {'message': 'Invalid date range', 'errorCode': 400}
+        if (date_to - date_from).days > MAX_DATE_RANGE_DAYS:
+            return 400, {'message': f"The date range must not exceed {MAX_DATE_RANGE_DAYS} days", 'errorCode': 400}
+
+        matches = []
+        for competition in competitions:
+            matches.extend(generator.matches_between(competition, date_from, date_to, now))
+        matches.sort(key=lambda match: match['utcDate'])
+        return 200, self._match_list(matches, params)
+
+    @staticmethod
+    def _match_list(matches: List[Dict], params: Dict[str, str], competition: Dict = None) -> Dict:
+        status = params.get('status')
+        if status:
+            wanted = set(status.split(','))
+            if 'LIVE' in wanted:
+                wanted |= {'IN_PLAY', 'PAUSED'}
+            matches = [match for match in matches if match['status'] in wanted]
+
+        document = {
+            'filters': params,
+            'resultSet': {
+                'count': len(matches),
+                'first': matches[0]['utcDate'][:10] if matches else None,
+                'last': matches[-1]['utcDate'][:10] if matches else None,
+                'played': sum(1 for match in matches if match['status'] == 'FINISHED')
+            },
+            'matches': matches
+        }
+        if competition is not None:
+            document['competition'] = {key: competition[key] for key in ('id', 'name', 'code')}
+        return document
+
+
+class _EmulatorHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        emulator = self.server.emulator
+        started_at = time.monotonic()
+
+        if emulator.latency or emulator.jitter:
+            time.sleep(max(0.0, emulator.latency + emulator._random.uniform(-emulator.jitter, emulator.jitter)))
+
+        url = urlsplit(self.path)
+        try:
+            status_code, headers, body, endpoint = emulator.handle(url.path, url.query, self.headers)
+        except Exception as e:
+            logger.error(f"Erreur émulateur sur {self.path}: {e}")
+            status_code, headers, body, endpoint = 500, {}, emulator._error(500, str(e)), url.path
+
+        self.send_response(status_code)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+        emulator._record(endpoint, status_code, len(body), time.monotonic() - started_at)
+
+
+def run_bench(emulator: FootballDataEmulator, concurrency_levels: List[int], championships: List[str],
+              date_from: str, date_to: str, keys: int = 1) -> List[Dict]:
+    """Mesurer le débit du scraper contre l'émulateur pour chaque niveau de concurrence
+
+    Chaque passe récupère la période demandée championnat par championnat
+    (fenêtres de 7 jours, AsyncFetchEngine) avec un scraper neuf: pas de
+    cache HTTP partagé, pas d'archive. La configuration modifiée pour le
+    bench est restaurée à la fin.
+    """
+    from scraper import FootballAPIScraper
+
+    base_url = emulator.start()
+    overridden = ('FOOTBALL_DATA_URL', 'FOOTBALL_DATA_API_KEYS', 'ARCHIVE_ENABLED', 'CACHE_DB_PATH',
+                  'MAX_REQUESTS_PER_MINUTE', 'MAX_CONCURRENT_REQUESTS')
+    saved = {name: getattr(Config, name) for name in overridden}
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix='football_bench_') as cache_dir:
+            Config.FOOTBALL_DATA_URL = base_url
+            Config.FOOTBALL_DATA_API_KEYS = [f"bench-key-{index + 1}" for index in range(max(1, keys))]
+            Config.ARCHIVE_ENABLED = False
+            Config.CACHE_DB_PATH = f"{cache_dir}/api_cache.db"
+            # Le limiteur du scraper démarre au quota annoncé par l'émulateur (sinon sans limite pratique)
+            Config.MAX_REQUESTS_PER_MINUTE = emulator.requests_per_minute or 100000
+
+            for concurrency in concurrency_levels:
+                Config.MAX_CONCURRENT_REQUESTS = concurrency
+                scraper = FootballAPIScraper()
+                emulator.reset_stats()
+
+                started_at = time.perf_counter()
+                matches = 0
+                failed_windows = 0
+                for championship in championships:
+                    for batch in scraper.iter_matches_by_date_range(championship, date_from, date_to):
+                        matches += len(batch.matches)
+                        failed_windows += batch.error is not None
+                duration = time.perf_counter() - started_at
+
+                stats = emulator.get_stats()
+                results.append({
+                    'concurrency': concurrency,
+                    'duration': duration,
+                    'requests': stats['requests'],
+                    'throttled': stats['throttled'],
+                    'matches': matches,
+                    'requests_per_second': stats['requests'] / duration if duration else 0.0,
+                    'p50': stats['p50'],
+                    'p95': stats['p95'],
+                    'failed_windows': failed_windows
+                })
+                logger.info(f"Concurrence {concurrency}: {stats['requests']} requêtes en {duration:.1f}s")
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Émulateur local de football-data.org v4")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Lancer le serveur")
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--archive', action='store_true',
+                              help=f"Rejouer les réponses archivées ({Config.ARCHIVE_DIR}) avant les données générées")
+
+    bench_parser = subparsers.add_parser('bench', help="Mesurer le débit du scraper selon la concurrence")
+    bench_parser.add_argument('--concurrency', type=int, action='append', dest='concurrency_levels',
+                              help="Niveau de concurrence à tester (répétable, défaut: 1 2 4 8)")
+    bench_parser.add_argument('--championship', action='append', dest='championships',
+                              help="Championnat à récupérer (répétable, défaut: Premier League)")
+    bench_parser.add_argument('--from', dest='date_from', help="Début de période (défaut: début de saison)")
+    bench_parser.add_argument('--to', dest='date_to', help="Fin de période (défaut: début + 90 jours)")
+    bench_parser.add_argument('--keys', type=int, default=1, help="Nombre de clés API du pool")
+
+    for subparser in (serve_parser, bench_parser):
+        subparser.add_argument('--latency', type=float, default=0.15, help="Latence moyenne (secondes)")
+        subparser.add_argument('--jitter', type=float, default=0.05, help="Variation de latence (secondes)")
+        subparser.add_argument('--requests-per-minute', type=int, default=0,
+                               help="Quota par clé et par minute (0 = illimité)")
+        subparser.add_argument('--throttle-rate', type=float, default=0.0, help="Proportion de 429 injectés")
+        subparser.add_argument('--error-rate', type=float, default=0.0, help="Proportion de 503 injectés")
+        subparser.add_argument('--padding', type=int, default=0, help="Octets ajoutés à chaque match")
+        subparser.add_argument('--teams', type=int, default=20, help="Équipes par championnat")
+        subparser.add_argument('--seed', type=int, default=42)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    archive_replay = None
+    if getattr(args, 'archive', False):
+        from archive import PayloadArchive
+        archive_replay = ArchiveReplay(PayloadArchive(Config.ARCHIVE_DIR))
+
+    emulator = FootballDataEmulator(
+        host=getattr(args, 'host', '127.0.0.1'), port=getattr(args, 'port', 0),
+        generator=FixtureGenerator(seed=args.seed, teams_per_competition=args.teams, padding=args.padding),
+        archive_replay=archive_replay, latency=args.latency, jitter=args.jitter,
+        requests_per_minute=args.requests_per_minute, throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate, seed=args.seed
+    )
+
+    if args.command == 'serve':
+        print(f"Émulateur sur {emulator.base_url} (FOOTBALL_DATA_URL={emulator.base_url})")
+        try:
+            emulator.server.serve_forever()
+        except KeyboardInterrupt:
+            emulator.stop()
+        return
+
+    season_start = emulator.generator.season_start(emulator.generator.current_season_year() - 1)
+    date_from = args.date_from or season_start.isoformat()
+    date_to = args.date_to or (season_start + timedelta(days=90)).isoformat()
+    results = run_bench(emulator, args.concurrency_levels or [1, 2, 4, 8],
+                        args.championships or ['Premier League'], date_from, date_to, args.keys)
+    emulator.stop()
+
+    print(f"\nPériode {date_from} → {date_to}, latence {args.latency:.2f}s, "
+          f"quota {args.requests_per_minute or 'illimité'}/min, {args.keys} clé(s)")
+    print(f"{'Concurrence':>11} {'Durée':>8} {'Requêtes':>9} {'Req/s':>7} {'429':>5} {'p50':>7} {'p95':>7} {'Matches':>8}")
+    for result in results:
+        print(f"{result['concurrency']:>11} {result['duration']:>7.1f}s {result['requests']:>9} "
+              f"{result['requests_per_second']:>7.1f} {result['throttled']:>5} {result['p50']:>6.3f}s "
+              f"{result['p95']:>6.3f}s {result['matches']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+# http_cache.py
+import sqlite3
+import json
+import hashlib
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """Réponse servie depuis le cache (même interface utile que requests.Response)"""
+
+    from_cache = True
+
+    def __init__(self, url: str, content: bytes, headers: Dict, status_code: int = 200):
+        self.url = url
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.status_code = status_code
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class CacheEntry:
+    """Entrée du cache avec ses validateurs HTTP"""
+
+    def __init__(self, key: str, url: str, content: bytes, headers: Dict,
+                 fetched_at: float, ttl: int):
+        self.key = key
+        self.url = url
+        self.content = content
+        self.headers = headers
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    def is_fresh(self, now: float = None) -> bool:
+        return ((now or time.time()) - self.fetched_at) < self.ttl
+
+    def validators(self) -> Dict[str, str]:
+        """En-têtes de revalidation conditionnelle (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        etag = self.headers.get('ETag')
+        last_modified = self.headers.get('Last-Modified')
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def to_response(self) -> CachedResponse:
+        return CachedResponse(self.url, self.content, self.headers)
+
+
+class HTTPCache:
+    """Cache persistant (SQLite + mémoire) des réponses de l'API, indexé par URL + paramètres
+
+    La mémoire ne garde que les max_entries entrées les plus récemment
+    utilisées; les autres restent lisibles depuis SQLite.
+    """
+
+    # En-têtes conservés avec le corps de la réponse
+    KEPT_HEADERS = ('ETag', 'Last-Modified', 'Content-Type')
+
+    def __init__(self, db_path: str = "api_cache.db", max_entries: int = 512):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.init_cache()
+
+    def init_cache(self):
+        """Initialiser la table du cache"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS http_cache (
+            cache_key TEXT PRIMARY KEY,
+            url TEXT,
+            params TEXT,
+            content BLOB,
+            headers TEXT,
+            fetched_at REAL,
+            ttl INTEGER
+        )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def get_connection(self):
+        """Obtenir une connexion à la base du cache"""
+        return sqlite3.connect(self.db_path)
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None) -> str:
+        """Clé stable: URL + paramètres triés"""
+        normalized = json.dumps(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return hashlib.sha1(f"{url}?{normalized}".encode('utf-8')).hexdigest()
+
+    def get(self, url: str, params: Dict = None) -> Optional[CacheEntry]:
+        """Récupérer une entrée (mémoire d'abord, puis disque)"""
+        key = self.make_key(url, params)
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            return entry
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT url, content, headers, fetched_at, ttl FROM http_cache WHERE cache_key = ?
+            ''', (key,))
+            row = cursor.fetchone()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur lecture cache: {e}")
+            return None
+
+        if row is None:
+            return None
+
+        entry = CacheEntry(key, row[0], row[1], json.loads(row[2] or '{}'), row[3], row[4])
+        self._remember(entry)
+        return entry
+
+    def _remember(self, entry: CacheEntry):
+        """Placer une entrée en tête du cache mémoire, en évinçant la moins récemment utilisée"""
+        with self._lock:
+            self._memory[entry.key] = entry
+            self._memory.move_to_end(entry.key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def store(self, url: str, params: Dict, response, ttl: int) -> CacheEntry:
+        """Enregistrer une réponse 200"""
+        key = self.make_key(url, params)
+        headers = {name: response.headers[name] for name in self.KEPT_HEADERS
+                   if response.headers.get(name)}
+        entry = CacheEntry(key, url, response.content, headers, time.time(), ttl)
+        self._remember(entry)
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+            INSERT OR REPLACE INTO http_cache
+            (cache_key, url, params, content, headers, fetched_at, ttl)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (key, url, json.dumps(params or {}, sort_keys=True), entry.content,
+                  json.dumps(headers), entry.fetched_at, ttl))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur écriture cache: {e}")
+
+        return entry
+
+    def revalidated(self, entry: CacheEntry, response, ttl: int) -> CacheEntry:
+        """Prolonger une entrée après une réponse 304 Not Modified"""
+        for name in self.KEPT_HEADERS:
+            if response.headers.get(name):
+                entry.headers[name] = response.headers[name]
+        entry.fetched_at = time.time()
+        entry.ttl = ttl
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute('''
+            UPDATE http_cache SET headers = ?, fetched_at = ?, ttl = ? WHERE cache_key = ?
+            ''', (json.dumps(entry.headers), entry.fetched_at, ttl, entry.key))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur mise à jour cache: {e}")
+
+        return entry
+
+    def clear(self):
+        """Vider le cache"""
+        with self._lock:
+            self._memory.clear()
+
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM http_cache")
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logger.error(f"Erreur effacement cache: {e}")
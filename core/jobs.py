@@ -0,0 +1,271 @@
+# jobs.py
+import argparse
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, Callable, Iterable, Iterator
+
+from config import Config
+from database import FootballDatabase
+from scraper import FootballAPIScraper, WindowBatch
+from pipeline import IngestPipeline
+from priorities import request_priority
+
+logger = logging.getLogger(__name__)
+
+
+class BackfillJobRunner:
+    """Jobs de backfill persistés en SQLite, reprenables fenêtre par fenêtre
+
+    Chaque job possède des fenêtres (scrape_job_windows) dont l'état est
+    enregistré dès que le lot correspondant est écrit en base: un job
+    interrompu (fermeture de l'application, crash, pause) reprend exactement
+    aux fenêtres encore en attente ou en échec.
+    """
+
+    RESUMABLE_STATUSES = ['pending', 'running', 'paused', 'failed']
+
+    def __init__(self, scraper: FootballAPIScraper, database: FootballDatabase):
+        self.scraper = scraper
+        self.db = database
+
+    def create_date_range_job(self, championship: str, date_from: str = None, date_to: str = None,
+                              ranges: List[Tuple[str, str]] = None) -> Optional[int]:
+        """Créer un job pour une période (ou une liste de plages, ex: plan incrémental)"""
+        if ranges is None:
+            ranges = [(date_from, date_to)]
+        if not ranges:
+            return None
+
+        windows = []
+        for range_from, range_to in ranges:
+            start_date = datetime.strptime(range_from, '%Y-%m-%d')
+            end_date = datetime.strptime(range_to, '%Y-%m-%d')
+            windows.extend(('dates', window_from, window_to)
+                           for window_from, window_to in self.scraper._split_period(start_date, end_date))
+
+        job_id = self.db.create_scrape_job('date_range', championship, windows,
+                                           date_from=date_from or ranges[0][0],
+                                           date_to=date_to or ranges[-1][1])
+        logger.info(f"Job {job_id} créé: {championship}, {len(windows)} fenêtre(s)")
+        return job_id
+
+    def create_season_job(self, championship: str, season_year: int = None) -> Optional[int]:
+        """Créer un job pour une saison (une requête saison, découpée en dates si elle échoue)"""
+        if season_year is None:
+            season_year = self.scraper.get_current_season_year(championship)
+
+        season_start, season_end = self.scraper.season_bounds(season_year)
+        job_id = self.db.create_scrape_job('season', championship, [('season', season_start, season_end)],
+                                           date_from=season_start, date_to=season_end, season=season_year)
+        logger.info(f"Job {job_id} créé: saison {season_year} de {championship}")
+        return job_id
+
+    def list_jobs(self, pending_only: bool = False) -> List[Dict]:
+        """Lister les jobs (seulement ceux à reprendre avec pending_only)"""
+        return self.db.get_scrape_jobs(self.RESUMABLE_STATUSES if pending_only else None)
+
+    def run(self, job_id: int, stop_event: threading.Event = None,
+            on_event: Callable[[str, Dict], None] = None, priority: str = 'backfill') -> Dict:
+        """Exécuter (ou reprendre) un job; s'arrête proprement quand stop_event est levé
+
+        Les requêtes du job passent en priorité 'backfill' (derrière les
+        requêtes interactives), sauf priorité plus urgente passée par l'appelant.
+        """
+        job = self.db.get_scrape_job(job_id)
+        if job is None:
+            raise ValueError(f"Job inconnu: {job_id}")
+
+        championship = job['championship']
+        stop_event = stop_event or threading.Event()
+        self.db.set_scrape_job_status(job_id, 'running')
+
+        totals = {'job_id': job_id, 'championship': championship, 'windows': 0,
+                  'matches_count': 0, 'saved_count': 0, 'status_counts': {}, 'failed_windows': [],
+                  'write_counts': {'inserted': 0, 'updated': 0, 'unchanged': 0}}
+
+        try:
+            with request_priority(priority, championship):
+                # 1. Fenêtre saison: une seule requête, découpage en dates si elle échoue
+                for window in self.db.get_job_windows(job_id, ['pending', 'failed']):
+                    if window['kind'] != 'season' or stop_event.is_set():
+                        continue
+
+                    matches = self.scraper.fetch_season_matches(championship, job['season'])
+                    if matches is None:
+                        self._expand_season_window(job_id, window)
+                        continue
+
+                    batch = WindowBatch(window['date_from'], window['date_to'], matches)
+                    self._run_pipeline(job_id, 'season', championship, [batch], on_event, totals)
+
+                # 2. Fenêtres de dates restantes
+                windows = [window for window in self.db.get_job_windows(job_id, ['pending', 'failed'])
+                           if window['kind'] == 'dates']
+                if windows and not stop_event.is_set():
+                    ranges = [(window['date_from'], window['date_to']) for window in windows]
+                    batches = self.scraper.iter_matches_for_ranges(championship, ranges)
+                    self._run_pipeline(job_id, 'dates', championship,
+                                       self.until_stopped(batches, stop_event), on_event, totals)
+
+        except Exception:
+            self.db.set_scrape_job_status(job_id, 'failed')
+            raise
+
+        remaining = self.db.get_job_windows(job_id, ['pending', 'failed'])
+        if not remaining:
+            status = 'completed'
+        elif stop_event.is_set():
+            status = 'paused'
+        else:
+            status = 'failed'
+
+        self.db.set_scrape_job_status(job_id, status)
+        totals['status'] = status
+        logger.info(f"Job {job_id} {status}: {totals['matches_count']} matches, "
+                    f"{len(remaining)} fenêtre(s) restante(s)")
+        return totals
+
+    def discard(self, job_id: int) -> bool:
+        """Abandonner un job: il n'est plus proposé à la reprise (ses matches restent en base)"""
+        if self.db.get_scrape_job(job_id) is None:
+            logger.warning(f"Job inconnu: {job_id}")
+            return False
+        self.db.set_scrape_job_status(job_id, 'cancelled')
+        logger.info(f"Job {job_id} abandonné")
+        return True
+
+    def resume_pending(self, stop_event: threading.Event = None,
+                       on_event: Callable[[str, Dict], None] = None) -> List[Dict]:
+        """Reprendre tous les jobs non terminés, dans l'ordre de création (priorité backfill)"""
+        stop_event = stop_event or threading.Event()
+        results = []
+
+        for job in self.list_jobs(pending_only=True):
+            if stop_event.is_set():
+                break
+            results.append(self.run(job['id'], stop_event, on_event))
+
+        return results
+
+    def _expand_season_window(self, job_id: int, window: Dict):
+        """Remplacer une fenêtre saison par des fenêtres de dates"""
+        start_date = datetime.strptime(window['date_from'], '%Y-%m-%d')
+        end_date = datetime.strptime(window['date_to'], '%Y-%m-%d')
+        windows = [('dates', window_from, window_to)
+                   for window_from, window_to in self.scraper._split_period(start_date, end_date)]
+
+        self.db.add_job_windows(job_id, windows)
+        self.db.update_job_window(job_id, 'season', window['date_from'], window['date_to'], 'expanded')
+        logger.warning(f"Job {job_id}: endpoint saison indisponible, {len(windows)} fenêtre(s) de dates")
+
+    def _run_pipeline(self, job_id: int, kind: str, championship: str, batches: Iterable,
+                      on_event: Optional[Callable[[str, Dict], None]], totals: Dict):
+        """Ingestion via IngestPipeline avec checkpoint de chaque fenêtre écrite"""
+
+        def checkpoint(event_type: str, data: Dict):
+            if event_type == 'batch':
+                self.db.update_job_window(job_id, kind, data['date_from'], data['date_to'],
+                                          'done', data['count'])
+            elif event_type == 'window_failed':
+                self.db.update_job_window(job_id, kind, data['date_from'], data['date_to'],
+                                          'failed', 0, data['error'])
+            if on_event:
+                on_event(event_type, data)
+
+        # Gros lots écrits avec le profil SQLite de chargement en masse (écriture seulement)
+        summary = IngestPipeline(self.db, on_event=checkpoint,
+                                 bulk_min_rows=Config.DB_BULK_MIN_ROWS).run(championship, batches)
+
+        totals['windows'] += summary['windows']
+        totals['matches_count'] += summary['matches_count']
+        totals['saved_count'] += summary['saved_count']
+        totals['failed_windows'].extend(summary['failed_windows'])
+        for key, count in summary['write_counts'].items():
+            totals['write_counts'][key] += count
+        for status, count in summary['status_counts'].items():
+            totals['status_counts'][status] = totals['status_counts'].get(status, 0) + count
+
+    @staticmethod
+    def until_stopped(batches: Iterator[WindowBatch], stop_event: threading.Event) -> Iterator[WindowBatch]:
+        """Interrompre la production de lots dès que stop_event est levé"""
+        try:
+            for batch in batches:
+                if stop_event.is_set():
+                    break
+                yield batch
+        finally:
+            batches.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Jobs de backfill reprenables")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="Lister les jobs")
+    list_parser.add_argument('--pending', action='store_true', help="Seulement les jobs à reprendre")
+
+    resume_parser = subparsers.add_parser('resume', help="Reprendre un job (ou tous les jobs en attente)")
+    resume_parser.add_argument('job_id', nargs='?', type=int)
+
+    discard_parser = subparsers.add_parser('discard', help="Abandonner un job (ou tous les jobs en attente)")
+    discard_parser.add_argument('job_id', nargs='?', type=int)
+
+    range_parser = subparsers.add_parser('range', help="Créer et lancer un job sur une période")
+    range_parser.add_argument('championship')
+    range_parser.add_argument('date_from')
+    range_parser.add_argument('date_to')
+
+    season_parser = subparsers.add_parser('season', help="Créer et lancer un job sur une saison")
+    season_parser.add_argument('championship')
+    season_parser.add_argument('season_year', nargs='?', type=int)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    db = FootballDatabase(Config.DB_PATH)
+    runner = BackfillJobRunner(FootballAPIScraper(db), db)
+
+    if args.command == 'list':
+        for job in runner.list_jobs(pending_only=args.pending):
+            print(f"#{job['id']:<4} {job['status']:<10} {job['championship']:<16} "
+                  f"{job['date_from']} → {job['date_to']}  "
+                  f"{job['windows_done'] or 0}/{job['windows_total']} fenêtres"
+                  f"{' (' + str(job['windows_failed']) + ' en échec)' if job['windows_failed'] else ''}")
+        return
+
+    if args.command == 'discard':
+        job_ids = [args.job_id] if args.job_id is not None else \
+            [job['id'] for job in runner.list_jobs(pending_only=True)]
+        for job_id in job_ids:
+            if runner.discard(job_id):
+                print(f"Job #{job_id} abandonné")
+        return
+
+    if args.command == 'range':
+        job_id = runner.create_date_range_job(args.championship, args.date_from, args.date_to)
+    elif args.command == 'season':
+        job_id = runner.create_season_job(args.championship, args.season_year)
+    else:
+        job_id = args.job_id
+
+    stop_event = threading.Event()
+    try:
+        if job_id is None:
+            results = runner.resume_pending(stop_event)
+        else:
+            results = [runner.run(job_id, stop_event)]
+    except KeyboardInterrupt:
+        stop_event.set()
+        print("Interrompu: le job reprendra à la prochaine fenêtre en attente")
+        return
+
+    for result in results:
+        write_counts = result['write_counts']
+        print(f"Job #{result['job_id']} {result['status']}: {result['matches_count']} matches "
+              f"({write_counts['inserted']} nouveaux, {write_counts['updated']} modifiés, "
+              f"{write_counts['unchanged']} inchangés), {len(result['failed_windows'])} fenêtre(s) en échec")
+
+
+if __name__ == '__main__':
+    main()
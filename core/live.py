@@ -0,0 +1,204 @@
+# live.py
+import threading
+import logging
+from typing import List, Dict, Optional, Callable
+
+from config import Config
+from scraper import FootballAPIScraper
+from priorities import request_priority
+
+logger = logging.getLogger(__name__)
+
+
+class LivePoller:
+    """Suivi haute fréquence des matches en cours, avec événements différentiels
+
+    Chaque cycle fait une seule requête /matches?status=LIVE pour tous les
+    championnats (IN_PLAY et PAUSED), compare le résultat au cycle précédent et
+    émet les événements: 'match_live' (nouveau match suivi), 'score_change',
+    'status_change' (ex: mi-temps) et 'match_ended'. Les matches qui sortent du
+    direct sont relus en une requête groupée (/matches?ids=...) pour obtenir le
+    score final. Les matches modifiés sont écrits en base (hash de contenu:
+    rien n'est réécrit s'il ne s'est rien passé) et les événements sont
+    journalisés dans match_events puis transmis aux abonnés.
+
+    Cadence: Config.LIVE_POLL_INTERVAL tant qu'un match est en cours,
+    Config.LIVE_IDLE_INTERVAL sinon, soit au plus 3 requêtes par minute sur
+    les 10 du quota gratuit avec les valeurs par défaut.
+    """
+
+    def __init__(self, scraper: FootballAPIScraper, database=None, championships: List[str] = None,
+                 poll_interval: int = None, idle_interval: int = None):
+        self.scraper = scraper
+        self.db = database
+        self.championships = championships
+        self.poll_interval = poll_interval or Config.LIVE_POLL_INTERVAL
+        self.idle_interval = idle_interval or Config.LIVE_IDLE_INTERVAL
+        self.state = {}
+        self.subscribers = []
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback: Callable[[str, Dict], None]):
+        """Abonner un callback(type, événement) (queue Tk, page Streamlit...)"""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, Dict], None]):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    @staticmethod
+    def _snapshot(match: Dict) -> Dict:
+        raw_data = match.get('raw_data') or {}
+        return {
+            'home_score': match.get('home_score'),
+            'away_score': match.get('away_score'),
+            'api_status': raw_data.get('status', match.get('status')),
+            'match': match
+        }
+
+    @staticmethod
+    def _event(event_type: str, match: Dict, details: Dict = None) -> Dict:
+        raw_data = match.get('raw_data') or {}
+        return {
+            'event_type': event_type,
+            'match_id': match.get('id'),
+            'championship': match.get('competition'),
+            'home_team': match.get('home_team'),
+            'away_team': match.get('away_team'),
+            'home_score': match.get('home_score'),
+            'away_score': match.get('away_score'),
+            'status': raw_data.get('status', match.get('status')),
+            'details': details or {}
+        }
+
+    def _diff(self, previous: Optional[Dict], match: Dict) -> List[Dict]:
+        """Événements entre l'état précédent d'un match et son état actuel"""
+        if previous is None:
+            return [self._event('match_live', match)]
+
+        events = []
+        current = self._snapshot(match)
+
+        if (current['home_score'], current['away_score']) != (previous['home_score'], previous['away_score']):
+            events.append(self._event('score_change', match, {
+                'previous_home_score': previous['home_score'],
+                'previous_away_score': previous['away_score']
+            }))
+
+        if current['api_status'] != previous['api_status']:
+            event_type = 'match_ended' if current['api_status'] == 'FINISHED' else 'status_change'
+            events.append(self._event(event_type, match, {'previous_status': previous['api_status']}))
+
+        return events
+
+    def poll_once(self) -> List[Dict]:
+        """Un cycle de suivi; renvoie les événements émis"""
+        with request_priority('live'):
+            live_matches = self.scraper.get_live_matches(self.championships)
+        current = {match['id']: match for match in live_matches}
+
+        events = []
+        for match_id, match in current.items():
+            events.extend(self._diff(self.state.get(match_id), match))
+
+        # Matches sortis du direct: état final en une requête groupée
+        ended_ids = [match_id for match_id in self.state if match_id not in current]
+        ended_matches = []
+        if ended_ids:
+            try:
+                with request_priority('live'):
+                    ended_matches = self.scraper.get_matches_by_ids(ended_ids)
+            except Exception as e:
+                logger.error(f"Erreur récupération matches terminés: {e}")
+                # Les garder suivis: ils seront relus au prochain cycle
+                for match_id in ended_ids:
+                    current[match_id] = self.state[match_id]['match']
+
+            for match in ended_matches:
+                events.extend(self._diff(self.state.get(match['id']), match))
+                if self._snapshot(match)['api_status'] in ('IN_PLAY', 'PAUSED'):
+                    # Décalage de l'API: le match est encore en cours
+                    current[match['id']] = match
+
+        self.state = {match_id: self._snapshot(match) for match_id, match in current.items()}
+
+        if self.db is not None:
+            changed_matches = live_matches + ended_matches
+            if changed_matches:
+                self.db.upsert_matches(changed_matches)
+            self.db.log_match_events(events)
+
+        for event in events:
+            self._emit(event)
+
+        return events
+
+    def _emit(self, event: Dict):
+        for callback in list(self.subscribers):
+            try:
+                callback(event['event_type'], event)
+            except Exception as e:
+                logger.error(f"Erreur abonné live: {e}")
+
+    def next_interval(self) -> int:
+        """Délai avant le prochain cycle: rapproché tant qu'un match est en cours"""
+        return self.poll_interval if self.state else self.idle_interval
+
+    def run(self, stop_event: threading.Event = None):
+        """Boucle de suivi jusqu'à ce que stop_event soit levé"""
+        stop_event = stop_event or self._stop_event
+        logger.info(f"Suivi live démarré (toutes les {self.poll_interval}s pendant les matches)")
+
+        while not stop_event.is_set():
+            try:
+                events = self.poll_once()
+                if events:
+                    logger.info(f"Live: {len(events)} événement(s), {len(self.state)} match(es) en cours")
+                interval = self.next_interval()
+            except Exception as e:
+                logger.error(f"Erreur suivi live: {e}")
+                interval = self.idle_interval if not self.state else self.poll_interval * 2
+            stop_event.wait(interval)
+
+        logger.info("Suivi live arrêté")
+
+    def start(self) -> threading.Thread:
+        """Lancer le suivi dans un thread de fond"""
+        if self._thread is not None and self._thread.is_alive():
+            return self._thread
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._stop_event.set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+
+def main():
+    from database import FootballDatabase
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    db = FootballDatabase(Config.DB_PATH)
+    poller = LivePoller(FootballAPIScraper(db), db)
+
+    def print_event(event_type: str, event: Dict):
+        print(f"[{event_type}] {event['championship']}: {event['home_team']} "
+              f"{event['home_score']}-{event['away_score']} {event['away_team']} ({event['status']})")
+
+    poller.subscribe(print_event)
+    try:
+        poller.run()
+    except KeyboardInterrupt:
+        poller.stop()
+
+
+if __name__ == '__main__':
+    main()
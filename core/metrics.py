@@ -0,0 +1,277 @@
+# metrics.py
+import json
+import os
+import threading
+import time
+import logging
+from collections import deque
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bornes (secondes) de l'histogramme des latences exporté pour Prometheus
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Échantillons conservés par endpoint pour le calcul des percentiles
+LATENCY_SAMPLES = 2048
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+class _EndpointStats:
+    __slots__ = ('requests', 'status', 'bytes', 'duration_sum', 'buckets', 'samples',
+                 'retries', 'cache_hits', 'revalidated')
+
+    def __init__(self):
+        self.requests = 0
+        self.status = {}
+        self.bytes = 0
+        self.duration_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples = deque(maxlen=LATENCY_SAMPLES)
+        self.retries = {}
+        self.cache_hits = 0
+        self.revalidated = 0
+
+
+class ScraperMetrics:
+    """Télémétrie du scraper: requêtes, latences, octets, quota, attentes et parsing
+
+    Compteurs par endpoint (classe d'URL, ex: /competitions/{id}/matches):
+    requêtes par code HTTP, latence réseau (histogramme + percentiles sur
+    les LATENCY_SAMPLES dernières requêtes), octets reçus, tentatives
+    supplémentaires par motif, réponses servies par le cache HTTP. Globalement:
+    temps d'attente d'un jeton (limiteur de débit), temps de backoff, temps
+    passé dans _parse_match_data (cumulés sur tous les threads) et dernier
+    quota annoncé par clé API.
+
+    snapshot() pour une lecture en processus; to_json() et to_prometheus()
+    pour l'export (start_exporter écrit périodiquement un fichier, format
+    choisi selon l'extension: .json ou texte Prometheus).
+    """
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._endpoints = {}
+        self._quota = {}
+        self._rate_limit_wait = 0.0
+        self._rate_limit_waits = 0
+        self._backoff = 0.0
+        self._parse_time = 0.0
+        self._parsed = 0
+        self._lock = threading.Lock()
+        self._exporter = None
+        self._exporter_stop = threading.Event()
+
+    def _endpoint(self, endpoint: str) -> _EndpointStats:
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    # Enregistrement
+
+    def record_request(self, endpoint: str, status_code, duration: float, size: int = 0):
+        """Une requête HTTP terminée (status_code 'error' si aucune réponse)"""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.requests += 1
+            stats.status[status_code] = stats.status.get(status_code, 0) + 1
+            stats.bytes += size
+            stats.duration_sum += duration
+            stats.samples.append(duration)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+
+    def record_retry(self, endpoint: str, reason: str, delay: float = 0.0):
+        """Tentative supplémentaire (reason: 'network', '429', '5xx', '403') après delay secondes"""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats.retries[reason] = stats.retries.get(reason, 0) + 1
+            self._backoff += delay
+
+    def record_cache(self, endpoint: str, revalidated: bool = False):
+        """Réponse servie par le cache HTTP (revalidated: après un 304)"""
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            if revalidated:
+                stats.revalidated += 1
+            else:
+                stats.cache_hits += 1
+
+    def record_rate_limit_wait(self, seconds: float):
+        """Temps passé à attendre un jeton du limiteur de débit"""
+        with self._lock:
+            self._rate_limit_wait += seconds
+            self._rate_limit_waits += 1
+
+    def record_parse(self, seconds: float, count: int = 1):
+        with self._lock:
+            self._parse_time += seconds
+            self._parsed += count
+
+    def record_quota(self, key_label: str, available: Optional[int], reset: Optional[int]):
+        """Dernier quota annoncé par l'API pour une clé"""
+        if available is None and reset is None:
+            return
+        with self._lock:
+            quota = self._quota.setdefault(key_label, {})
+            if available is not None:
+                quota['available'] = available
+            if reset is not None:
+                quota['reset'] = reset
+            quota['updated_at'] = time.time()
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._quota.clear()
+            self._rate_limit_wait = self._backoff = self._parse_time = 0.0
+            self._rate_limit_waits = self._parsed = 0
+            self.started_at = time.time()
+
+    # Lecture et export
+
+    def snapshot(self) -> Dict:
+        """État courant des métriques (dictionnaire sérialisable en JSON)"""
+        with self._lock:
+            endpoints = {}
+            for endpoint, stats in self._endpoints.items():
+                samples = sorted(stats.samples)
+                endpoints[endpoint] = {
+                    'requests': stats.requests,
+                    'status': {str(code): count for code, count in stats.status.items()},
+                    'bytes': stats.bytes,
+                    'duration_sum': round(stats.duration_sum, 6),
+                    'latency': {f"p{int(q * 100)}": round(_quantile(samples, q), 6) for q in QUANTILES},
+                    'buckets': dict(zip([str(bound) for bound in LATENCY_BUCKETS], stats.buckets)),
+                    'retries': dict(stats.retries),
+                    'cache_hits': stats.cache_hits,
+                    'revalidated': stats.revalidated
+                }
+
+            return {
+                'uptime': round(time.time() - self.started_at, 3),
+                'requests': sum(stats['requests'] for stats in endpoints.values()),
+                'bytes': sum(stats['bytes'] for stats in endpoints.values()),
+                'retries': sum(sum(stats['retries'].values()) for stats in endpoints.values()),
+                'rate_limit_wait_seconds': round(self._rate_limit_wait, 6),
+                'rate_limit_waits': self._rate_limit_waits,
+                'backoff_seconds': round(self._backoff, 6),
+                'parse_seconds': round(self._parse_time, 6),
+                'parsed_matches': self._parsed,
+                'quota': {label: dict(quota) for label, quota in self._quota.items()},
+                'endpoints': endpoints
+            }
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self) -> str:
+        """Format texte d'exposition Prometheus"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP football_scraper_{name} {help_text}")
+            lines.append(f"# TYPE football_scraper_{name} {kind}")
+
+        def sample(name: str, value, **labels):
+            label_text = ','.join(f'{key}="{str(val)}"' for key, val in labels.items())
+            lines.append(f"football_scraper_{name}{{{label_text}}} {value}" if labels
+                         else f"football_scraper_{name} {value}")
+
+        endpoints = snapshot['endpoints']
+
+        metric('requests_total', 'counter', 'Requêtes HTTP par endpoint et code de réponse')
+        for endpoint, stats in endpoints.items():
+            for code, count in stats['status'].items():
+                sample('requests_total', count, endpoint=endpoint, code=code)
+
+        metric('response_bytes_total', 'counter', 'Octets reçus par endpoint')
+        for endpoint, stats in endpoints.items():
+            sample('response_bytes_total', stats['bytes'], endpoint=endpoint)
+
+        metric('request_duration_seconds', 'histogram', 'Latence des requêtes HTTP')
+        for endpoint, stats in endpoints.items():
+            cumulative = 0
+            for bound, count in stats['buckets'].items():
+                cumulative += count
+                sample('request_duration_seconds_bucket', cumulative, endpoint=endpoint, le=bound)
+            sample('request_duration_seconds_bucket', stats['requests'], endpoint=endpoint, le='+Inf')
+            sample('request_duration_seconds_sum', stats['duration_sum'], endpoint=endpoint)
+            sample('request_duration_seconds_count', stats['requests'], endpoint=endpoint)
+
+        metric('request_duration_quantile_seconds', 'gauge',
+               f'Percentiles de latence sur les {LATENCY_SAMPLES} dernières requêtes')
+        for endpoint, stats in endpoints.items():
+            for name, value in stats['latency'].items():
+                sample('request_duration_quantile_seconds', value, endpoint=endpoint,
+                       quantile=f"0.{name[1:]}")
+
+        metric('retries_total', 'counter', 'Tentatives supplémentaires par motif')
+        for endpoint, stats in endpoints.items():
+            for reason, count in stats['retries'].items():
+                sample('retries_total', count, endpoint=endpoint, reason=reason)
+
+        metric('cache_hits_total', 'counter', 'Réponses servies par le cache HTTP')
+        for endpoint, stats in endpoints.items():
+            sample('cache_hits_total', stats['cache_hits'], endpoint=endpoint, revalidated='false')
+            sample('cache_hits_total', stats['revalidated'], endpoint=endpoint, revalidated='true')
+
+        metric('rate_limit_wait_seconds_total', 'counter', "Temps passé à attendre un jeton du limiteur")
+        sample('rate_limit_wait_seconds_total', snapshot['rate_limit_wait_seconds'])
+        metric('backoff_seconds_total', 'counter', 'Temps passé en backoff entre deux tentatives')
+        sample('backoff_seconds_total', snapshot['backoff_seconds'])
+        metric('parse_seconds_total', 'counter', 'Temps passé dans _parse_match_data')
+        sample('parse_seconds_total', snapshot['parse_seconds'])
+        metric('parsed_matches_total', 'counter', 'Matches parsés')
+        sample('parsed_matches_total', snapshot['parsed_matches'])
+
+        metric('quota_available', 'gauge', 'Requêtes restantes dans la minute (X-Requests-Available-Minute)')
+        for label, quota in snapshot['quota'].items():
+            if 'available' in quota:
+                sample('quota_available', quota['available'], key=label)
+        metric('quota_reset_seconds', 'gauge', 'Délai avant réinitialisation du quota (X-RequestCounter-Reset)')
+        for label, quota in snapshot['quota'].items():
+            if 'reset' in quota:
+                sample('quota_reset_seconds', quota['reset'], key=label)
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: str):
+        """Écrire un export (JSON si path finit par .json, sinon Prometheus), atomiquement"""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.error(f"Erreur export métriques {path}: {e}")
+
+    def start_exporter(self, path: str, interval: float = 15) -> threading.Thread:
+        """Réécrire path toutes les interval secondes (textfile collector de node_exporter...)"""
+        if self._exporter is not None and self._exporter.is_alive():
+            return self._exporter
+
+        def run():
+            while not self._exporter_stop.wait(interval):
+                self.write(path)
+
+        self._exporter_stop.clear()
+        self._exporter = threading.Thread(target=run, daemon=True)
+        self._exporter.start()
+        logger.info(f"Export des métriques vers {path} toutes les {interval}s")
+        return self._exporter
+
+    def stop_exporter(self):
+        self._exporter_stop.set()
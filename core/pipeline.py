@@ -0,0 +1,160 @@
+# pipeline.py
+import queue
+import contextvars
+import threading
+import logging
+from typing import Dict, Iterable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class IngestPipeline:
+    """Pipeline producteur / consommateur entre le scraper et la base
+
+    Un thread producteur parcourt les WindowBatch du scraper et les dépose dans
+    une file bornée; l'étape d'écriture (thread appelant) sauvegarde chaque lot
+    dès son arrivée et journalise la fenêtre dans scraping_log. La mémoire reste
+    constante quelle que soit la durée de la période, et tout ce qui a été
+    récupéré avant un crash est déjà en base.
+
+    Les événements de progression sont transmis à on_event(type, données):
+    'batch' après chaque fenêtre traitée, 'window_failed' pour une fenêtre en échec.
+
+    Avec bulk_min_rows, les lots d'au moins bulk_min_rows matches sont écrits
+    sous FootballDatabase.bulk_load(), le temps de leur upsert seulement.
+    """
+
+    def __init__(self, database=None, on_event: Callable[[str, Dict], None] = None,
+                 max_pending_batches: int = 4, bulk_min_rows: Optional[int] = None):
+        self.db = database
+        self.on_event = on_event
+        self.max_pending_batches = max_pending_batches
+        self.bulk_min_rows = bulk_min_rows
+
+    def _emit(self, event_type: str, data: Dict):
+        if self.on_event:
+            try:
+                self.on_event(event_type, data)
+            except Exception as e:
+                logger.error(f"Erreur callback pipeline: {e}")
+
+    def run(self, championship: str, batches: Iterable, collect: bool = False) -> Dict:
+        """Consommer les lots et renvoyer un résumé de l'ingestion
+
+        Avec collect=True, les matches sont aussi conservés dans le résumé
+        (clé 'matches'), par exemple quand la sauvegarde est désactivée.
+        """
+        pending = queue.Queue(maxsize=self.max_pending_batches)
+        stop = threading.Event()
+        producer_error = []
+
+        def produce():
+            try:
+                for batch in batches:
+                    while not stop.is_set():
+                        try:
+                            pending.put(batch, timeout=0.5)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        break
+            except Exception as e:
+                logger.error(f"Erreur producteur pipeline: {e}")
+                producer_error.append(e)
+            finally:
+                close = getattr(batches, 'close', None)
+                if close:
+                    close()
+                pending.put(_DONE)
+
+        summary = {
+            'championship': championship,
+            'windows': 0,
+            'matches_count': 0,
+            'saved_count': 0,
+            'write_counts': {'inserted': 0, 'updated': 0, 'unchanged': 0},
+            'status_counts': {},
+            'failed_windows': [],
+            'matches': []
+        }
+
+        # Le producteur hérite du contexte de l'appelant (priorité des requêtes API)
+        producer = threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True)
+        producer.start()
+
+        try:
+            while True:
+                batch = pending.get()
+                if batch is _DONE:
+                    break
+                self._write_batch(championship, batch, summary, collect)
+        finally:
+            stop.set()
+            # Débloquer le producteur s'il attend une place dans la file
+            while producer.is_alive():
+                try:
+                    pending.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        if producer_error:
+            raise producer_error[0]
+
+        write_counts = summary['write_counts']
+        logger.info(f"Pipeline {championship}: {summary['matches_count']} matches, "
+                    f"{summary['saved_count']} sauvegardés ({write_counts['inserted']} nouveaux, "
+                    f"{write_counts['updated']} modifiés, {write_counts['unchanged']} inchangés), "
+                    f"{len(summary['failed_windows'])} fenêtre(s) en échec")
+        return summary
+
+    def _write_batch(self, championship: str, batch, summary: Dict, collect: bool):
+        """Étape d'écriture: upsert d'un lot (matches inchangés ignorés) et journalisation de sa fenêtre"""
+        summary['windows'] += 1
+
+        if batch.error:
+            failure = {'championship': championship, 'date_from': batch.date_from,
+                       'date_to': batch.date_to, 'error': batch.error}
+            summary['failed_windows'].append(failure)
+            if self.db:
+                self.db.log_scraping(championship, batch.date_from, batch.date_to, 0, 'error', batch.error)
+            self._emit('window_failed', failure)
+            return
+
+        saved_count = 0
+        write_counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if self.db:
+            if batch.matches:
+                if self.bulk_min_rows is not None and len(batch.matches) >= self.bulk_min_rows:
+                    with self.db.bulk_load(checkpoint=False):
+                        counts = self.db.upsert_matches(batch.matches)
+                else:
+                    counts = self.db.upsert_matches(batch.matches)
+                for key in write_counts:
+                    write_counts[key] = counts[key]
+                saved_count = write_counts['inserted'] + write_counts['updated']
+            self.db.log_scraping(championship, batch.date_from, batch.date_to, saved_count, 'success')
+
+        summary['matches_count'] += len(batch.matches)
+        summary['saved_count'] += saved_count
+        for key, count in write_counts.items():
+            summary['write_counts'][key] += count
+        for match in batch.matches:
+            status = match.get('status', 'unknown')
+            summary['status_counts'][status] = summary['status_counts'].get(status, 0) + 1
+        if collect:
+            summary['matches'].extend(batch.matches)
+
+        self._emit('batch', {
+            'date_from': batch.date_from,
+            'date_to': batch.date_to,
+            'count': len(batch.matches),
+            'saved': saved_count,
+            'inserted': write_counts['inserted'],
+            'updated': write_counts['updated'],
+            'unchanged': write_counts['unchanged'],
+            'total': summary['matches_count']
+        })
@@ -0,0 +1,129 @@
+# priorities.py
+import contextvars
+import itertools
+import threading
+import time
+import logging
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Contexte de la requête en cours: (type de requête, championnat)
+_request_context = contextvars.ContextVar('request_context', default=('interactive', None))
+
+
+@contextmanager
+def request_priority(kind: str = None, championship: str = None):
+    """Déclarer la nature des requêtes API faites dans ce bloc
+
+    kind est une clé de Config.REQUEST_PRIORITIES ('live', 'fixtures',
+    'standings', 'interactive', 'backfill'); None garde celle du contexte
+    englobant. Le contexte suit les threads lancés via asyncio.to_thread ou
+    contextvars.copy_context().
+    """
+    current_kind, current_championship = _request_context.get()
+    token = _request_context.set((kind or current_kind, championship or current_championship))
+    try:
+        yield
+    finally:
+        _request_context.reset(token)
+
+
+def current_request_context():
+    return _request_context.get()
+
+
+class _Ticket:
+    __slots__ = ('kind', 'priority', 'championship', 'seq', 'enqueued_at')
+
+    def __init__(self, kind: str, priority: int, championship: Optional[str], seq: int):
+        self.kind = kind
+        self.priority = priority
+        self.championship = championship
+        self.seq = seq
+        self.enqueued_at = time.monotonic()
+
+
+class RequestScheduler:
+    """Répartition du quota de requêtes par priorité, équitable entre championnats
+
+    Les requêtes en attente d'un jeton (pool de clés, un RateLimiter par clé)
+    forment une file: seule la première de la file tente de prendre un jeton,
+    et l'ordre est réévalué à chaque tentative, si bien qu'une requête plus
+    prioritaire arrivée entre temps passe devant. L'ordre est:
+      1. la priorité (Config.REQUEST_PRIORITIES, plus petit = plus urgent),
+         améliorée d'un cran toutes les Config.PRIORITY_AGING_SECONDS
+         d'attente pour qu'un backfill ne soit jamais affamé;
+      2. le championnat le moins servi sur la dernière minute;
+      3. l'ordre d'arrivée.
+    """
+
+    def __init__(self, key_pool):
+        self.key_pool = key_pool
+        self._waiting = []
+        self._recent = deque()
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def _recent_grants(self, now: float) -> Dict[Optional[str], int]:
+        while self._recent and now - self._recent[0][0] > 60:
+            self._recent.popleft()
+        grants = {}
+        for _, championship in self._recent:
+            grants[championship] = grants.get(championship, 0) + 1
+        return grants
+
+    def _head(self, now: float) -> Optional[_Ticket]:
+        if not self._waiting:
+            return None
+        grants = self._recent_grants(now)
+        aging = max(1, Config.PRIORITY_AGING_SECONDS)
+
+        def rank(ticket: _Ticket):
+            effective = ticket.priority - int((now - ticket.enqueued_at) / aging)
+            return effective, grants.get(ticket.championship, 0), ticket.seq
+
+        return min(self._waiting, key=rank)
+
+    def acquire(self):
+        """Bloquer jusqu'à ce que la requête courante obtienne un jeton; renvoie la clé API"""
+        kind, championship = _request_context.get()
+        priority = Config.REQUEST_PRIORITIES.get(kind, Config.REQUEST_PRIORITIES['interactive'])
+
+        with self._condition:
+            ticket = _Ticket(kind, priority, championship, next(self._counter))
+            self._waiting.append(ticket)
+
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._head(now) is ticket:
+                        api_key, delay = self.key_pool.reserve()
+                        if api_key is not None:
+                            break
+                        # Réveil au plus tard au prochain jeton, plus tôt si la file change
+                        self._condition.wait(min(delay, 1.0))
+                    else:
+                        self._condition.wait(1.0)
+            finally:
+                self._waiting.remove(ticket)
+                self._condition.notify_all()
+
+            waited = time.monotonic() - ticket.enqueued_at
+            self._recent.append((time.monotonic(), championship))
+
+        if waited > 1:
+            logger.debug(f"Requête {kind} ({championship or 'tous'}) servie après {waited:.1f}s")
+        return api_key
+
+    def get_queue_stats(self) -> Dict[str, int]:
+        """Nombre de requêtes en attente par type"""
+        with self._condition:
+            stats = {}
+            for ticket in self._waiting:
+                stats[ticket.kind] = stats.get(ticket.kind, 0) + 1
+            return stats
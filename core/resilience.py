@@ -0,0 +1,104 @@
+# resilience.py
+import random
+import threading
+import time
+import logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class APIError(Exception):
+    """Réponse API inexploitable (statut HTTP différent de 200)"""
+
+    def __init__(self, status_code: int, message: str = ''):
+        super().__init__(f"Erreur API {status_code}" + (f": {message}" if message else ''))
+        self.status_code = status_code
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé: le disjoncteur de l'endpoint est ouvert"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit ouvert pour {endpoint} (nouvel essai dans {retry_in:.0f}s)")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class RetryPolicy:
+    """Backoff exponentiel avec jitter complet, plafonné, respectant Retry-After"""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Délai avant la tentative attempt + 1 (attempt commence à 0)"""
+        if retry_after is not None:
+            return min(float(retry_after), self.max_delay * 4)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Disjoncteur thread-safe: closed -> open après N échecs -> half_open après délai"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """Lever CircuitOpenError si l'appel n'est pas autorisé
+
+        Renvoie True si l'appel est l'essai du mode half_open: il doit alors se
+        terminer par record_success, record_failure ou release_trial.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return False
+
+            elapsed = time.monotonic() - self.opened_at
+            if self.state == self.OPEN and elapsed >= self.recovery_timeout:
+                # Un seul appel d'essai pour tester le rétablissement
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            raise CircuitOpenError(self.name, max(0.0, self.recovery_timeout - elapsed))
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit refermé pour {self.name}")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self):
+        """Libérer l'essai half_open sans verdict (appel interrompu par une erreur inattendue)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit ouvert pour {self.name} après {self.failures} échec(s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
@@ -0,0 +1,254 @@
+# scheduler.py
+import argparse
+import threading
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple, NamedTuple
+
+from config import Config
+from database import FootballDatabase
+from scraper import FootballAPIScraper
+from live import LivePoller
+from priorities import request_priority
+
+logger = logging.getLogger(__name__)
+
+ISO_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Statuts pour lesquels aucun suivi n'est nécessaire
+CLOSED_STATUSES = ('finished', 'cancelled', 'postponed')
+
+
+class ScheduledTask(NamedTuple):
+    """Appel API planifié"""
+    run_at: datetime
+    kind: str                      # 'live_window', 'standings' ou 'fixtures'
+    championship: Optional[str] = None
+    until: Optional[datetime] = None
+    key: str = ''
+
+
+def _parse_kickoff(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, ISO_FORMAT).replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+class FixtureScheduler:
+    """Planificateur de scraping calé sur le calendrier déjà en base
+
+    À partir des coups d'envoi de la table matches, le plan contient:
+      - des fenêtres de suivi dense (LivePoller) du coup d'envoi - SCHEDULER_PRE_KICKOFF
+        au coup de sifflet final estimé, fusionnées entre matches simultanés;
+      - un rafraîchissement du classement par championnat après la fin de
+        chaque journée (dernier match + SCHEDULER_STANDINGS_DELAY);
+      - un rafraîchissement clairsemé du calendrier (J-1 à J+LOOKAHEAD) toutes
+        les SCHEDULER_FIXTURES_INTERVAL minutes, en une requête pour tous les
+        championnats, pour suivre les reports et changements d'horaire.
+    Hors de ces fenêtres, aucun appel n'est fait.
+    """
+
+    def __init__(self, scraper: FootballAPIScraper, database: FootballDatabase,
+                 championships: List[str] = None):
+        self.scraper = scraper
+        self.db = database
+        self.championships = championships or list(Config.CHAMPIONSHIP_IDS.keys())
+        self.live_poller = LivePoller(scraper, database, self.championships)
+        self.last_fixtures_refresh = None
+        self.done = set()
+        # Classements en échec: tâche replanifiée à cette date (clé -> datetime)
+        self.retry_at = {}
+
+    def plan(self, now: datetime = None, horizon_hours: int = 24) -> List[ScheduledTask]:
+        """Tâches à exécuter d'ici horizon_hours, triées par date"""
+        now = now or datetime.now(timezone.utc)
+        match_duration = timedelta(minutes=Config.SCHEDULER_MATCH_DURATION)
+        pre_kickoff = timedelta(minutes=Config.SCHEDULER_PRE_KICKOFF)
+        standings_delay = timedelta(minutes=Config.SCHEDULER_STANDINGS_DELAY)
+
+        # Inclut les matches de la veille: une journée a pu finir pendant un arrêt du démon
+        fixtures = self.db.get_fixtures((now - timedelta(days=1)).strftime(ISO_FORMAT),
+                                        (now + timedelta(hours=horizon_hours)).strftime(ISO_FORMAT),
+                                        self.championships)
+        tasks = []
+
+        # 1. Fenêtres de suivi dense
+        windows = []
+        stale_until = None
+        for fixture in fixtures:
+            kickoff = _parse_kickoff(fixture['date'])
+            if kickoff is None or fixture['status'] in CLOSED_STATUSES:
+                continue
+            start, end = kickoff - pre_kickoff, kickoff + match_duration
+            if end < now:
+                # Match fini mais pas clôturé en base: le rafraîchissement du calendrier s'en charge
+                stale_until = max(stale_until or end, end)
+                continue
+            windows.append((start, end))
+
+        for start, end in self._merge_windows(windows):
+            tasks.append(ScheduledTask(max(start, now), 'live_window', until=end,
+                                       key=f"live:{start.strftime(ISO_FORMAT)}"))
+
+        # 2. Classement après chaque journée (une fois tous ses matches clôturés)
+        matchdays = {}
+        open_matchdays = set()
+        for fixture in fixtures:
+            kickoff = _parse_kickoff(fixture['date'])
+            if kickoff is None or fixture['status'] in ('cancelled', 'postponed'):
+                continue
+            group = (fixture['championship'], fixture['matchday'])
+            matchdays[group] = max(matchdays.get(group, kickoff), kickoff)
+            if fixture['status'] not in CLOSED_STATUSES:
+                open_matchdays.add(group)
+
+        standings_keys = set()
+        for group, last_kickoff in matchdays.items():
+            championship, matchday = group
+            key = f"standings:{championship}:{matchday}:{last_kickoff.date()}"
+            standings_keys.add(key)
+            if key in self.done:
+                continue
+            run_at = last_kickoff + match_duration + standings_delay
+            if group in open_matchdays and run_at <= now:
+                run_at = now + standings_delay
+            run_at = max(run_at, self.retry_at.get(key, run_at))
+            tasks.append(ScheduledTask(run_at, 'standings', championship=championship, key=key))
+
+        if fixtures:
+            # Journées sorties de la période relue (veille incluse): plus jamais replanifiées
+            self.done &= standings_keys
+            self.retry_at = {key: retry_at for key, retry_at in self.retry_at.items() if key in standings_keys}
+
+        # 3. Calendrier (immédiatement si des matches terminés n'ont pas encore leur score final)
+        if self.last_fixtures_refresh is None:
+            fixtures_at = now
+        else:
+            fixtures_at = self.last_fixtures_refresh + timedelta(minutes=Config.SCHEDULER_FIXTURES_INTERVAL)
+            if stale_until is not None and self.last_fixtures_refresh < stale_until:
+                fixtures_at = now
+        tasks.append(ScheduledTask(fixtures_at, 'fixtures', key='fixtures'))
+
+        return sorted(tasks, key=lambda task: task.run_at)
+
+    @staticmethod
+    def _merge_windows(windows: List[Tuple[datetime, datetime]]) -> List[Tuple[datetime, datetime]]:
+        merged = []
+        for start, end in sorted(windows):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def execute(self, task: ScheduledTask, stop_event: threading.Event):
+        """Exécuter une tâche du plan via FootballAPIScraper"""
+        if task.kind == 'live_window':
+            self._run_live_window(task.until, stop_event)
+
+        elif task.kind == 'standings':
+            standings = self.scraper.get_standings(task.championship)
+            if standings and self.db.save_standings(task.championship, standings):
+                logger.info(f"Classement {task.championship} rafraîchi ({len(standings)} équipes)")
+                self.done.add(task.key)
+                self.retry_at.pop(task.key, None)
+            else:
+                # Classement vide ou non sauvegardé: nouvel essai après SCHEDULER_STANDINGS_DELAY
+                self.retry_at[task.key] = (datetime.now(timezone.utc)
+                                           + timedelta(minutes=Config.SCHEDULER_STANDINGS_DELAY))
+                logger.warning(f"Classement {task.championship} non rafraîchi, nouvel essai à "
+                               f"{self.retry_at[task.key].strftime(ISO_FORMAT)}")
+
+        elif task.kind == 'fixtures':
+            self.refresh_fixtures()
+
+    def refresh_fixtures(self) -> int:
+        """Calendrier de J-1 à J+LOOKAHEAD pour tous les championnats (une requête par fenêtre)"""
+        today = datetime.now(timezone.utc).date()
+        date_from = (today - timedelta(days=1)).strftime('%Y-%m-%d')
+        date_to = (today + timedelta(days=Config.SCHEDULER_LOOKAHEAD_DAYS)).strftime('%Y-%m-%d')
+
+        with request_priority('fixtures'):
+            results = self.scraper.get_matches_for_championships(self.championships, date_from, date_to)
+        matches = [match for championship_matches in results.values() for match in championship_matches]
+        counts = self.db.upsert_matches(matches)
+
+        self.last_fixtures_refresh = datetime.now(timezone.utc)
+        logger.info(f"Calendrier {date_from} → {date_to}: {len(matches)} matches "
+                    f"({counts['inserted']} nouveaux, {counts['updated']} modifiés)")
+        return len(matches)
+
+    def _run_live_window(self, until: datetime, stop_event: threading.Event):
+        """Suivi dense jusqu'à la fin de la fenêtre (prolongé tant qu'un match est en cours)"""
+        logger.info(f"Fenêtre live jusqu'à {until.strftime('%H:%M')} UTC")
+
+        while not stop_event.is_set():
+            try:
+                self.live_poller.poll_once()
+            except Exception as e:
+                logger.error(f"Erreur suivi live: {e}")
+
+            if datetime.now(timezone.utc) >= until and not self.live_poller.state:
+                break
+            stop_event.wait(self.live_poller.poll_interval)
+
+    def run(self, stop_event: threading.Event = None):
+        """Démon: exécuter le plan au fil de l'eau jusqu'à ce que stop_event soit levé"""
+        stop_event = stop_event or threading.Event()
+        logger.info(f"Planificateur démarré pour {', '.join(self.championships)}")
+
+        while not stop_event.is_set():
+            now = datetime.now(timezone.utc)
+            tasks = self.plan(now)
+            due = [task for task in tasks if task.run_at <= now]
+
+            if not due:
+                # Replanifier au moins toutes les heures (calendrier modifié par ailleurs)
+                wait = min((tasks[0].run_at - now).total_seconds(), 3600) if tasks else 3600
+                logger.info(f"Prochaine tâche: {tasks[0].kind} à {tasks[0].run_at.strftime('%Y-%m-%d %H:%M')} UTC"
+                            if tasks else "Aucune tâche planifiée")
+                stop_event.wait(max(wait, 1))
+                continue
+
+            try:
+                self.execute(due[0], stop_event)
+            except Exception as e:
+                logger.error(f"Erreur tâche {due[0].kind}: {e}")
+                stop_event.wait(Config.LIVE_IDLE_INTERVAL)
+
+        logger.info("Planificateur arrêté")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Planificateur de scraping calé sur le calendrier")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    plan_parser = subparsers.add_parser('plan', help="Afficher le plan des prochaines heures")
+    plan_parser.add_argument('--hours', type=int, default=24)
+
+    subparsers.add_parser('run', help="Lancer le démon")
+
+    parser.add_argument('--championship', action='append', dest='championships',
+                        help="Limiter à un championnat (répétable)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    db = FootballDatabase(Config.DB_PATH)
+    scheduler = FixtureScheduler(FootballAPIScraper(db), db, args.championships)
+
+    if args.command == 'plan':
+        for task in scheduler.plan(horizon_hours=args.hours):
+            until = f" → {task.until.strftime('%H:%M')}" if task.until else ''
+            print(f"{task.run_at.strftime('%Y-%m-%d %H:%M')}{until} UTC  {task.kind:<12} {task.championship or ''}")
+        return
+
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        print("Planificateur arrêté")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,45 +1,552 @@
 # scraper.py (version corrigée)
 import requests
 import logging
+import asyncio
+from collections import deque
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Callable, Iterator, AsyncIterator, NamedTuple
 import time
+import threading
 from config import Config
+from http_cache import HTTPCache
+from archive import PayloadArchive
+from competitions import CompetitionStore
+from resilience import RetryPolicy, CircuitBreaker, APIError
+from priorities import RequestScheduler, request_priority
+from metrics import ScraperMetrics
 
 logger = logging.getLogger(__name__)
 
 
-class FootballAPIScraper:
+class WindowBatch(NamedTuple):
+    """Résultat d'une fenêtre de dates: matches parsés, ou erreur si la fenêtre a échoué"""
+    date_from: str
+    date_to: str
+    matches: List[Dict]
+    error: Optional[str] = None
+
+
+class AsyncFetchEngine:
+    """Client asynchrone qui exécute plusieurs requêtes de fenêtres en parallèle
+
+    Les requêtes passent toujours par la session HTTP du scraper (via un pool de
+    threads) et donc par son RateLimiter : l'engine ne fait que les paralléliser.
+    """
+
+    def __init__(self, max_concurrency: int = None):
+        self.max_concurrency = max(1, max_concurrency or Config.MAX_CONCURRENT_REQUESTS)
+
+    async def iter_windows(self, fetch: Callable[[str, str], List[Dict]],
+                           windows: List[Tuple[str, str]]) -> AsyncIterator[List[Dict]]:
+        """Exécuter fetch(date_from, date_to) pour chaque fenêtre, résultats dans l'ordre des dates"""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(date_from: str, date_to: str) -> List[Dict]:
+            async with semaphore:
+                return await asyncio.to_thread(fetch, date_from, date_to)
+
+        # Nombre limité de tâches en vol pour garder une mémoire constante
+        pending = deque()
+        remaining = iter(windows)
+        max_pending = self.max_concurrency * 2
+
+        def schedule():
+            while len(pending) < max_pending:
+                window = next(remaining, None)
+                if window is None:
+                    return
+                pending.append(asyncio.ensure_future(run(*window)))
+
+        try:
+            schedule()
+            while pending:
+                result = await pending.popleft()
+                schedule()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def iter_windows_sync(self, fetch: Callable[[str, str], List[Dict]],
+                          windows: List[Tuple[str, str]]) -> Iterator[List[Dict]]:
+        """Wrapper synchrone de iter_windows (boucle d'événements privée)"""
+        agen = self.iter_windows(fetch, windows)
+        loop = asyncio.new_event_loop()
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+    @staticmethod
+    def can_run_sync() -> bool:
+        """Le wrapper synchrone est impossible depuis une boucle asyncio déjà active"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+
+
+def _header_int(headers, name: str) -> Optional[int]:
+    """Lire un en-tête numérique (None si absent ou invalide)"""
+    value = headers.get(name) if headers is not None else None
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token bucket thread-safe piloté par les en-têtes de quota de football-data.org
+
+    Sans information du serveur, les jetons se rechargent en continu
+    (requests_per_minute par minute). Dès qu'une réponse fournit
+    X-Requests-Available-Minute et X-RequestCounter-Reset, le seau est recalé
+    sur le compteur du serveur (moins les requêtes encore en vol) et n'est
+    rechargé qu'à la réinitialisation annoncée : tout le quota est consommé,
+    sans jamais provoquer de 429.
+
+    La capacité est celle du quota: la limite configurée, puis le plus grand
+    X-Requests-Available-Minute + 1 observé (la requête qui vient d'être
+    comptée), sans jamais y ajouter les requêtes en vol.
+    """
+
+    def __init__(self, requests_per_minute: int = None):
+        self.capacity = float(max(1, requests_per_minute or Config.MAX_REQUESTS_PER_MINUTE))
+        self.refill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.reset_at = None
+        self.in_flight = 0
+        self.server_capacity = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if self.reset_at is not None:
+            # Fenêtre connue du serveur: rechargement complet à la réinitialisation
+            if now >= self.reset_at:
+                self.tokens = self.capacity
+                self.reset_at = None
+        else:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def reserve(self) -> float:
+        """Prendre un jeton si possible, sinon renvoyer le délai d'attente en secondes"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.in_flight += 1
+                return 0.0
+
+            if self.reset_at is not None:
+                return max(self.reset_at - now, 0.05)
+            return (1 - self.tokens) / self.refill_rate
+
+    def acquire(self) -> float:
+        """Bloquer jusqu'à obtenir un jeton; renvoie le temps passé à attendre"""
+        waited = 0.0
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return waited
+            time.sleep(delay)
+            waited += delay
+
+    def release(self):
+        """Terminer une requête sans réponse exploitable (erreur réseau)"""
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+    def update_from_headers(self, headers, status_code: int = None):
+        """Terminer une requête et recaler le seau sur les en-têtes de quota de l'API"""
+        available = _header_int(headers, 'X-Requests-Available-Minute')
+        reset = _header_int(headers, 'X-RequestCounter-Reset')
+        if status_code == 429 and reset is None:
+            reset = _header_int(headers, 'Retry-After')
+
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+
+            if available is None and reset is None and status_code != 429:
+                return
+
+            now = time.monotonic()
+            self._refill(now)
+
+            if status_code == 429:
+                available = 0
+            if available is not None:
+                # Le serveur fait foi; les requêtes encore en vol consommeront aussi.
+                # Dans une fenêtre déjà connue, une réponse arrivée en retard ne
+                # doit pas redonner des jetons déjà consommés.
+                server_tokens = float(max(0, available - self.in_flight))
+                if status_code != 429:
+                    self.server_capacity = max(self.server_capacity or 0, available + 1)
+                    self.capacity = float(self.server_capacity)
+                    self.tokens = min(self.tokens, self.capacity)
+                if self.reset_at is None:
+                    self.tokens = server_tokens
+                else:
+                    self.tokens = min(self.tokens, server_tokens)
+            if reset is not None:
+                self.reset_at = now + reset
+            elif status_code == 429:
+                self.reset_at = now + 60
+
+
+class ApiKey:
+    """Clé API avec son propre état de quota"""
+
+    def __init__(self, key: str, requests_per_minute: int = None):
+        self.key = key
+        self.rate_limiter = RateLimiter(requests_per_minute)
+        self.disabled_until = 0.0
+        self.disabled_reason = None
+
+    @property
+    def label(self) -> str:
+        """Identifiant affichable (jamais la clé complète dans les logs)"""
+        return f"…{self.key[-4:]}" if self.key else "(vide)"
+
+    def is_active(self, now: float = None) -> bool:
+        return (now or time.monotonic()) >= self.disabled_until
+
+
+class ApiKeyPool:
+    """Pool de clés API: chaque requête part sur la clé qui a encore du quota
+
+    Chaque clé a son RateLimiter (recalé sur les en-têtes de quota de ses
+    propres réponses). Une clé refusée (403) est retirée de la rotation pendant
+    Config.API_KEY_DISABLE_SECONDS. Le pool expose reserve() au RequestScheduler.
+    """
+
+    def __init__(self, keys: List[str], requests_per_minute: int = None):
+        self.keys = [ApiKey(key, requests_per_minute) for key in dict.fromkeys(keys)]
+        self._lock = threading.Lock()
+
+    def active_keys(self) -> List[ApiKey]:
+        now = time.monotonic()
+        with self._lock:
+            return [api_key for api_key in self.keys if api_key.is_active(now)]
+
+    def reserve(self) -> Tuple[Optional[ApiKey], float]:
+        """Prendre un jeton sur la clé la plus disponible: (clé, 0) ou (None, délai)"""
+        active_keys = self.active_keys()
+        if not active_keys:
+            # Toutes les clés sont écartées: attendre la première réactivation
+            with self._lock:
+                return None, max(0.05, min(api_key.disabled_until for api_key in self.keys) - time.monotonic())
+
+        delays = []
+        for api_key in sorted(active_keys, key=lambda api_key: -api_key.rate_limiter.tokens):
+            delay = api_key.rate_limiter.reserve()
+            if delay <= 0:
+                return api_key, 0.0
+            delays.append(delay)
+        return None, min(delays)
+
+    def disable(self, api_key: ApiKey, reason: str):
+        with self._lock:
+            api_key.disabled_until = time.monotonic() + Config.API_KEY_DISABLE_SECONDS
+            api_key.disabled_reason = reason
+        logger.warning(f"Clé API {api_key.label} retirée de la rotation: {reason}")
+
+    def enable(self, api_key: ApiKey):
+        with self._lock:
+            api_key.disabled_until = 0.0
+            api_key.disabled_reason = None
+
+    def get_stats(self) -> List[Dict]:
+        """État de chaque clé (jetons, requêtes en vol, activité)"""
+        now = time.monotonic()
+        return [{
+            'key': api_key.label,
+            'active': api_key.is_active(now),
+            'tokens': round(api_key.rate_limiter.tokens, 1),
+            'capacity': api_key.rate_limiter.capacity,
+            'in_flight': api_key.rate_limiter.in_flight,
+            'disabled_reason': api_key.disabled_reason
+        } for api_key in self.keys]
+
+
+class SingleFlight:
+    """Déduplication des appels identiques simultanés
+
+    Le premier appelant d'une clé exécute la fonction; les appelants
+    concurrents de la même clé attendent ce seul appel et partagent son
+    résultat (ou son exception). Aucun résultat n'est conservé après la fin
+    de l'appel: ce n'est pas un cache.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+            self.waiters = 0
+
     def __init__(self):
-        self.api_key = Config.FOOTBALL_DATA_API_KEY
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, fn: Callable):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Requête partagée avec {call.waiters} appel(s) concurrent(s)")
+            call.done.set()
+
+
+class FootballAPIScraper:
+    def __init__(self, database=None):
+        self.api_keys = [key for key in Config.FOOTBALL_DATA_API_KEYS if key]
+        self.api_key = self.api_keys[0] if self.api_keys else None
         self.base_url = Config.FOOTBALL_DATA_URL
+        # X-Auth-Token est ajouté à chaque requête selon la clé choisie dans le pool
         self.headers = {
-            'X-Auth-Token': self.api_key,
             'User-Agent': 'FootballScraper/1.0'
         }
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.key_pool = ApiKeyPool(self.api_keys or [''])
+        self.request_scheduler = RequestScheduler(self.key_pool)
+        self.cache = HTTPCache(Config.CACHE_DB_PATH, Config.CACHE_MEMORY_MAX_ENTRIES)
+        self.archive = PayloadArchive(Config.ARCHIVE_DIR) if Config.ARCHIVE_ENABLED else None
+        self.competitions = CompetitionStore(self._fetch_competition, Config.CACHE_DB_PATH,
+                                             Config.CACHE_TTL.get('competition', 3600))
+        self.retry_policy = RetryPolicy(max_retries=Config.REQUEST_RETRY_COUNT)
+        self.circuit_breakers = {}
+        self._breakers_lock = threading.Lock()
+        self.single_flight = SingleFlight()
+        self.async_engine = AsyncFetchEngine()
+        self.metrics = ScraperMetrics()
+        if Config.METRICS_EXPORT_PATH:
+            self.metrics.start_exporter(Config.METRICS_EXPORT_PATH, Config.METRICS_EXPORT_INTERVAL)
+        # Base locale (FootballDatabase) servant de cache aux équipes, optionnelle
+        self.db = database
 
         if not self.api_key:
             logger.warning("Aucune clé API configurée")
+        elif len(self.api_keys) > 1:
+            logger.info(f"Pool de {len(self.api_keys)} clés API")
+
+    def _endpoint_name(self, url: str) -> str:
+        """Classe d'endpoint d'une URL (identifiants remplacés par {id})"""
+        path = url[len(self.base_url):] if url.startswith(self.base_url) else url
+        parts = path.strip('/').split('/')
+        for i in range(1, len(parts)):
+            if parts[i - 1] in ('competitions', 'teams', 'matches', 'persons', 'areas'):
+                parts[i] = '{id}'
+        return '/' + '/'.join(parts)
+
+    def _breaker_for(self, endpoint: str) -> CircuitBreaker:
+        with self._breakers_lock:
+            breaker = self.circuit_breakers.get(endpoint)
+            if breaker is None:
+                breaker = CircuitBreaker(endpoint, Config.CIRCUIT_BREAKER_THRESHOLD,
+                                         Config.CIRCUIT_BREAKER_RECOVERY)
+                self.circuit_breakers[endpoint] = breaker
+            return breaker
+
+    def _get(self, url: str, params: Dict = None, timeout: int = 10,
+             cache_class: str = None):
+        """GET dédupliqué: les appels concurrents identiques (URL, paramètres)
+        partagent une seule requête en vol (voir _get_uncoalesced)"""
+        key = f"{cache_class}:{self.cache.make_key(url, params)}"
+        return self.single_flight.do(key, lambda: self._get_uncoalesced(url, params, timeout, cache_class))
+
+    def _get_uncoalesced(self, url: str, params: Dict = None, timeout: int = 10,
+                         cache_class: str = None):
+        """GET via la session, en passant par le cache HTTP, le limiteur de débit
+        et la couche de résilience
+
+        Avec cache_class (clé de Config.CACHE_TTL), une entrée encore fraîche est
+        servie sans appel réseau ni consommation de quota; une entrée expirée est
+        revalidée par If-None-Match / If-Modified-Since.
+
+        Les erreurs réseau, 429 et 5xx sont retentées avec backoff exponentiel
+        (ou le délai Retry-After). Chaque endpoint a son disjoncteur: s'il est
+        ouvert, CircuitOpenError est levée sans appeler l'API.
+
+        Chaque corps de réponse 200 est conservé dans l'archive (PayloadArchive).
+        Le jeton est pris sur la clé du pool la plus disponible, attribué par le
+        RequestScheduler selon la priorité déclarée avec request_priority (voir
+        priorities.py). Un 403 retire la clé de la rotation et la requête repart
+        sur une autre clé; si celle-ci reçoit aussi 403, c'est la ressource qui
+        est restreinte et la première clé est réintégrée.
+
+        Chaque requête, tentative, attente de jeton et réponse du cache est
+        comptée dans self.metrics (ScraperMetrics).
+        """
+        entry = None
+        request_headers = None
+        endpoint = self._endpoint_name(url)
+
+        if cache_class:
+            entry = self.cache.get(url, params)
+            if entry is not None:
+                if entry.is_fresh():
+                    self.metrics.record_cache(endpoint)
+                    return entry.to_response()
+                request_headers = entry.validators()
+
+        breaker = self._breaker_for(endpoint)
+        trial = breaker.before_call()
+
+        attempt = 0
+        forbidden_keys = []
+        while True:
+            wait_started = time.perf_counter()
+            api_key = self.request_scheduler.acquire()
+            self.metrics.record_rate_limit_wait(time.perf_counter() - wait_started)
+            headers = dict(request_headers or {})
+            if api_key.key:
+                headers['X-Auth-Token'] = api_key.key
+            request_started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                api_key.rate_limiter.release()
+                self.metrics.record_request(endpoint, 'error', time.perf_counter() - request_started)
+                breaker.record_failure()
+                if attempt >= self.retry_policy.max_retries or breaker.state == CircuitBreaker.OPEN:
+                    raise
+                delay = self.retry_policy.delay(attempt)
+                self.metrics.record_retry(endpoint, 'network', delay)
+                logger.warning(f"Erreur réseau ({e}), tentative {attempt + 2} dans {delay:.1f}s: {url}")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            except Exception:
+                api_key.rate_limiter.release()
+                if trial:
+                    # Ni succès ni échec de l'API: l'essai half_open reste disponible
+                    breaker.release_trial()
+                raise
+
+            api_key.rate_limiter.update_from_headers(response.headers, response.status_code)
+            status_code = response.status_code
+            self.metrics.record_request(endpoint, status_code, time.perf_counter() - request_started,
+                                        len(response.content))
+            self.metrics.record_quota(api_key.label,
+                                      _header_int(response.headers, 'X-Requests-Available-Minute'),
+                                      _header_int(response.headers, 'X-RequestCounter-Reset'))
+
+            if status_code == 403:
+                if not forbidden_keys and len(self.key_pool.active_keys()) > 1:
+                    # Clé suspecte: même requête sur une autre clé, hors compteur de tentatives
+                    forbidden_keys.append(api_key)
+                    self.key_pool.disable(api_key, f"403 sur {endpoint}")
+                    self.metrics.record_retry(endpoint, '403')
+                    continue
+                for forbidden_key in forbidden_keys:
+                    # Deux clés refusées: ressource restreinte, pas clé invalide
+                    self.key_pool.enable(forbidden_key)
+            elif forbidden_keys:
+                logger.warning(f"Clé API {forbidden_keys[0].label} refusée, requête servie par {api_key.label}")
+
+            if status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            retryable = status_code == 429 or status_code >= 500
+            if (not retryable or attempt >= self.retry_policy.max_retries
+                    or breaker.state == CircuitBreaker.OPEN):
+                break
+
+            if status_code == 429:
+                # Le RateLimiter est déjà bloqué jusqu'à la réinitialisation annoncée
+                delay = 0.0
+            else:
+                delay = self.retry_policy.delay(attempt, _header_int(response.headers, 'Retry-After'))
+            self.metrics.record_retry(endpoint, '429' if status_code == 429 else '5xx', delay)
+            logger.warning(f"Erreur API {status_code}, tentative {attempt + 2} dans {delay:.1f}s: {url}")
+            time.sleep(delay)
+            attempt += 1
+
+        if self.archive is not None and response.status_code == 200:
+            self.archive.store(endpoint, url, params, response.content)
+
+        if cache_class:
+            ttl = Config.CACHE_TTL.get(cache_class, 0)
+            if response.status_code == 304 and entry is not None:
+                self.metrics.record_cache(endpoint, revalidated=True)
+                return self.cache.revalidated(entry, response, ttl).to_response()
+            if response.status_code == 200:
+                self.cache.store(url, params, response, ttl)
+
+        return response
 
     def test_connection(self) -> bool:
-        """Tester la connexion à l'API"""
+        """Tester la connexion à l'API
+
+        Les métadonnées de PL sont toujours redemandées à l'API (jamais servies
+        depuis le cache); le document récupéré profite ensuite aux autres appels.
+        """
         try:
-            response = self.session.get(f"{self.base_url}/competitions/PL", timeout=10)
-            return response.status_code == 200
+            return self.competitions.refresh('PL') is not None
         except Exception as e:
             logger.error(f"Erreur test connexion: {e}")
             return False
 
+    def _fetch_competition(self, competition_id: str) -> Optional[Dict]:
+        """Document /competitions/{id} brut (source du CompetitionStore)"""
+        response = self._get(f"{self.base_url}/competitions/{competition_id}", timeout=10)
+        if response.status_code != 200:
+            logger.warning(f"Erreur API {response.status_code} pour la compétition {competition_id}")
+            return None
+        return response.json()
+
     def get_matches_by_date_range(self, championship: str,
-                                  date_from: str, date_to: str) -> List[Dict]:
+                                  date_from: str, date_to: str,
+                                  concurrent: bool = True) -> List[Dict]:
         """Récupérer les matches sur une période (gère les longues périodes)"""
+        return self._collect_matches(
+            self.iter_matches_by_date_range(championship, date_from, date_to, concurrent=concurrent),
+            championship
+        )
+
+    def iter_matches_by_date_range(self, championship: str,
+                                   date_from: str, date_to: str,
+                                   concurrent: bool = True) -> Iterator[WindowBatch]:
+        """Produire les matches d'une période fenêtre par fenêtre, dans l'ordre des dates"""
         championship_code = Config.get_championship_code(championship)
 
         if not championship_code:
             logger.error(f"Championnat inconnu: {championship}")
-            return []
+            return
 
         # Convertir les dates en objets datetime
         try:
@@ -47,104 +554,342 @@ class FootballAPIScraper:
             end_date = datetime.strptime(date_to, '%Y-%m-%d')
         except ValueError:
             logger.error(f"Format de date invalide: {date_from} ou {date_to}")
-            return []
+            return
 
         # Vérifier si la période est trop longue (> 10 jours)
         total_days = (end_date - start_date).days + 1
 
         if total_days > 10:
             logger.info(f"Période longue détectée: {total_days} jours. Découpage en lots de 7 jours...")
-            return self._get_matches_long_period(championship_code, start_date, end_date, championship)
+            windows = self._split_period(start_date, end_date)
         else:
-            return self._get_matches_single_request(championship_code, date_from, date_to, championship)
-
-    def _get_matches_single_request(self, championship_code: int,
-                                    date_from: str, date_to: str,
-                                    championship_name: str) -> List[Dict]:
-        """Récupérer les matches avec une seule requête API (pour périodes courtes)"""
-        matches = []
-
-        try:
-            url = f"{self.base_url}/matches"
-            params = {
-                'competitions': championship_code,
-                'dateFrom': date_from,
-                'dateTo': date_to
-            }
+            windows = [(date_from, date_to)]
+            concurrent = False
+
+        yield from self._iter_window_batches(championship_code, windows, championship, concurrent)
+
+    def _fetch_matches_window(self, competitions, date_from: str, date_to: str,
+                              championship_name: str = None) -> List[Dict]:
+        """Une requête /matches; lève une exception si la fenêtre n'a pas pu être récupérée
+
+        Sans championship_name, chaque match est rattaché au championnat de sa compétition.
+        """
+        url = f"{self.base_url}/matches"
+        params = {
+            'competitions': competitions,
+            'dateFrom': date_from,
+            'dateTo': date_to
+        }
 
-            response = self.session.get(url, params=params, timeout=30)
+        response = self._get(url, params=params, timeout=30)
 
-            if response.status_code != 200:
-                logger.error(f"Erreur API: {response.status_code} - {response.text}")
-                return matches
+        if response.status_code != 200:
+            raise APIError(response.status_code, response.text)
 
-            data = response.json()
-            matches_data = data.get('matches', [])
+        matches = []
+        for match_data in response.json().get('matches', []):
+            championship = championship_name or self._championship_of(match_data)
+            parsed_match = self._parse_match_data(match_data, championship)
+            if parsed_match:
+                matches.append(parsed_match)
 
-            for match_data in matches_data:
-                parsed_match = self._parse_match_data(match_data, championship_name)
-                if parsed_match:
-                    matches.append(parsed_match)
+        return matches
 
-            logger.info(f"Récupéré {len(matches)} matches pour {championship_name}")
+    def _championship_of(self, match_data: Dict) -> str:
+        """Nom du championnat (Config) d'un match brut"""
+        competition = match_data.get('competition', {})
+        return (Config.get_championship_by_code(competition.get('id'))
+                or Config.get_championship_by_code(competition.get('code'))
+                or competition.get('name', 'Unknown'))
+
+    def _fetch_windows(self, fetch: Callable[[str, str], List[Dict]],
+                       windows: List[Tuple[str, str]], label: str,
+                       concurrent: bool = True) -> Iterator[WindowBatch]:
+        """Exécuter fetch sur chaque fenêtre (dans l'ordre des dates) en notant les échecs
+
+        Une fenêtre en échec produit un WindowBatch vide avec son erreur: les
+        échecs d'un appel se lisent dans ses propres batches, et leur rapport
+        est journalisé à la fin de l'itération.
+        """
+        failures = []
+
+        def guarded(date_from_str: str, date_to_str: str) -> WindowBatch:
+            logger.info(f"Récupération lot {date_from_str} à {date_to_str}")
+            try:
+                return WindowBatch(date_from_str, date_to_str, fetch(date_from_str, date_to_str))
+            except Exception as e:
+                logger.error(f"Échec lot {date_from_str} à {date_to_str} ({label}): {e}")
+                failures.append({'championship': label, 'date_from': date_from_str,
+                                 'date_to': date_to_str, 'error': str(e)})
+                return WindowBatch(date_from_str, date_to_str, [], str(e))
+
+        if concurrent and AsyncFetchEngine.can_run_sync():
+            # Requêtes parallèles dans la limite du budget de l'API
+            yield from self.async_engine.iter_windows_sync(guarded, windows)
+        else:
+            # Le RateLimiter de _get cadence les requêtes selon le quota de l'API
+            for date_from_str, date_to_str in windows:
+                yield guarded(date_from_str, date_to_str)
+
+        failures.sort(key=lambda failure: failure['date_from'])
+        if failures:
+            logger.warning(self.get_failure_report(failures))
+
+    @staticmethod
+    def get_failure_report(failures: List[Dict]) -> str:
+        """Rapport texte d'une liste de fenêtres en échec"""
+        if not failures:
+            return "Aucune fenêtre en échec"
+
+        lines = [f"{len(failures)} fenêtre(s) en échec:"]
+        for failure in failures:
+            lines.append(f"  • {failure['championship']} {failure['date_from']} → "
+                         f"{failure['date_to']}: {failure['error']}")
+        return "\n".join(lines)
+
+    def _split_period(self, start_date: datetime, end_date: datetime,
+                      batch_size: int = 7) -> List[Tuple[str, str]]:
+        """Découper une période en fenêtres de batch_size jours maximum"""
+        windows = []
+        current_date = start_date
 
-        except Exception as e:
-            logger.error(f"Erreur récupération matches: {e}")
+        while current_date <= end_date:
+            batch_end = min(current_date + timedelta(days=batch_size - 1), end_date)
+            windows.append((current_date.strftime('%Y-%m-%d'), batch_end.strftime('%Y-%m-%d')))
+            current_date = batch_end + timedelta(days=1)
 
-        return matches
+        return windows
 
     def _get_matches_long_period(self, championship_code: int,
                                  start_date: datetime, end_date: datetime,
-                                 championship_name: str) -> List[Dict]:
+                                 championship_name: str,
+                                 concurrent: bool = True) -> List[Dict]:
         """Récupérer les matches pour une longue période (découpage en lots)"""
+        # Découper en lots de 7 jours maximum
+        windows = self._split_period(start_date, end_date)
+        return self._collect_matches(
+            self._iter_window_batches(championship_code, windows, championship_name, concurrent),
+            championship_name
+        )
+
+    def get_matches_for_ranges(self, championship: str, ranges: List[Tuple[str, str]],
+                               concurrent: bool = True) -> List[Dict]:
+        """Récupérer les matches de plusieurs plages de dates (ex: plan de CoveragePlanner)"""
+        return self._collect_matches(
+            self.iter_matches_for_ranges(championship, ranges, concurrent=concurrent),
+            championship
+        )
+
+    def iter_matches_for_ranges(self, championship: str, ranges: List[Tuple[str, str]],
+                                concurrent: bool = True) -> Iterator[WindowBatch]:
+        """Produire les matches de plusieurs plages de dates, fenêtre par fenêtre"""
+        championship_code = Config.get_championship_code(championship)
+
+        if not championship_code:
+            logger.error(f"Championnat inconnu: {championship}")
+            return
+
+        windows = []
+        for date_from, date_to in ranges:
+            try:
+                start_date = datetime.strptime(date_from, '%Y-%m-%d')
+                end_date = datetime.strptime(date_to, '%Y-%m-%d')
+            except ValueError:
+                logger.error(f"Format de date invalide: {date_from} ou {date_to}")
+                continue
+            windows.extend(self._split_period(start_date, end_date))
+
+        yield from self._iter_window_batches(championship_code, windows, championship, concurrent)
+
+    def _iter_window_batches(self, championship_code: int, windows: List[Tuple[str, str]],
+                             championship_name: str, concurrent: bool = True) -> Iterator[WindowBatch]:
+        """Produire un WindowBatch (matches triés par date) par fenêtre"""
+
+        def fetch(date_from_str: str, date_to_str: str) -> List[Dict]:
+            with request_priority(championship=championship_name):
+                matches = self._fetch_matches_window(championship_code, date_from_str, date_to_str,
+                                                     championship_name)
+            matches.sort(key=lambda match: match.get('date') or '')
+            return matches
+
+        yield from self._fetch_windows(fetch, windows, championship_name, concurrent)
+
+    def _collect_matches(self, batches: Iterator[WindowBatch], championship_name: str) -> List[Dict]:
+        """Rassembler les matches de toutes les fenêtres (déjà dans l'ordre des dates)"""
         all_matches = []
-        current_date = start_date
+        for batch in batches:
+            all_matches.extend(batch.matches)
 
-        # Découper en lots de 7 jours maximum
-        batch_size = 7
+        logger.info(f"Total récupéré: {len(all_matches)} matches pour {championship_name}")
+        return all_matches
 
-        while current_date <= end_date:
-            batch_end = min(current_date + timedelta(days=batch_size - 1), end_date)
+    def get_matches_for_championships(self, championships: List[str] = None,
+                                      date_from: str = None, date_to: str = None,
+                                      concurrent: bool = True) -> Dict[str, List[Dict]]:
+        """Récupérer les matches de plusieurs championnats avec une requête par fenêtre
+
+        Tous les codes sont envoyés ensemble dans le paramètre `competitions`
+        de /matches, puis la réponse est redistribuée par championnat.
+        """
+        if championships is None:
+            championships = list(Config.CHAMPIONSHIP_IDS.keys())
+
+        codes = []
+        results = {}
+        for championship in championships:
+            championship_code = Config.get_championship_code(championship)
+            if championship_code:
+                codes.append(str(championship_code))
+                results[championship] = []
+            else:
+                logger.error(f"Championnat inconnu: {championship}")
+
+        if not codes:
+            return results
 
-            date_from_str = current_date.strftime('%Y-%m-%d')
-            date_to_str = batch_end.strftime('%Y-%m-%d')
+        try:
+            start_date = datetime.strptime(date_from, '%Y-%m-%d')
+            end_date = datetime.strptime(date_to, '%Y-%m-%d')
+        except (TypeError, ValueError):
+            logger.error(f"Format de date invalide: {date_from} ou {date_to}")
+            return results
 
-            logger.info(f"Récupération lot {date_from_str} à {date_to_str}")
+        competitions = ','.join(codes)
+        windows = self._split_period(start_date, end_date)
 
-            batch_matches = self._get_matches_single_request(
-                championship_code, date_from_str, date_to_str, championship_name
-            )
+        def fetch(date_from_str: str, date_to_str: str) -> List[Dict]:
+            return self._fetch_matches_window(competitions, date_from_str, date_to_str)
 
-            all_matches.extend(batch_matches)
+        batches = self._fetch_windows(fetch, windows, ', '.join(results), concurrent)
 
-            # Pause pour respecter les limites de l'API
-            time.sleep(1.5)
+        for batch in batches:
+            for parsed_match in batch.matches:
+                results.setdefault(parsed_match['competition'], []).append(parsed_match)
 
-            # Passer au lot suivant
-            current_date = batch_end + timedelta(days=1)
+        for championship, matches in results.items():
+            matches.sort(key=lambda match: match.get('date') or '')
+            logger.info(f"Total récupéré: {len(matches)} matches pour {championship}")
 
-        logger.info(f"Total récupéré: {len(all_matches)} matches pour {championship_name}")
-        return all_matches
+        return results
 
-    def get_matches_by_season(self, championship: str, season_year: int = None) -> List[Dict]:
+    def get_live_matches(self, championships: List[str] = None) -> List[Dict]:
+        """Matches en cours (IN_PLAY / PAUSED) de tous les championnats, en une requête
+
+        Lève une exception si la requête échoue (liste vide = aucun match en cours).
+        """
+        if championships is None:
+            championships = list(Config.CHAMPIONSHIP_IDS.keys())
+
+        codes = [str(code) for code in map(Config.get_championship_code, championships) if code]
+        if not codes:
+            return []
+
+        return self._fetch_matches({'competitions': ','.join(codes), 'status': 'LIVE'})
+
+    def get_matches_by_ids(self, match_ids: List) -> List[Dict]:
+        """État actuel d'une liste de matches, en une requête (ex: matches qui viennent de finir)"""
+        if not match_ids:
+            return []
+        return self._fetch_matches({'ids': ','.join(str(match_id) for match_id in match_ids)})
+
+    def _fetch_matches(self, params: Dict) -> List[Dict]:
+        """Requête /matches non mise en cache; lève APIError si elle échoue"""
+        response = self._get(f"{self.base_url}/matches", params=params, timeout=10)
+
+        if response.status_code != 200:
+            raise APIError(response.status_code, response.text)
+
+        matches = []
+        for match_data in response.json().get('matches', []):
+            parsed_match = self._parse_match_data(match_data, self._championship_of(match_data))
+            if parsed_match:
+                matches.append(parsed_match)
+
+        return matches
+
+    def get_matches_by_season(self, championship: str, season_year: int = None,
+                              concurrent: bool = True, single_call: bool = True) -> List[Dict]:
         """Récupérer tous les matches d'une saison"""
+        return list(self.iter_matches_by_season(championship, season_year,
+                                                concurrent=concurrent, single_call=single_call))
+
+    def iter_matches_by_season(self, championship: str, season_year: int = None,
+                               concurrent: bool = True, single_call: bool = True) -> Iterator[Dict]:
+        """Produire les matches d'une saison au fil du parsing
+
+        Par défaut, une seule requête sur /competitions/{id}/matches?season=YYYY;
+        le découpage en fenêtres de dates n'est utilisé que si cet endpoint échoue.
+        """
         championship_code = Config.get_championship_code(championship)
 
         if not championship_code:
             logger.error(f"Championnat inconnu: {championship}")
-            return []
+            return
 
         # Déterminer l'année de saison
         if season_year is None:
-            season_year = datetime.now().year
-
-        # Dates typiques d'une saison de football (août à mai)
-        season_start = f"{season_year}-08-01"
-        season_end = f"{season_year + 1}-05-31"
+            season_year = self.get_current_season_year(championship)
 
         logger.info(f"Récupération saison {season_year}/{season_year + 1} pour {championship}")
 
-        return self.get_matches_by_date_range(championship, season_start, season_end)
+        if single_call:
+            matches_data = self._get_season_matches_data(championship, season_year)
+            if matches_data is not None:
+                count = 0
+                for parsed_match in self._parse_matches(matches_data, championship):
+                    count += 1
+                    yield parsed_match
+                logger.info(f"Récupéré {count} matches pour la saison {season_year} ({championship})")
+                return
+
+            logger.warning(f"Endpoint saison indisponible pour {championship}, repli sur le découpage par dates")
+
+        season_start, season_end = self.season_bounds(season_year)
+
+        yield from self.get_matches_by_date_range(championship, season_start, season_end,
+                                                  concurrent=concurrent)
+
+    @staticmethod
+    def season_bounds(season_year: int) -> Tuple[str, str]:
+        """Dates typiques d'une saison de football (août à mai)"""
+        return f"{season_year}-08-01", f"{season_year + 1}-05-31"
+
+    def fetch_season_matches(self, championship: str, season_year: int) -> Optional[List[Dict]]:
+        """Matches parsés d'une saison en une seule requête (None si l'endpoint échoue)"""
+        matches_data = self._get_season_matches_data(championship, season_year)
+        if matches_data is None:
+            return None
+        return list(self._parse_matches(matches_data, championship))
+
+    def _get_season_matches_data(self, championship: str, season_year: int) -> Optional[List[Dict]]:
+        """Matches bruts d'une saison en une requête (None si l'endpoint échoue)"""
+        championship_id = Config.get_championship_id(championship)
+
+        try:
+            url = f"{self.base_url}/competitions/{championship_id}/matches"
+            params = {
+                'season': season_year
+            }
+
+            with request_priority(championship=championship):
+                response = self._get(url, params=params, timeout=30)
+
+            if response.status_code != 200:
+                logger.error(f"Erreur API saison: {response.status_code}")
+                return None
+
+            return response.json().get('matches', [])
+
+        except Exception as e:
+            logger.error(f"Erreur récupération saison: {e}")
+            return None
+
+    def _parse_matches(self, matches_data: List[Dict], championship: str) -> Iterator[Dict]:
+        """Parser une liste de matches bruts en ignorant les entrées invalides"""
+        for match_data in matches_data:
+            parsed_match = self._parse_match_data(match_data, championship)
+            if parsed_match:
+                yield parsed_match
 
     def get_matches_by_matchday(self, championship: str, matchday: int) -> List[Dict]:
         """Récupérer les matches d'une journée spécifique"""
@@ -162,7 +907,7 @@ class FootballAPIScraper:
                 'matchday': matchday
             }
 
-            response = self.session.get(url, params=params, timeout=30)
+            response = self._get(url, params=params, timeout=30, cache_class='matchday')
 
             if response.status_code != 200:
                 logger.error(f"Erreur API: {response.status_code}")
@@ -190,19 +935,16 @@ class FootballAPIScraper:
         if not championship_id:
             return None
 
-        try:
-            url = f"{self.base_url}/competitions/{championship_id}"
-            response = self.session.get(url, timeout=10)
+        return self.competitions.current_matchday(championship_id)
 
-            if response.status_code == 200:
-                data = response.json()
-                current_season = data.get('currentSeason', {})
-                return current_season.get('currentMatchday')
-
-        except Exception as e:
-            logger.error(f"Erreur récupération journée actuelle: {e}")
+    def get_current_season_year(self, championship: str) -> int:
+        """Année de début de la saison en cours (année civile si inconnue)"""
+        championship_id = Config.get_championship_id(championship)
+        current_season = self.competitions.current_season(championship_id) if championship_id else None
 
-        return None
+        if current_season and current_season.get('start_date'):
+            return int(current_season['start_date'][:4])
+        return datetime.now().year
 
     def get_standings(self, championship: str) -> List[Dict]:
         """Récupérer le classement"""
@@ -214,34 +956,14 @@ class FootballAPIScraper:
 
         try:
             url = f"{self.base_url}/competitions/{championship_id}/standings"
-            response = self.session.get(url, timeout=10)
+            with request_priority('standings', championship):
+                response = self._get(url, timeout=10, cache_class='standings')
 
             if response.status_code != 200:
                 logger.error(f"Erreur API standings: {response.status_code}")
                 return []
 
-            data = response.json()
-            standings_data = []
-
-            for standing in data.get('standings', []):
-                if standing.get('type') == 'TOTAL':
-                    for table_item in standing.get('table', []):
-                        team = table_item.get('team', {})
-
-                        standings_data.append({
-                            'position': table_item.get('position'),
-                            'team': team.get('name'),
-                            'team_id': team.get('id'),
-                            'played_games': table_item.get('playedGames'),
-                            'won': table_item.get('won'),
-                            'draw': table_item.get('draw'),
-                            'lost': table_item.get('lost'),
-                            'points': table_item.get('points'),
-                            'goals_for': table_item.get('goalsFor'),
-                            'goals_against': table_item.get('goalsAgainst'),
-                            'goal_difference': table_item.get('goalDifference'),
-                            'raw_data': table_item
-                        })
+            standings_data = self._parse_standings_data(response.json())
 
             logger.info(f"Récupéré classement {championship}: {len(standings_data)} équipes")
             return standings_data
@@ -250,20 +972,91 @@ class FootballAPIScraper:
             logger.error(f"Erreur récupération classement: {e}")
             return []
 
+    def _parse_standings_data(self, data: Dict) -> List[Dict]:
+        """Parser le classement général (TOTAL) d'une réponse /standings"""
+        standings_data = []
+
+        for standing in data.get('standings', []):
+            if standing.get('type') == 'TOTAL':
+                for table_item in standing.get('table', []):
+                    team = table_item.get('team', {})
+
+                    standings_data.append({
+                        'position': table_item.get('position'),
+                        'team': team.get('name'),
+                        'team_id': team.get('id'),
+                        'played_games': table_item.get('playedGames'),
+                        'won': table_item.get('won'),
+                        'draw': table_item.get('draw'),
+                        'lost': table_item.get('lost'),
+                        'points': table_item.get('points'),
+                        'goals_for': table_item.get('goalsFor'),
+                        'goals_against': table_item.get('goalsAgainst'),
+                        'goal_difference': table_item.get('goalDifference'),
+                        'raw_data': table_item
+                    })
+
+        return standings_data
+
     def get_team_info(self, team_id: int) -> Optional[Dict]:
-        """Récupérer les informations d'une équipe"""
+        """Récupérer les informations d'une équipe
+
+        Lecture dans la table teams (voir prefetch_teams); l'API n'est appelée
+        que si l'équipe n'y est pas encore.
+        """
+        if self.db is not None:
+            team = self.db.get_team(team_id)
+            if team is not None:
+                return team
+
         try:
             url = f"{self.base_url}/teams/{team_id}"
-            response = self.session.get(url, timeout=10)
+            response = self._get(url, timeout=10)
 
             if response.status_code == 200:
-                return response.json()
+                team = response.json()
+                if self.db is not None:
+                    self.db.save_teams(None, [team])
+                return team
 
         except Exception as e:
             logger.error(f"Erreur récupération équipe {team_id}: {e}")
 
         return None
 
+    def get_competition_teams(self, championship: str) -> List[Dict]:
+        """Récupérer toutes les équipes d'un championnat (effectifs compris) en un appel"""
+        championship_id = Config.get_championship_id(championship)
+
+        if not championship_id:
+            logger.error(f"Championnat inconnu: {championship}")
+            return []
+
+        try:
+            url = f"{self.base_url}/competitions/{championship_id}/teams"
+            response = self._get(url, timeout=15, cache_class='competition')
+
+            if response.status_code != 200:
+                logger.error(f"Erreur API équipes: {response.status_code}")
+                return []
+
+            return response.json().get('teams', [])
+
+        except Exception as e:
+            logger.error(f"Erreur récupération équipes {championship}: {e}")
+            return []
+
+    def prefetch_teams(self, championship: str) -> int:
+        """Charger les équipes d'un championnat dans la table teams"""
+        if self.db is None:
+            logger.warning("Préchargement des équipes impossible: aucune base configurée")
+            return 0
+
+        teams = self.get_competition_teams(championship)
+        saved_count = self.db.save_teams(championship, teams) if teams else 0
+        logger.info(f"{saved_count} équipes préchargées pour {championship}")
+        return saved_count
+
     def get_team_matches(self, team_id: int, limit: int = 10) -> List[Dict]:
         """Récupérer les derniers matches d'une équipe"""
         try:
@@ -273,7 +1066,7 @@ class FootballAPIScraper:
                 'status': 'FINISHED'
             }
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = self._get(url, params=params, timeout=10)
 
             if response.status_code != 200:
                 logger.error(f"Erreur API team matches: {response.status_code}")
@@ -296,6 +1089,7 @@ class FootballAPIScraper:
 
     def _parse_match_data(self, match_data: Dict, championship: str) -> Optional[Dict]:
         """Parser les données d'un match"""
+        started = time.perf_counter()
         try:
             match_id = str(match_data.get('id', ''))
             home_team = match_data.get('homeTeam', {}).get('name', '')
@@ -314,6 +1108,7 @@ class FootballAPIScraper:
                 'SCHEDULED': 'scheduled',
                 'LIVE': 'live',
                 'IN_PLAY': 'live',
+                'PAUSED': 'live',
                 'FINISHED': 'finished',
                 'POSTPONED': 'postponed',
                 'CANCELLED': 'cancelled'
@@ -347,6 +1142,9 @@ class FootballAPIScraper:
             logger.error(f"Erreur parsing match: {e}")
             return None
 
+        finally:
+            self.metrics.record_parse(time.perf_counter() - started)
+
     def get_available_seasons(self, championship: str) -> List[str]:
         """Récupérer les saisons disponibles"""
         championship_id = Config.get_championship_id(championship)
@@ -354,18 +1152,4 @@ class FootballAPIScraper:
         if not championship_id:
             return []
 
-        try:
-            url = f"{self.base_url}/competitions/{championship_id}"
-            response = self.session.get(url, timeout=10)
-
-            if response.status_code != 200:
-                return []
-
-            data = response.json()
-            seasons = data.get('seasons', [])
-
-            return [season.get('startDate')[:4] for season in seasons if season.get('startDate')]
-
-        except Exception as e:
-            logger.error(f"Erreur récupération saisons: {e}")
-            return []
\ No newline at end of file
+        return self.competitions.seasons(championship_id)
\ No newline at end of file
@@ -14,8 +14,13 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 import pandas as pd
 from config import Config
-from database import FootballDatabase
-from scraper import FootballAPIScraper
+from database import FootballDatabase, MATCH_VIEW_COLUMNS
+from scraper import FootballAPIScraper, WindowBatch
+from coverage import CoveragePlanner
+from pipeline import IngestPipeline
+from jobs import BackfillJobRunner
+from live import LivePoller
+from resilience import APIError
 
 
 class FootballScraperApp:
@@ -29,7 +34,12 @@ class FootballScraperApp:
 
         # Initialisation des composants
         self.db = FootballDatabase(Config.DB_PATH)
-        self.scraper = FootballAPIScraper()
+        self.scraper = FootballAPIScraper(self.db)
+        self.planner = CoveragePlanner(self.db)
+        self.jobs = BackfillJobRunner(self.scraper, self.db)
+        self.stop_event = threading.Event()
+        self.live_poller = LivePoller(self.scraper, self.db)
+        self.live_poller.subscribe(self.on_live_event)
         self.queue = queue.Queue()
         self.is_scraping = False
         self.current_matches = []
@@ -301,6 +311,15 @@ class FootballScraperApp:
                                  anchor='w')
         save_cb.pack(fill=tk.X)
 
+        self.incremental_var = tk.BooleanVar(value=True)
+        incremental_cb = tk.Checkbutton(options_frame,
+                                        text="⚡ Ignorer les périodes déjà scrapées",
+                                        variable=self.incremental_var,
+                                        bg=self.colors['bg_light'],
+                                        font=('Segoe UI', 9),
+                                        anchor='w')
+        incremental_cb.pack(fill=tk.X)
+
         # Frame pour la base de données
         db_frame = tk.Frame(scrollable_frame,
                             bg=self.colors['bg_light'],
@@ -321,7 +340,10 @@ class FootballScraperApp:
             ("🗑️ Effacer championnat", self.clear_championship_data, self.colors['accent']),
             ("📤 Exporter en CSV", self.export_to_csv, self.colors['secondary']),
             ("📊 Statistiques DB", self.show_db_stats, '#9c27b0'),
-            ("🔄 Actualiser", self.refresh_data, '#ff9800')
+            ("🔄 Actualiser", self.refresh_data, '#ff9800'),
+            ("♻️ Reprendre jobs", self.resume_pending_jobs, '#00897b'),
+            ("⏸️ Mettre en pause", self.pause_scraping, '#607d8b'),
+            ("🔴 Suivi live", self.toggle_live_polling, '#d32f2f')
         ]
 
         for text, command, color in db_buttons:
@@ -1035,6 +1057,10 @@ class FootballScraperApp:
         self.show_db_stats()
         self.update_quick_stats()
 
+        pending_jobs = self.jobs.list_jobs(pending_only=True)
+        if pending_jobs:
+            self.log(f"{len(pending_jobs)} job(s) de backfill interrompu(s), utilisez « Reprendre jobs »")
+
     def on_championship_changed(self, event=None):
         """Quand le championnat change"""
         self.current_championship = self.championship_var.get()
@@ -1048,8 +1074,12 @@ class FootballScraperApp:
         # Mettre à jour les stats rapides
         self.update_quick_stats()
 
-    def scrape_with_progress(self):
-        """Scraper avec progression pour les longues périodes"""
+    def scrape_with_progress(self, season: bool = False):
+        """Scraper avec progression pour les longues périodes
+
+        Avec season, la saison en cours de l'API est récupérée par un job
+        saison (une requête, découpée en dates seulement si elle échoue).
+        """
         if self.is_scraping:
             messagebox.showwarning("Attention", "Une opération est déjà en cours!")
             return
@@ -1064,11 +1094,13 @@ class FootballScraperApp:
             end_date = datetime.strptime(date_to, '%Y-%m-%d')
             total_days = (end_date - start_date).days + 1
         except ValueError:
-            messagebox.showerror("Erreur", "Format de date invalide. Utilisez YYYY-MM-DD")
-            return
+            if not season:
+                messagebox.showerror("Erreur", "Format de date invalide. Utilisez YYYY-MM-DD")
+                return
+            total_days = 0
 
         # Avertissement pour les longues périodes
-        if total_days > 30:
+        if total_days > 30 and not season:
             if not messagebox.askyesno("Confirmation",
                                        f"Vous allez scraper {total_days} jours.\n"
                                        f"Cela peut prendre plusieurs minutes.\n\n"
@@ -1076,25 +1108,95 @@ class FootballScraperApp:
                 return
 
         def scraping_task():
+            nonlocal date_from, date_to
             self.is_scraping = True
-            self.queue.put(('progress_start', f"Scraping {championship} ({total_days} jours)..."))
+            self.queue.put(('progress_start', f"Scraping {championship}"
+                                              f"{' (saison)' if season else f' ({total_days} jours)'}..."))
 
             try:
-                # 1. Récupérer les matches
-                self.queue.put(('log', f"Récupération matches {championship} du {date_from} au {date_to}"))
-                self.queue.put(('log', f"Durée: {total_days} jours - Découpage automatique..."))
+                save_to_db = self.save_to_db_var.get()
+                self.stop_event.clear()
+                summary = None
 
-                matches = self.scraper.get_matches_by_date_range(championship, date_from, date_to)
+                # 1. Récupérer les matches
+                if season:
+                    # Saison en cours selon l'API (pas l'année civile)
+                    season_year = self.scraper.get_current_season_year(championship)
+                    date_from, date_to = self.scraper.season_bounds(season_year)
+                    self.queue.put(('date_range', (date_from, date_to)))
+                    self.queue.put(('log', f"Récupération saison {season_year}/{season_year + 1} de {championship}"))
+                else:
+                    self.queue.put(('log', f"Récupération matches {championship} du {date_from} au {date_to}"))
+                    self.queue.put(('log', f"Durée: {total_days} jours - Découpage automatique..."))
+
+                if season and save_to_db:
+                    # Job saison: une seule requête sur /competitions/{id}/matches?season=
+                    job_id = self.jobs.create_season_job(championship, season_year)
+                    self.queue.put(('log', f"📋 Job #{job_id} lancé (saison {season_year})"))
+                    summary = self.jobs.run(job_id, self.stop_event, on_event=self.on_ingest_event)
+                    if summary['status'] == 'paused':
+                        self.queue.put(('log', f"⏸️ Job #{job_id} en pause, reprise possible via « Reprendre jobs »"))
+                elif season:
+                    batch = WindowBatch(date_from, date_to,
+                                        self.scraper.get_matches_by_season(championship, season_year))
+                    summary = IngestPipeline(None, on_event=self.on_ingest_event).run(
+                        championship, [batch], collect=True
+                    )
+                elif save_to_db:
+                    ranges = [(date_from, date_to)]
+                    if self.incremental_var.get():
+                        # Ne récupérer que les plages manquantes et les matches non terminés
+                        ranges = self.planner.plan(championship, date_from, date_to)
+                        if ranges:
+                            self.queue.put(('log', f"⚡ Scraping incrémental: {len(ranges)} plage(s) à récupérer"))
+                        else:
+                            self.queue.put(('log', "✅ Période déjà couverte, chargement depuis la base"))
+
+                    if ranges and total_days > 30:
+                        # 2. Longue période confirmée: job reprenable, chaque fenêtre est pointée dès sa réception
+                        job_id = self.jobs.create_date_range_job(championship, date_from, date_to, ranges=ranges)
+                        self.queue.put(('log', f"📋 Job #{job_id} lancé ({len(ranges)} plage(s))"))
+                        summary = self.jobs.run(job_id, self.stop_event, on_event=self.on_ingest_event)
+                        if summary['status'] == 'paused':
+                            self.queue.put(('log', f"⏸️ Job #{job_id} en pause, reprise possible via « Reprendre jobs »"))
+                    elif ranges:
+                        # 2. Courte période: sauvegarde au fil de l'eau, sans job persistant
+                        batches = self.scraper.iter_matches_for_ranges(championship, ranges)
+                        summary = IngestPipeline(self.db, on_event=self.on_ingest_event).run(
+                            championship, self.jobs.until_stopped(batches, self.stop_event)
+                        )
+                else:
+                    batches = self.scraper.iter_matches_by_date_range(championship, date_from, date_to)
+                    summary = IngestPipeline(None, on_event=self.on_ingest_event).run(
+                        championship, batches, collect=True
+                    )
 
-                # 2. Sauvegarder dans la base
                 saved_count = 0
-                if matches:
-                    if self.save_to_db_var.get():
-                        saved_count = self.db.save_matches_batch(matches)
-                        self.db.log_scraping(championship, date_from, date_to, saved_count, 'success')
-
+                matches_count = 0
+                matches = []
+                status_counts = {}
+                write_counts = None
+                if summary is not None:
+                    saved_count = summary['saved_count']
+                    write_counts = summary['write_counts']
+                    matches_count = summary['matches_count']
+                    status_counts = summary['status_counts']
+                    matches = summary.get('matches', [])
+
+                if save_to_db:
+                    # Affichage relu depuis la base (taille bornée quelle que soit la période)
+                    matches = self.db.get_matches(championship=championship, date_from=date_from,
+                                                  date_to=f"{date_to}T23:59:59Z", limit=1000,
+                                                  columns=MATCH_VIEW_COLUMNS)
+                    if summary is None:
+                        matches_count = len(matches)
+                        for match in matches:
+                            status = match.get('status', 'unknown')
+                            status_counts[status] = status_counts.get(status, 0) + 1
+
+                if matches_count:
                     self.queue.put(('matches', matches))
-                    self.queue.put(('log', f"✅ {len(matches)} matches récupérés"))
+                    self.queue.put(('log', f"✅ {matches_count} matches récupérés"))
                 else:
                     self.queue.put(('log', f"⚠️ Aucun match trouvé pour cette période", 'warning'))
 
@@ -1109,20 +1211,25 @@ class FootballScraperApp:
                 else:
                     self.queue.put(('log', f"⚠️ Classement non disponible", 'warning'))
 
+                # Équipes et effectifs: un seul appel par championnat, au premier scraping
+                if save_to_db and not self.db.get_teams(championship):
+                    teams_count = self.scraper.prefetch_teams(championship)
+                    if teams_count:
+                        self.queue.put(('log', f"✅ Équipes: {teams_count} fiches (effectifs) en cache"))
+
                 # 4. Statistiques finales
-                if matches:
-                    self.queue.put(('log', f"📊 RÉSUMÉ: {len(matches)} matches, {saved_count} sauvegardés"))
+                if matches_count:
+                    self.queue.put(('log', f"📊 RÉSUMÉ: {matches_count} matches, {saved_count} sauvegardés"))
+                    if save_to_db and write_counts:
+                        self.queue.put(('log', f"   • écritures: {write_counts['inserted']} nouveaux, "
+                                               f"{write_counts['updated']} modifiés, "
+                                               f"{write_counts['unchanged']} inchangés (ignorés)"))
 
                     # Statistiques par statut
-                    status_counts = {}
-                    for match in matches:
-                        status = match.get('status', 'unknown')
-                        status_counts[status] = status_counts.get(status, 0) + 1
-
                     for status, count in status_counts.items():
                         self.queue.put(('log', f"   • {status}: {count} matches"))
 
-                    self.queue.put(('status', f"✅ {championship}: {len(matches)} matches scrapés"))
+                    self.queue.put(('status', f"✅ {championship}: {matches_count} matches scrapés"))
                 else:
                     self.queue.put(('status', f"⚠️ Aucun match trouvé"))
                     self.queue.put(('message', 'Information',
@@ -1142,11 +1249,12 @@ class FootballScraperApp:
                 self.db.log_scraping(championship, date_from, date_to, 0, 'error', error_msg)
 
                 # Afficher un message utile selon le type d'erreur
-                if "429" in error_msg:
+                status_code = e.status_code if isinstance(e, APIError) else None
+                if status_code == 429:
                     self.queue.put(('message', 'Erreur API',
                                     "Limite de requêtes API atteinte.\n"
                                     "Attendez 1 minute puis réessayez."))
-                elif "403" in error_msg:
+                elif status_code == 403:
                     self.queue.put(('message', 'Erreur API',
                                     "Clé API invalide ou expirée.\n"
                                     "Vérifiez votre clé dans le fichier .env"))
@@ -1159,24 +1267,100 @@ class FootballScraperApp:
 
         threading.Thread(target=scraping_task, daemon=True).start()
 
-    def scrape_season(self):
-        """Scraper une saison complète"""
-        championship = self.championship_var.get()
+    def pause_scraping(self):
+        """Mettre en pause le job en cours (reprise à la prochaine fenêtre en attente)"""
+        if self.is_scraping:
+            self.stop_event.set()
+            self.log("Pause demandée: arrêt après la fenêtre en cours")
+
+    def resume_pending_jobs(self):
+        """Reprendre les jobs de backfill interrompus"""
+        if self.is_scraping:
+            messagebox.showwarning("Attention", "Une opération est déjà en cours!")
+            return
+
+        pending_jobs = self.jobs.list_jobs(pending_only=True)
+        if not pending_jobs:
+            messagebox.showinfo("Jobs", "Aucun job en attente")
+            return
+
+        details = "\n".join(f"#{job['id']} {job['championship']} {job['date_from']} → {job['date_to']} "
+                            f"({job['windows_done'] or 0}/{job['windows_total']} fenêtres)"
+                            for job in pending_jobs)
+        answer = messagebox.askyesnocancel("Reprendre les jobs",
+                                           f"Jobs en attente:\n\n{details}\n\n"
+                                           f"Oui: reprendre   Non: abandonner ces jobs")
+        if answer is None:
+            return
+        if answer is False:
+            # Les matches déjà récupérés restent en base
+            for job in pending_jobs:
+                self.jobs.discard(job['id'])
+            self.log(f"🗑️ {len(pending_jobs)} job(s) abandonné(s)")
+            return
+
+        def resume_task():
+            self.is_scraping = True
+            self.stop_event.clear()
+            self.queue.put(('progress_start', f"Reprise de {len(pending_jobs)} job(s)..."))
+
+            try:
+                for result in self.jobs.resume_pending(self.stop_event, on_event=self.on_ingest_event):
+                    self.queue.put(('log', f"📋 Job #{result['job_id']} {result['status']}: "
+                                           f"{result['matches_count']} matches, "
+                                           f"{result['write_counts']['inserted']} nouveaux, "
+                                           f"{result['write_counts']['updated']} modifiés"))
+                self.queue.put(('status', "Reprise des jobs terminée"))
+
+            except Exception as e:
+                self.queue.put(('log', f"❌ Erreur reprise jobs: {e}"))
 
-        # Déterminer la saison actuelle
-        current_year = datetime.now().year
-        season_start = f"{current_year}-08-01"
-        season_end = f"{current_year + 1}-05-31"
+            finally:
+                self.queue.put(('progress_stop', ''))
+                self.is_scraping = False
 
-        # Mettre à jour les champs de date
-        self.date_from_var.set(season_start)
-        self.date_to_var.set(season_end)
+        threading.Thread(target=resume_task, daemon=True).start()
 
-        # Confirmation
+    def toggle_live_polling(self):
+        """Démarrer / arrêter le suivi des matches en direct"""
+        if self.live_poller.is_running:
+            self.live_poller.stop()
+            self.log("🔴 Suivi live arrêté")
+        else:
+            self.live_poller.start()
+            self.log(f"🔴 Suivi live démarré (toutes les {self.live_poller.poll_interval}s pendant les matches)")
+
+    def on_live_event(self, event_type, event):
+        """Relayer les événements du suivi live vers la queue UI (thread du poller)"""
+        score = f"{event['home_team']} {event['home_score']}-{event['away_score']} {event['away_team']}"
+        labels = {
+            'match_live': "▶️ En direct",
+            'score_change': "⚽ But",
+            'status_change': "⏱️ Statut",
+            'match_ended': "🏁 Terminé"
+        }
+        self.queue.put(('log', f"{labels.get(event_type, event_type)} [{event['championship']}] "
+                               f"{score} ({event['status']})"))
+
+    def on_ingest_event(self, event_type, data):
+        """Relayer les événements du pipeline d'ingestion vers la queue UI"""
+        if event_type == 'batch':
+            self.queue.put(('log', f"💾 Lot {data['date_from']} → {data['date_to']}: "
+                                   f"{data['count']} matches ({data['inserted']} nouveaux, "
+                                   f"{data['updated']} modifiés, {data['unchanged']} inchangés)"))
+        elif event_type == 'window_failed':
+            self.queue.put(('log', f"⚠️ Fenêtre en échec {data['date_from']} → {data['date_to']}: "
+                                   f"{data['error']}"))
+
+    def scrape_season(self):
+        """Scraper la saison en cours (job saison: une requête API)"""
+        championship = self.championship_var.get()
+
+        # Confirmation (l'année de saison est lue dans les métadonnées de l'API)
         if messagebox.askyesno("Confirmation",
-                               f"Scraper la saison complète {current_year}/{current_year + 1} de {championship}?\n\n"
-                               f"Cette opération peut prendre plusieurs minutes."):
-            self.scrape_with_progress()
+                               f"Scraper la saison en cours de {championship}?\n\n"
+                               f"Une seule requête API (découpage par dates si elle échoue)."):
+            self.scrape_with_progress(season=True)
 
     def scrape_last_30_days(self):
         """Scraper les 30 derniers jours"""
@@ -1197,7 +1381,8 @@ class FootballScraperApp:
 
             try:
                 # Charger les matches
-                matches = self.db.get_matches(championship=championship, limit=100)
+                matches = self.db.get_matches(championship=championship, limit=100,
+                                              columns=MATCH_VIEW_COLUMNS)
                 self.queue.put(('matches', matches))
 
                 # Charger le classement
@@ -1243,7 +1428,7 @@ class FootballScraperApp:
     def export_to_csv(self):
         """Exporter les données en CSV"""
         championship = self.championship_var.get()
-        matches = self.db.get_matches(championship=championship, limit=1000)
+        matches = self.db.get_matches(championship=championship, limit=1000, columns=MATCH_VIEW_COLUMNS)
 
         if not matches:
             messagebox.showinfo("Information", "Aucune donnée à exporter")
@@ -1349,7 +1534,8 @@ class FootballScraperApp:
                     championship=self.current_championship,
                     date_from=date_str,
                     date_to=date_str,
-                    limit=50
+                    limit=50,
+                    columns=MATCH_VIEW_COLUMNS
                 )
 
                 self.queue.put(('matches', matches))
@@ -1372,7 +1558,8 @@ class FootballScraperApp:
             try:
                 matches = self.db.get_matches(
                     championship=self.current_championship,
-                    limit=100
+                    limit=100,
+                    columns=MATCH_VIEW_COLUMNS
                 )
 
                 self.queue.put(('matches', matches))
@@ -1413,7 +1600,8 @@ class FootballScraperApp:
 
             try:
                 # Récupérer tous les matches du championnat actuel
-                matches = self.db.get_matches(championship=self.current_championship, limit=500)
+                matches = self.db.get_matches(championship=self.current_championship, limit=500,
+                                              columns=MATCH_VIEW_COLUMNS)
 
                 # Appliquer les filtres
                 filtered_matches = []
@@ -1617,7 +1805,8 @@ class FootballScraperApp:
                 self.quick_stats_labels['matches'].config(text=str(stats['total_matches']))
 
             # Compter les équipes uniques
-            matches = self.db.get_matches(championship=self.current_championship, limit=1000)
+            matches = self.db.get_matches(championship=self.current_championship, limit=1000,
+                                          columns=MATCH_VIEW_COLUMNS)
             teams = set()
             for match in matches:
                 teams.add(match.get('home_team', ''))
@@ -1716,7 +1905,8 @@ class FootballScraperApp:
             return
 
         # Récupérer les statistiques de l'équipe
-        matches = self.db.get_matches(championship=self.current_championship, limit=200)
+        matches = self.db.get_matches(championship=self.current_championship, limit=200,
+                                      columns=MATCH_VIEW_COLUMNS)
 
         team_stats = {
             'total_matches': 0,
@@ -2261,6 +2451,10 @@ class FootballScraperApp:
                     self.progress_bar.stop()
                     self.progress_bar.pack_forget()
 
+                elif msg_type == 'date_range':
+                    self.date_from_var.set(data[0])
+                    self.date_to_var.set(data[1])
+
                 elif msg_type == 'matches':
                     self.current_matches = data
                     self.display_matches(data)
@@ -2427,6 +2621,7 @@ def main():
     root.geometry(f'{width}x{height}+{x}+{y}')
 
     root.mainloop()
+    app.db.close()
 
 
 if __name__ == "__main__":
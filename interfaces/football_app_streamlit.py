@@ -11,8 +11,12 @@ from io import StringIO, BytesIO
 import base64
 
 from config import Config
-from database import FootballDatabase
-from scraper import FootballAPIScraper
+from database import FootballDatabase, MATCH_VIEW_COLUMNS
+from scraper import FootballAPIScraper, WindowBatch
+from coverage import CoveragePlanner
+from pipeline import IngestPipeline
+from jobs import BackfillJobRunner
+from live import LivePoller
 # Configuration de la page
 st.set_page_config(
     page_title="⚽ Football Data Scraper Pro",
@@ -30,7 +34,13 @@ def get_database():
 
 @st.cache_resource
 def get_scraper():
-    return FootballAPIScraper()
+    return FootballAPIScraper(get_database())
+
+
+@st.cache_resource
+def get_live_poller():
+    # Partagé entre les sessions: l'état du dernier cycle sert au calcul des différences
+    return LivePoller(get_scraper(), get_database())
 
 
 db = get_database()
@@ -123,26 +133,79 @@ with st.sidebar:
     st.subheader("🧭 Navigation")
     page = st.radio(
         "Pages",
-        ["🏠 Dashboard", "📥 Scraping", "⚽ Matches", "📈 Classement",
+        ["🏠 Dashboard", "📥 Scraping", "⚽ Matches", "🔴 Live", "📈 Classement",
          "📊 Statistiques", "🔍 Recherche", "💾 Export"]
     )
 
 
 # Fonction pour scraper avec feedback
-def scrape_data(championship, date_from, date_to, save_to_db=True):
-    """Fonction de scraping avec feedback Streamlit"""
+def scrape_data(championship, date_from=None, date_to=None, save_to_db=True, incremental=True,
+                season_year=None):
+    """Fonction de scraping avec feedback Streamlit
+
+    Avec season_year, la saison est récupérée par un job saison (une requête
+    API, découpée en dates seulement si elle échoue).
+    """
 
     with st.status(f"Scraping {championship}...", expanded=True) as status:
         try:
             # 1. Récupération des matches
             status.write("📥 Récupération des matches...")
-            matches = scraper.get_matches_by_date_range(championship, date_from, date_to)
-
+            batches = None
+            job_id = None
+            if season_year is not None:
+                date_from, date_to = scraper.season_bounds(season_year)
+                status.write(f"🏆 Saison {season_year}/{season_year + 1}")
+                if save_to_db:
+                    jobs = BackfillJobRunner(scraper, db)
+                    job_id = jobs.create_season_job(championship, season_year)
+                else:
+                    batches = [WindowBatch(date_from, date_to,
+                                           scraper.get_matches_by_season(championship, season_year))]
+            elif incremental and save_to_db:
+                # Ne récupérer que les plages manquantes et les matches non terminés
+                ranges = CoveragePlanner(db).plan(championship, date_from, date_to)
+                if ranges:
+                    status.write(f"⚡ Scraping incrémental: {len(ranges)} plage(s) à récupérer")
+                    batches = scraper.iter_matches_for_ranges(championship, ranges)
+                else:
+                    status.write("✅ Période déjà couverte, chargement depuis la base")
+            else:
+                batches = scraper.iter_matches_by_date_range(championship, date_from, date_to)
+
+            def on_event(event_type, data):
+                if event_type == 'batch':
+                    status.write(f"💾 Lot {data['date_from']} → {data['date_to']}: "
+                                 f"{data['count']} matches ({data['inserted']} nouveaux, "
+                                 f"{data['updated']} modifiés, {data['unchanged']} inchangés)")
+                elif event_type == 'window_failed':
+                    status.write(f"⚠️ Fenêtre en échec {data['date_from']} → {data['date_to']}: "
+                                 f"{data['error']}")
+
+            # Pipeline: chaque fenêtre est sauvegardée dès sa réception
             saved_count = 0
-            if matches and save_to_db:
-                status.write("💾 Sauvegarde dans la base de données...")
-                saved_count = db.save_matches_batch(matches)
-                db.log_scraping(championship, date_from, date_to, saved_count, 'success')
+            write_counts = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+            failed_windows = []
+            matches = []
+            if job_id is not None:
+                job_summary = jobs.run(job_id, on_event=on_event)
+                saved_count = job_summary['saved_count']
+                write_counts = job_summary['write_counts']
+                failed_windows = job_summary['failed_windows']
+            elif batches is not None:
+                summary = IngestPipeline(db if save_to_db else None, on_event=on_event).run(
+                    championship, batches, collect=not save_to_db
+                )
+                saved_count = summary['saved_count']
+                write_counts = summary['write_counts']
+                failed_windows = summary['failed_windows']
+                matches = summary['matches']
+
+            if save_to_db:
+                # Affichage relu depuis la base (taille bornée quelle que soit la période)
+                matches = db.get_matches(championship=championship, date_from=date_from,
+                                         date_to=f"{date_to}T23:59:59Z", limit=1000,
+                                         columns=MATCH_VIEW_COLUMNS)
 
             # 2. Récupération du classement
             status.write("📊 Récupération du classement...")
@@ -151,6 +214,11 @@ def scrape_data(championship, date_from, date_to, save_to_db=True):
             if standings:
                 db.save_standings(championship, standings)
 
+            # Équipes et effectifs: un seul appel par championnat, au premier scraping
+            if save_to_db and not db.get_teams(championship):
+                status.write("👥 Préchargement des équipes...")
+                scraper.prefetch_teams(championship)
+
             # 3. Résumé
             status.write("✅ Scraping terminé!")
 
@@ -158,6 +226,8 @@ def scrape_data(championship, date_from, date_to, save_to_db=True):
                 'matches': matches,
                 'standings': standings,
                 'saved_count': saved_count,
+                'write_counts': write_counts,
+                'failed_windows': failed_windows,
                 'success': True
             }
 
@@ -184,7 +254,7 @@ if page == "🏠 Dashboard":
     with col2:
         try:
             # Charger quelques matches pour compter les équipes
-            matches = db.get_matches(limit=100)
+            matches = db.get_matches(limit=100, columns=MATCH_VIEW_COLUMNS)
             teams = set()
             for match in matches:
                 teams.add(match.get('home_team', ''))
@@ -195,7 +265,7 @@ if page == "🏠 Dashboard":
 
     with col3:
         try:
-            matches = db.get_matches(limit=100)
+            matches = db.get_matches(limit=100, columns=MATCH_VIEW_COLUMNS)
             finished = sum(1 for m in matches if m.get('status') == 'finished')
             st.metric("Matches Terminés", finished)
         except:
@@ -203,7 +273,7 @@ if page == "🏠 Dashboard":
 
     with col4:
         try:
-            matches = db.get_matches(limit=100)
+            matches = db.get_matches(limit=100, columns=MATCH_VIEW_COLUMNS)
             goals = 0
             for match in matches:
                 if match.get('status') == 'finished':
@@ -236,7 +306,7 @@ if page == "🏠 Dashboard":
     with col2:
         st.subheader("📈 Derniers matches")
         try:
-            matches = db.get_matches(limit=10)
+            matches = db.get_matches(limit=10, columns=MATCH_VIEW_COLUMNS)
             if matches:
                 df = pd.DataFrame(matches)
                 if not df.empty:
@@ -269,6 +339,8 @@ elif page == "📥 Scraping":
 
         save_to_db = st.checkbox("💾 Sauvegarder dans la base de données", value=True)
 
+        incremental = st.checkbox("⚡ Ignorer les périodes déjà scrapées", value=True)
+
         # Nouveau checkbox pour afficher les données
         display_data = st.checkbox("👁️ Afficher les données scrapées", value=False)
 
@@ -286,7 +358,8 @@ elif page == "📥 Scraping":
                     championship,
                     date_from.strftime('%Y-%m-%d'),
                     date_to.strftime('%Y-%m-%d'),
-                    save_to_db
+                    save_to_db,
+                    incremental
                 )
 
                 if result['success']:
@@ -299,7 +372,10 @@ elif page == "📥 Scraping":
 
                         st.info(f"📊 {len(result['matches'])} matches récupérés")
                         if 'saved_count' in result:
-                            st.info(f"💾 {result['saved_count']} matches sauvegardés")
+                            write_counts = result['write_counts']
+                            st.info(f"💾 {result['saved_count']} matches sauvegardés "
+                                    f"({write_counts['inserted']} nouveaux, {write_counts['updated']} modifiés, "
+                                    f"{write_counts['unchanged']} inchangés)")
 
                         # Si display_data est coché, afficher directement
                         if display_data:
@@ -318,7 +394,8 @@ elif page == "📥 Scraping":
                     championship,
                     date_from.strftime('%Y-%m-%d'),
                     date_to.strftime('%Y-%m-%d'),
-                    save_to_db
+                    save_to_db,
+                    incremental
                 )
 
                 if result['success']:
@@ -332,11 +409,9 @@ elif page == "📥 Scraping":
 
         with col3:
             if st.button("🏆 Saison complète", use_container_width=True):
-                current_year = datetime.now().year
-                date_from = f"{current_year}-08-01"
-                date_to = f"{current_year + 1}-05-31"
-
-                result = scrape_data(championship, date_from, date_to, save_to_db)
+                # Saison en cours selon l'API (pas l'année civile)
+                season_year = scraper.get_current_season_year(championship)
+                result = scrape_data(championship, save_to_db=save_to_db, season_year=season_year)
 
                 if result['success']:
                     st.success(f"✅ Scraping saison complète réussi!")
@@ -491,7 +566,7 @@ elif page == "📥 Scraping":
         with col2:
             if st.button("🔄 Charger depuis DB", type="secondary"):
                 with st.spinner("Chargement..."):
-                    matches = db.get_matches(championship=championship, limit=100)
+                    matches = db.get_matches(championship=championship, limit=100, columns=MATCH_VIEW_COLUMNS)
                     standings = db.get_standings(championship)
                     st.success(f"✅ {len(matches)} matches chargés depuis la base")
 
@@ -499,6 +574,43 @@ elif page == "📥 Scraping":
                     st.session_state['current_matches'] = matches
                     st.session_state['current_standings'] = standings
 
+    # Télémétrie des appels API (depuis le démarrage de l'application)
+    with st.expander("📡 Télémétrie API"):
+        metrics = scraper.metrics.snapshot()
+
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Requêtes", metrics['requests'])
+        col2.metric("Tentatives supplémentaires", metrics['retries'])
+        col3.metric("Attente quota", f"{metrics['rate_limit_wait_seconds']:.1f}s")
+        col4.metric("Parsing", f"{metrics['parse_seconds']:.2f}s")
+
+        if metrics['endpoints']:
+            st.dataframe(pd.DataFrame([
+                {
+                    'Endpoint': endpoint,
+                    'Requêtes': stats['requests'],
+                    'Cache': stats['cache_hits'] + stats['revalidated'],
+                    'p50 (s)': stats['latency']['p50'],
+                    'p95 (s)': stats['latency']['p95'],
+                    'p99 (s)': stats['latency']['p99'],
+                    'Ko reçus': round(stats['bytes'] / 1024, 1),
+                    'Tentatives': sum(stats['retries'].values())
+                }
+                for endpoint, stats in metrics['endpoints'].items()
+            ]), use_container_width=True, hide_index=True)
+
+        for label, quota in metrics['quota'].items():
+            st.caption(f"🔑 {label}: {quota.get('available', '?')} requêtes restantes, "
+                       f"réinitialisation dans {quota.get('reset', '?')}s")
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("📥 Export JSON", data=scraper.metrics.to_json(),
+                               file_name="scraper_metrics.json", mime="application/json")
+        with col2:
+            st.download_button("📥 Export Prometheus", data=scraper.metrics.to_prometheus(),
+                               file_name="scraper_metrics.prom", mime="text/plain")
+
 # Page Matches
 elif page == "⚽ Matches":
     st.markdown("<h1 class='main-header'>⚽ Matches</h1>", unsafe_allow_html=True)
@@ -527,7 +639,8 @@ elif page == "⚽ Matches":
                 championship=championship,
                 date_from=filter_date.strftime('%Y-%m-%d'),
                 date_to=filter_date.strftime('%Y-%m-%d'),
-                limit=limit
+                limit=limit,
+                columns=MATCH_VIEW_COLUMNS
             )
 
             if filter_status != "Tous":
@@ -537,7 +650,7 @@ elif page == "⚽ Matches":
 
     with col2:
         if st.button("🔄 Tous les matches", use_container_width=True):
-            matches = db.get_matches(championship=championship, limit=limit)
+            matches = db.get_matches(championship=championship, limit=limit, columns=MATCH_VIEW_COLUMNS)
             st.session_state['current_matches'] = matches
 
     # Affichage des matches
@@ -594,6 +707,52 @@ elif page == "⚽ Matches":
     else:
         st.info("👆 Utilisez les boutons pour charger des matches")
 
+# Page Live
+elif page == "🔴 Live":
+    st.markdown("<h1 class='main-header'>🔴 Matches en direct</h1>", unsafe_allow_html=True)
+
+    live_poller = get_live_poller()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        refresh_live = st.button("🔄 Actualiser le direct", type="primary", use_container_width=True)
+    with col2:
+        auto_refresh = st.checkbox(f"Actualisation automatique ({Config.LIVE_POLL_INTERVAL}s)")
+
+    if refresh_live or auto_refresh:
+        try:
+            # Une requête pour tous les championnats; événements enregistrés en base
+            live_poller.poll_once()
+        except Exception as e:
+            st.error(f"❌ Erreur suivi live: {e}")
+
+    live_matches = [snapshot['match'] for snapshot in live_poller.state.values()]
+    if live_matches:
+        live_df = pd.DataFrame([{
+            'Championnat': match.get('competition'),
+            'Domicile': match.get('home_team'),
+            'Score': f"{match.get('home_score')} - {match.get('away_score')}",
+            'Extérieur': match.get('away_team'),
+            'Statut': (match.get('raw_data') or {}).get('status', match.get('status'))
+        } for match in live_matches])
+        st.dataframe(live_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("Aucun match en cours")
+
+    st.subheader("📜 Derniers événements")
+    events = db.get_match_events(limit=30)
+    if events:
+        events_df = pd.DataFrame(events)[['created_at', 'championship', 'event_type',
+                                          'home_score', 'away_score', 'status']]
+        events_df.columns = ['Heure', 'Championnat', 'Événement', 'Dom.', 'Ext.', 'Statut']
+        st.dataframe(events_df, use_container_width=True, hide_index=True)
+    else:
+        st.caption("Aucun événement enregistré")
+
+    if auto_refresh:
+        time.sleep(Config.LIVE_POLL_INTERVAL)
+        st.rerun()
+
 # Page Classement
 elif page == "📈 Classement":
     st.markdown("<h1 class='main-header'>📈 Classement</h1>", unsafe_allow_html=True)
@@ -665,7 +824,7 @@ elif page == "📊 Statistiques":
 
         try:
             # Charger les matches
-            matches = db.get_matches(championship=championship, limit=500)
+            matches = db.get_matches(championship=championship, limit=500, columns=MATCH_VIEW_COLUMNS)
 
             if matches:
                 # Calculer les statistiques
@@ -741,7 +900,7 @@ elif page == "📊 Statistiques":
         st.subheader("👥 Statistiques par Équipe")
 
         try:
-            matches = db.get_matches(championship=championship, limit=500)
+            matches = db.get_matches(championship=championship, limit=500, columns=MATCH_VIEW_COLUMNS)
 
             if matches:
                 # Collecter toutes les équipes
@@ -848,7 +1007,7 @@ elif page == "📊 Statistiques":
         st.subheader("📅 Statistiques Temporelles")
 
         try:
-            matches = db.get_matches(championship=championship, limit=500)
+            matches = db.get_matches(championship=championship, limit=500, columns=MATCH_VIEW_COLUMNS)
 
             if matches:
                 # Buts par journée
@@ -965,7 +1124,7 @@ elif page == "🔍 Recherche":
         if st.button("🔍 Lancer la recherche", type="primary", use_container_width=True):
             with st.spinner("Recherche en cours..."):
                 # Récupérer tous les matches
-                matches = db.get_matches(championship=championship, limit=500)
+                matches = db.get_matches(championship=championship, limit=500, columns=MATCH_VIEW_COLUMNS)
 
                 # Appliquer les filtres
                 filtered_matches = []
@@ -1081,7 +1240,8 @@ elif page == "💾 Export":
             with st.spinner("Préparation de l'export..."):
                 try:
                     # Récupérer les données
-                    matches = db.get_matches(championship=championship, limit=export_limit)
+                    matches = db.get_matches(championship=championship, limit=export_limit,
+                                             columns=MATCH_VIEW_COLUMNS)
 
                     if matches:
                         # Convertir en DataFrame
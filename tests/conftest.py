@@ -0,0 +1,60 @@
+# conftest.py
+import os
+import sys
+
+import pytest
+
+# Les modules de core/ s'importent à plat (from config import Config)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
+
+from config import Config  # noqa: E402
+from database import FootballDatabase  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = FootballDatabase(str(tmp_path / 'football_test.db'))
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def make_match():
+    """Match tel que produit par FootballAPIScraper._parse_matches"""
+
+    def make(match_id, home_score=None, status='scheduled', **fields):
+        match = {
+            'id': str(match_id),
+            'api_id': int(match_id),
+            'competition': 'Ligue 1',
+            'date': f"2025-01-{1 + int(match_id) % 28:02d}T20:00:00Z",
+            'home_team': 'Paris Saint-Germain',
+            'away_team': 'Olympique de Marseille',
+            'home_score': home_score,
+            'away_score': None,
+            'status': status,
+            'matchday': 1 + int(match_id) % 38,
+            'venue': 'Parc des Princes',
+            'referee': 'Clément Turpin',
+            'raw_data': {
+                'id': int(match_id),
+                'homeTeam': {'id': 524, 'name': 'Paris Saint-Germain FC'},
+                'awayTeam': {'id': 516, 'name': 'Olympique de Marseille'},
+                'score': {'fullTime': {'home': home_score, 'away': None}},
+                'referees': [{'name': 'Clément Turpin', 'nationality': 'France'}]
+            }
+        }
+        match.update(fields)
+        return match
+
+    return make
+
+
+@pytest.fixture
+def offline_config(tmp_path, monkeypatch):
+    """Config d'un FootballAPIScraper sans fichier partagé ni archive"""
+    monkeypatch.setattr(Config, 'CACHE_DB_PATH', str(tmp_path / 'api_cache_test.db'))
+    monkeypatch.setattr(Config, 'ARCHIVE_ENABLED', False)
+    monkeypatch.setattr(Config, 'METRICS_EXPORT_PATH', None)
+    monkeypatch.setattr(Config, 'FOOTBALL_DATA_API_KEYS', ['test-key'])
+    return Config
@@ -0,0 +1,96 @@
+# test_api_keys.py
+import time
+
+import pytest
+
+from config import Config
+from emulator import FootballDataEmulator
+from scraper import FootballAPIScraper
+
+
+@pytest.fixture
+def emulator():
+    server = FootballDataEmulator(requests_per_minute=3, api_keys=['key-a', 'key-b'])
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_scraper(offline_config, emulator, monkeypatch):
+    """Scraper pointé sur l'émulateur, avec le pool de clés donné"""
+    monkeypatch.setattr(Config, 'FOOTBALL_DATA_URL', emulator.base_url)
+    monkeypatch.setattr(Config, 'MAX_REQUESTS_PER_MINUTE', emulator.requests_per_minute)
+
+    def make(keys):
+        monkeypatch.setattr(Config, 'FOOTBALL_DATA_API_KEYS', keys)
+        return FootballAPIScraper()
+
+    return make
+
+
+def competition_url(scraper):
+    return f"{scraper.base_url}/competitions/PL"
+
+
+def key_stats(scraper):
+    return {stats['key']: stats for stats in scraper.key_pool.get_stats()}
+
+
+def test_requests_spread_over_keys_with_headroom(emulator, make_scraper):
+    scraper = make_scraper(['key-a', 'key-b'])
+
+    statuses = [scraper._get(competition_url(scraper)).status_code for _ in range(6)]
+
+    # Quota de 3 par clé: les 6 requêtes passent sans un seul 429
+    assert statuses == [200] * 6
+    assert emulator.get_stats()['throttled'] == 0
+    assert {key: window.count for key, window in emulator._quota.items()} == {'key-a': 3, 'key-b': 3}
+
+
+def test_429_blocks_only_the_exhausted_key(emulator, make_scraper):
+    scraper = make_scraper(['key-a', 'key-b'])
+    # Quota de key-a consommé par un autre client
+    for _ in range(3):
+        emulator._consume_quota('key-a')
+
+    response = scraper._get(competition_url(scraper))
+
+    assert response.status_code == 200
+    assert emulator.get_stats()['throttled'] == 1
+    key_a, key_b = scraper.key_pool.keys
+    assert key_a.is_active() and key_b.is_active()
+    # key-a attend la réinitialisation annoncée, key-b garde son quota
+    assert key_a.rate_limiter.tokens == 0 and key_a.rate_limiter.reset_at is not None
+    assert key_b.rate_limiter.tokens == 2
+    assert scraper.key_pool.reserve()[0] is key_b
+
+
+def test_403_removes_key_from_rotation(emulator, make_scraper, monkeypatch):
+    monkeypatch.setattr(Config, 'API_KEY_DISABLE_SECONDS', 120)
+    scraper = make_scraper(['key-revoked', 'key-a'])
+
+    response = scraper._get(competition_url(scraper))
+
+    assert response.status_code == 200
+    revoked, valid = scraper.key_pool.keys
+    assert not revoked.is_active()
+    assert 119 < revoked.disabled_until - time.monotonic() <= 120
+    assert scraper.key_pool.active_keys() == [valid]
+    assert key_stats(scraper)[revoked.label]['disabled_reason']
+
+    # Les requêtes suivantes ne partent plus sur la clé retirée
+    assert scraper._get(competition_url(scraper)).status_code == 200
+    statuses = emulator.get_stats()['endpoints']['/competitions/{id}']['status']
+    assert statuses == {403: 1, 200: 2}
+
+
+def test_403_on_every_key_is_a_restricted_resource(emulator, make_scraper):
+    emulator.api_keys = {'key-other'}
+    scraper = make_scraper(['key-a', 'key-b'])
+
+    response = scraper._get(competition_url(scraper))
+
+    # Deux clés refusées: c'est la ressource qui est restreinte, les clés restent en rotation
+    assert response.status_code == 403
+    assert len(scraper.key_pool.active_keys()) == 2
@@ -0,0 +1,60 @@
+# test_archive.py
+import json
+import os
+import threading
+
+import pytest
+
+from archive import PayloadArchive
+from scraper import FootballAPIScraper
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return PayloadArchive(str(tmp_path / 'archive'))
+
+
+def standings_payload(season_year):
+    return {
+        'filters': {'season': str(season_year)},
+        'competition': {'id': 2015, 'code': 'FL1'},
+        'season': {'startDate': f"{season_year}-08-16"},
+        'standings': [{'type': 'TOTAL', 'table': [
+            {'position': 1, 'team': {'id': 524, 'name': 'Paris SG'}, 'playedGames': 34, 'points': 80},
+        ]}],
+    }
+
+
+def test_concurrent_stores_of_one_payload_share_one_object(archive):
+    content = json.dumps(standings_payload(2023)).encode()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def store():
+        barrier.wait()
+        results.append(archive.store('/competitions/{id}/standings', 'url', {}, content))
+
+    threads = [threading.Thread(target=store) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(results)) == 1 and None not in results
+    object_dir = os.path.dirname(archive._object_path(results[0]))
+    assert os.listdir(object_dir) == [results[0]]
+    assert archive.load(results[0]) == content
+
+
+def test_reparse_saves_standings_under_the_archived_season(archive, db, offline_config):
+    for season_year in (2022, 2023):
+        archive.store('/competitions/{id}/standings', 'url', {'season': season_year},
+                      json.dumps(standings_payload(season_year)).encode())
+
+    counts = archive.reparse(FootballAPIScraper(db), db, ['/competitions/{id}/standings'])
+
+    conn = db.get_connection()
+    seasons = [row[0] for row in conn.execute("SELECT season FROM standings ORDER BY season")]
+    conn.close()
+    assert counts['standings'] == 2
+    assert seasons == ['2022', '2023']
@@ -0,0 +1,23 @@
+# test_bench.py
+import tempfile
+
+from config import Config
+from emulator import FootballDataEmulator, run_bench
+
+OVERRIDDEN = ('FOOTBALL_DATA_URL', 'FOOTBALL_DATA_API_KEYS', 'ARCHIVE_ENABLED', 'CACHE_DB_PATH',
+              'MAX_REQUESTS_PER_MINUTE', 'MAX_CONCURRENT_REQUESTS')
+
+
+def test_run_bench_restores_config_and_removes_cache_dir(offline_config, tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    before = {name: getattr(Config, name) for name in OVERRIDDEN}
+    emulator = FootballDataEmulator()
+    try:
+        results = run_bench(emulator, [1, 2], ['Ligue 1'], '2024-09-01', '2024-09-20')
+    finally:
+        emulator.stop()
+
+    assert [result['concurrency'] for result in results] == [1, 2]
+    assert all(result['matches'] and not result['failed_windows'] for result in results)
+    assert {name: getattr(Config, name) for name in OVERRIDDEN} == before
+    assert not list(tmp_path.glob('football_bench_*'))
@@ -0,0 +1,98 @@
+# test_circuit_breaker.py
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError
+from scraper import FootballAPIScraper
+
+
+def open_breaker(recovery_timeout=60.0):
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=recovery_timeout)
+    breaker.record_failure()
+    breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_threshold():
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=60.0)
+    assert breaker.before_call() is False
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_success_resets_failure_count():
+    breaker = CircuitBreaker('test', failure_threshold=2, recovery_timeout=60.0)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_trial():
+    breaker = open_breaker(recovery_timeout=0.0)
+
+    assert breaker.before_call() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_trial_success_closes():
+    breaker = open_breaker(recovery_timeout=0.0)
+    breaker.before_call()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.before_call() is False
+
+
+def test_trial_failure_reopens():
+    breaker = open_breaker(recovery_timeout=60.0)
+    breaker.opened_at = time.monotonic() - 61
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_release_trial_lets_next_call_try():
+    breaker = open_breaker(recovery_timeout=0.0)
+    breaker.before_call()
+
+    breaker.release_trial()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+
+
+def test_unexpected_error_releases_trial(offline_config, monkeypatch):
+    scraper = FootballAPIScraper()
+    url = f"{scraper.base_url}/competitions/PL/matches"
+    breaker = scraper._breaker_for(scraper._endpoint_name(url))
+    breaker.state = CircuitBreaker.OPEN
+    breaker.opened_at = time.monotonic() - breaker.recovery_timeout - 1
+
+    def broken_get(*args, **kwargs):
+        raise ValueError("URL invalide")
+
+    monkeypatch.setattr(scraper.session, 'get', broken_get)
+
+    with pytest.raises(ValueError):
+        scraper._get_uncoalesced(url)
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.before_call() is True
+    assert all(key.rate_limiter.in_flight == 0 for key in scraper.key_pool.keys)
@@ -0,0 +1,104 @@
+# test_coverage.py
+from datetime import date
+
+from coverage import CoveragePlanner, IntervalIndex
+
+
+def d(day, month=1):
+    return date(2025, month, day)
+
+
+class StubDatabase:
+    """Journal scraping_log et matches non terminés fixés par le test"""
+
+    def __init__(self, coverage=(), unfinished=()):
+        self.coverage = list(coverage)
+        self.unfinished = list(unfinished)
+
+    def get_scraping_coverage(self, championship):
+        return self.coverage
+
+    def get_unfinished_match_dates(self, championship, date_from, date_to):
+        return [day for day in self.unfinished if date_from <= day <= date_to]
+
+
+def test_add_merges_overlapping_and_adjacent_ranges():
+    index = IntervalIndex([(d(10), d(12)), (d(1), d(3))])
+
+    index.add(d(4), d(5))      # contiguë à la première
+    index.add(d(11), d(15))    # chevauche la seconde
+    index.add(d(20), d(20))
+
+    assert index.ranges == [(d(1), d(5)), (d(10), d(15)), (d(20), d(20))]
+
+
+def test_add_bridges_ranges_and_ignores_inverted():
+    index = IntervalIndex([(d(1), d(3)), (d(7), d(9))])
+
+    index.add(d(4), d(6))
+    index.add(d(12), d(11))
+
+    assert index.ranges == [(d(1), d(9))]
+
+
+def test_gaps_inside_and_around_ranges():
+    index = IntervalIndex([(d(5), d(7)), (d(10), d(12))])
+
+    assert index.gaps(d(1), d(15)) == [(d(1), d(4)), (d(8), d(9)), (d(13), d(15))]
+    assert index.gaps(d(5), d(12)) == [(d(8), d(9))]
+    assert index.gaps(d(6), d(6)) == []
+    assert IntervalIndex().gaps(d(1), d(2)) == [(d(1), d(2))]
+
+
+def test_gaps_ignore_ranges_outside_the_period():
+    index = IntervalIndex([(d(1), d(3)), (d(20), d(25))])
+
+    assert index.gaps(d(5), d(10)) == [(d(5), d(10))]
+    assert index.gaps(d(2), d(21)) == [(d(4), d(19))]
+
+
+def test_plan_fetches_only_uncovered_days():
+    planner = CoveragePlanner(StubDatabase(coverage=[('2025-01-01', '2025-01-10'), ('2025-01-16', '2025-01-20')]))
+
+    ranges = planner.plan('Ligue 1', '2025-01-01', '2025-01-31', today=d(1, 6))
+
+    assert ranges == [('2025-01-11', '2025-01-15'), ('2025-01-21', '2025-01-31')]
+
+
+def test_plan_merges_adjacent_logged_windows():
+    planner = CoveragePlanner(StubDatabase(coverage=[('2025-01-01', '2025-01-07'), ('2025-01-08', '2025-01-14')]))
+
+    assert planner.plan('Ligue 1', '2025-01-01', '2025-01-14', today=d(1, 6)) == []
+
+
+def test_plan_refetches_days_with_unfinished_matches():
+    planner = CoveragePlanner(StubDatabase(coverage=[('2025-01-01', '2025-01-31')],
+                                           unfinished=['2025-01-05', '2025-01-06', '2025-01-20']))
+
+    ranges = planner.plan('Ligue 1', '2025-01-01', '2025-01-31', today=d(1, 6))
+
+    assert ranges == [('2025-01-05', '2025-01-06'), ('2025-01-20', '2025-01-20')]
+
+
+def test_plan_always_refetches_from_yesterday():
+    planner = CoveragePlanner(StubDatabase(coverage=[('2025-01-01', '2025-01-31')]))
+
+    ranges = planner.plan('Ligue 1', '2025-01-01', '2025-01-31', today=d(20))
+
+    assert ranges == [('2025-01-19', '2025-01-31')]
+
+
+def test_plan_recent_tail_clipped_to_period():
+    covered = StubDatabase(coverage=[('2025-01-01', '2025-01-31')])
+
+    # Période entièrement récente: tout est récupéré
+    assert CoveragePlanner(covered).plan('Ligue 1', '2025-01-10', '2025-01-15', today=d(5)) == \
+        [('2025-01-10', '2025-01-15')]
+    # Période passée: pas de queue récente
+    assert CoveragePlanner(covered).plan('Ligue 1', '2025-01-10', '2025-01-15', today=d(20)) == []
+
+
+def test_plan_ignores_malformed_log_rows():
+    planner = CoveragePlanner(StubDatabase(coverage=[(None, '2025-01-05'), ('2025-01-01', '2025-01-05')]))
+
+    assert planner.plan('Ligue 1', '2025-01-01', '2025-01-10', today=d(1, 6)) == [('2025-01-06', '2025-01-10')]
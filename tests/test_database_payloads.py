@@ -0,0 +1,101 @@
+# test_database_payloads.py
+import json
+
+from config import Config
+from database import (compress_payload, decompress_payload, payload_compressor, payload_json,
+                      sample_prefix_dictionary)
+
+
+def stored_payloads(db):
+    conn = db.get_connection()
+    rows = conn.execute("SELECT match_id, dictionary_id FROM match_payloads ORDER BY match_id").fetchall()
+    conn.close()
+    return dict(rows)
+
+
+def test_sample_prefix_dictionary_keeps_the_tail():
+    samples = [b'a' * 10, b'b' * 10, b'c' * 10]
+
+    assert sample_prefix_dictionary(samples, size=15) == b'b' * 5 + b'c' * 10
+    assert sample_prefix_dictionary(samples, size=100) == b''.join(samples)
+
+
+def test_compress_round_trip_with_and_without_dictionary(make_match):
+    payload = make_match(7)['raw_data']
+    data = payload_json(payload)
+    zdict = sample_prefix_dictionary([payload_json(make_match(i)['raw_data']) for i in range(20)])
+
+    plain = compress_payload(data, payload_compressor())
+    primed = compress_payload(data, payload_compressor(zdict))
+
+    assert decompress_payload(plain) == payload
+    assert decompress_payload(primed, zdict) == payload
+    assert len(primed) < len(plain)
+
+
+def test_compressor_template_is_reusable(make_match):
+    compressor = payload_compressor()
+    first, second = make_match(1)['raw_data'], make_match(2)['raw_data']
+
+    assert decompress_payload(compress_payload(payload_json(first), compressor)) == first
+    assert decompress_payload(compress_payload(payload_json(second), compressor)) == second
+
+
+def test_small_batch_stored_without_dictionary(db, make_match):
+    db.upsert_matches([make_match(i) for i in range(1, 4)])
+
+    assert set(stored_payloads(db).values()) == {None}
+    assert db.get_match_payload('2') == make_match(2)['raw_data']
+
+
+def test_dictionary_built_from_first_large_batch(db, make_match):
+    count = Config.DB_PAYLOAD_ZDICT_MIN_SAMPLES
+    matches = [make_match(i) for i in range(1, count + 1)]
+
+    db.upsert_matches(matches)
+
+    dictionary_ids = set(stored_payloads(db).values())
+    assert len(dictionary_ids) == 1 and None not in dictionary_ids
+    for match in matches[::10]:
+        assert db.get_match_payload(match['id']) == match['raw_data']
+
+
+def test_updated_payload_round_trip(db, make_match):
+    db.upsert_matches([make_match(i) for i in range(1, Config.DB_PAYLOAD_ZDICT_MIN_SAMPLES + 1)])
+
+    db.upsert_matches([make_match(3, home_score=4)])
+
+    assert db.get_match_payload('3')['score']['fullTime']['home'] == 4
+
+
+def test_dictionary_committed_apart_from_caller(db, make_match):
+    samples = [payload_json(make_match(i)['raw_data']) for i in range(Config.DB_PAYLOAD_ZDICT_MIN_SAMPLES)]
+    conn = db.get_connection()
+
+    dictionary_id, zdict = db._current_payload_dictionary(conn, samples)
+    assert not conn.in_transaction
+    conn.rollback()
+    conn.close()
+
+    conn = db.get_connection()
+    stored = conn.execute("SELECT data FROM payload_dictionaries WHERE id = ?", (dictionary_id,)).fetchone()
+    conn.close()
+    assert bytes(stored[0]) == zdict
+
+
+def test_compact_migrates_legacy_rows(db, make_match):
+    match = make_match(1)
+    db.upsert_matches([match])
+    conn = db.get_connection()
+    # Ancienne ligne: payload imbriqué dans matches.raw_data, rien dans match_payloads
+    conn.execute("UPDATE matches SET raw_data = ? WHERE match_id = '1'", (json.dumps(match),))
+    conn.execute("DELETE FROM match_payloads")
+    conn.commit()
+    conn.close()
+    assert db.get_match_payload('1') == match['raw_data']
+
+    result = db.compact_payloads(vacuum=False)
+
+    assert result['migrated'] == 1
+    assert stored_payloads(db) == {'1': None}
+    assert db.get_match_payload('1') == match['raw_data']
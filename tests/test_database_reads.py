@@ -0,0 +1,101 @@
+# test_database_reads.py
+import json
+
+from database import LazyMatch, MATCH_VIEW_COLUMNS
+
+
+def test_lazy_match_decodes_fields_on_first_miss():
+    match = LazyMatch({'match_id': '1', 'home_team': 'PSG'},
+                      json.dumps({'home_team': 'ignoré', 'api_id': 1, 'half_time_home': 2}))
+
+    assert dict(match) == {'match_id': '1', 'home_team': 'PSG'}
+    assert match['api_id'] == 1
+    # Les colonnes priment sur les champs décodés
+    assert match['home_team'] == 'PSG'
+    assert 'half_time_home' in match
+    assert match.get('absent', 'défaut') == 'défaut'
+
+
+def test_lazy_match_loads_payload_once():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {'id': 1}
+
+    match = LazyMatch({'match_id': '1'}, json.dumps({'api_id': 1}), loader)
+
+    assert match['api_id'] == 1
+    assert calls == []
+    assert match['raw_data'] == {'id': 1}
+    assert match.get('raw_data') == {'id': 1}
+    assert calls == [1]
+
+
+def test_lazy_match_tolerates_bad_json():
+    match = LazyMatch({'match_id': '1'}, '{pas du json')
+
+    assert match.get('api_id') is None
+    assert match['match_id'] == '1'
+
+
+def test_get_matches_default_is_lazy(db, make_match):
+    match = make_match(5)
+    db.upsert_matches([match])
+
+    loaded = db.get_matches(limit=10)[0]
+
+    assert isinstance(loaded, LazyMatch)
+    assert loaded['id'] == '5'
+    assert loaded['championship'] == 'Ligue 1'
+    assert loaded['api_id'] == 5
+    assert loaded['raw_data'] == match['raw_data']
+
+
+def test_projection_returns_plain_dicts(db, make_match):
+    db.upsert_matches([make_match(1), make_match(2)])
+
+    loaded = db.get_matches(limit=10, columns=['id', 'home_team'])
+
+    assert all(type(match) is dict for match in loaded)
+    assert sorted(match['id'] for match in loaded) == ['1', '2']
+    assert set(loaded[0]) == {'id', 'home_team'}
+
+
+def test_view_columns_projection(db, make_match):
+    db.upsert_matches([make_match(1)])
+
+    loaded = db.get_matches(limit=10, columns=MATCH_VIEW_COLUMNS)[0]
+
+    assert list(loaded) == MATCH_VIEW_COLUMNS
+    assert loaded['match_id'] == '1'
+
+
+def test_projection_rejects_unknown_columns(db, make_match):
+    db.upsert_matches([make_match(1)])
+
+    assert db.get_matches(columns=['raw_data']) == []
+
+
+def test_with_raw_decodes_everything(db, make_match):
+    match = make_match(3)
+    db.upsert_matches([match])
+
+    loaded = db.get_matches(limit=10, with_raw=True)[0]
+    projected = db.get_matches(limit=10, columns=['id'], with_raw=True)[0]
+
+    assert type(loaded) is dict
+    assert loaded['id'] == '3'
+    assert loaded['api_id'] == 3
+    assert loaded['raw_data'] == match['raw_data']
+    assert projected == {'id': '3', 'raw_data': match['raw_data']}
+
+
+def test_filters_and_order(db, make_match):
+    db.upsert_matches([make_match(i) for i in range(1, 6)])
+
+    loaded = db.get_matches(championship='Ligue 1', date_from='2025-01-03', date_to='2025-01-05T23:59:59Z',
+                            columns=['id', 'date'])
+
+    assert [match['id'] for match in loaded] == ['4', '3', '2']
+    assert db.get_matches(championship='Serie A') == []
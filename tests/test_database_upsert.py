@@ -0,0 +1,55 @@
+# test_database_upsert.py
+from config import Config
+
+
+def test_counts_inserted_then_unchanged(db, make_match):
+    matches = [make_match(i) for i in range(1, 4)]
+
+    assert db.upsert_matches(matches) == {'inserted': 3, 'updated': 0, 'unchanged': 0, 'errors': 0}
+    assert db.upsert_matches(matches) == {'inserted': 0, 'updated': 0, 'unchanged': 3, 'errors': 0}
+
+
+def test_counts_mixed_batch(db, make_match):
+    db.upsert_matches([make_match(i) for i in range(1, 4)])
+
+    batch = [make_match(1), make_match(2, home_score=2, status='finished'), make_match(3), make_match(4)]
+
+    assert db.upsert_matches(batch) == {'inserted': 1, 'updated': 1, 'unchanged': 2, 'errors': 0}
+    stored = {match['match_id']: match for match in db.get_matches(limit=10)}
+    assert stored['2']['home_score'] == 2
+    assert stored['2']['status'] == 'finished'
+
+
+def test_update_keeps_row_and_created_at(db, make_match):
+    db.upsert_matches([make_match(1)])
+    conn = db.get_connection()
+    before = conn.execute("SELECT id, created_at FROM matches WHERE match_id = '1'").fetchone()
+    conn.close()
+
+    db.upsert_matches([make_match(1, home_score=1)])
+
+    conn = db.get_connection()
+    after = conn.execute("SELECT id, created_at FROM matches WHERE match_id = '1'").fetchone()
+    conn.close()
+    assert after == before
+
+
+def test_duplicates_in_batch_keep_last_version(db, make_match):
+    counts = db.upsert_matches([make_match(1), make_match(1, home_score=3)])
+
+    assert counts == {'inserted': 1, 'updated': 0, 'unchanged': 0, 'errors': 0}
+    assert db.get_matches(limit=10)[0]['home_score'] == 3
+
+
+def test_counts_across_chunks(db, make_match, monkeypatch):
+    monkeypatch.setattr(Config, 'DB_UPSERT_CHUNK_SIZE', 2)
+    db.upsert_matches([make_match(i) for i in range(1, 4)])
+
+    batch = [make_match(i, home_score=1 if i % 2 else None) for i in range(1, 6)]
+
+    assert db.upsert_matches(batch) == {'inserted': 2, 'updated': 2, 'unchanged': 1, 'errors': 0}
+
+
+def test_save_helpers_report_upsert_counts(db, make_match):
+    assert db.save_match(make_match(1)) is True
+    assert db.save_matches_batch([make_match(1), make_match(2)]) == 2
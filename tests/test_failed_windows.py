@@ -0,0 +1,63 @@
+# test_failed_windows.py
+import threading
+
+import pytest
+
+from scraper import FootballAPIScraper
+
+WINDOWS = [('2025-01-01', '2025-01-07'), ('2025-01-08', '2025-01-14'), ('2025-01-15', '2025-01-21')]
+
+
+@pytest.fixture
+def scraper(offline_config):
+    return FootballAPIScraper()
+
+
+def failing_on(date_from_failing):
+    def fetch(date_from, date_to):
+        if date_from == date_from_failing:
+            raise RuntimeError(f"échec {date_from}")
+        return [{'id': date_from}]
+    return fetch
+
+
+def failed(batches):
+    return [(batch.date_from, batch.error) for batch in batches if batch.error]
+
+
+def test_interleaved_calls_keep_their_own_failures(scraper):
+    first = scraper._fetch_windows(failing_on('2025-01-01'), WINDOWS, 'Ligue 1', concurrent=False)
+    second = scraper._fetch_windows(failing_on('2025-01-15'), WINDOWS, 'Serie A', concurrent=False)
+
+    first_batches, second_batches = [], []
+    for first_batch, second_batch in zip(first, second):
+        first_batches.append(first_batch)
+        second_batches.append(second_batch)
+
+    assert failed(first_batches) == [('2025-01-01', 'échec 2025-01-01')]
+    assert failed(second_batches) == [('2025-01-15', 'échec 2025-01-15')]
+    assert not hasattr(scraper, 'last_failed_windows')
+
+
+def test_concurrent_threads_keep_their_own_failures(scraper):
+    results = {}
+
+    def run(name, failing):
+        results[name] = failed(scraper._fetch_windows(failing_on(failing), WINDOWS, name, concurrent=False))
+
+    threads = [threading.Thread(target=run, args=(date_from, date_from)) for date_from, _ in WINDOWS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {date_from: [(date_from, f"échec {date_from}")] for date_from, _ in WINDOWS}
+
+
+def test_failure_report_lists_given_failures():
+    failures = [{'championship': 'Ligue 1', 'date_from': '2025-01-01', 'date_to': '2025-01-07',
+                 'error': '429'}]
+
+    assert FootballAPIScraper.get_failure_report([]) == "Aucune fenêtre en échec"
+    assert FootballAPIScraper.get_failure_report(failures) == (
+        "1 fenêtre(s) en échec:\n  • Ligue 1 2025-01-01 → 2025-01-07: 429")
@@ -0,0 +1,41 @@
+# test_http_cache.py
+import pytest
+
+from http_cache import HTTPCache, CachedResponse
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HTTPCache(str(tmp_path / 'api_cache.db'), max_entries=2)
+
+
+def response(body):
+    return CachedResponse('url', body.encode(), {'ETag': f'"{body}"'})
+
+
+def test_memory_keeps_only_the_most_recently_used_entries(cache):
+    for name in ('a', 'b', 'c'):
+        cache.store(f"https://api/{name}", None, response(name), ttl=60)
+
+    assert list(cache._memory) == [cache.make_key('https://api/b'), cache.make_key('https://api/c')]
+
+
+def test_get_refreshes_recency(cache):
+    cache.store('https://api/a', None, response('a'), ttl=60)
+    cache.store('https://api/b', None, response('b'), ttl=60)
+    cache.get('https://api/a')
+    cache.store('https://api/c', None, response('c'), ttl=60)
+
+    assert cache.make_key('https://api/a') in cache._memory
+    assert cache.make_key('https://api/b') not in cache._memory
+
+
+def test_evicted_entry_is_read_back_from_disk(cache):
+    for name in ('a', 'b', 'c'):
+        cache.store(f"https://api/{name}", None, response(name), ttl=60)
+
+    entry = cache.get('https://api/a')
+
+    assert entry.content == b'a'
+    assert entry.validators() == {'If-None-Match': '"a"'}
+    assert len(cache._memory) == 2
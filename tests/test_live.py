@@ -0,0 +1,124 @@
+# test_live.py
+import json
+
+import pytest
+
+from live import LivePoller
+
+
+class StubScraper:
+    """Réponses /matches?status=LIVE successives et relecture des matches terminés"""
+
+    def __init__(self, live_cycles, ended=None, fail_ended=False):
+        self.live_cycles = list(live_cycles)
+        self.ended = ended or {}
+        self.fail_ended = fail_ended
+        self.requested_ids = []
+
+    def get_live_matches(self, championships=None):
+        return self.live_cycles.pop(0)
+
+    def get_matches_by_ids(self, match_ids):
+        self.requested_ids.append(list(match_ids))
+        if self.fail_ended:
+            raise ConnectionError("API indisponible")
+        return [self.ended[match_id] for match_id in match_ids if match_id in self.ended]
+
+
+@pytest.fixture
+def live_match(make_match):
+    def make(match_id, home_score, away_score, api_status='IN_PLAY'):
+        match = make_match(match_id, home_score=home_score,
+                           status='finished' if api_status == 'FINISHED' else 'live')
+        match['away_score'] = away_score
+        match['raw_data'] = dict(match['raw_data'], status=api_status)
+        return match
+    return make
+
+
+def event_types(events):
+    return sorted((event['match_id'], event['event_type']) for event in events)
+
+
+def test_two_cycles_emit_score_change_and_ended(db, live_match):
+    scraper = StubScraper(
+        live_cycles=[[live_match(1, 0, 0), live_match(2, 1, 1)],
+                     [live_match(1, 1, 0)]],
+        ended={'2': live_match(2, 2, 1, 'FINISHED')}
+    )
+    poller = LivePoller(scraper, db)
+    received = []
+    poller.subscribe(lambda event_type, event: received.append(event))
+
+    first = poller.poll_once()
+    assert event_types(first) == [('1', 'match_live'), ('2', 'match_live')]
+
+    second = poller.poll_once()
+
+    assert event_types(second) == [('1', 'score_change'), ('2', 'match_ended'), ('2', 'score_change')]
+    assert scraper.requested_ids == [['2']]
+    assert received == first + second
+    goal = next(event for event in second if event['match_id'] == '1')
+    assert (goal['home_score'], goal['away_score']) == (1, 0)
+    assert goal['details'] == {'previous_home_score': 0, 'previous_away_score': 0}
+    ended = next(event for event in second if event['event_type'] == 'match_ended')
+    assert ended['status'] == 'FINISHED'
+    assert ended['details'] == {'previous_status': 'IN_PLAY'}
+
+    # Seul le match encore en cours reste suivi
+    assert list(poller.state) == ['1']
+    assert poller.next_interval() == poller.poll_interval
+
+
+def test_events_and_matches_written_to_database(db, live_match):
+    scraper = StubScraper(
+        live_cycles=[[live_match(1, 0, 0), live_match(2, 1, 1)], [live_match(1, 1, 0)]],
+        ended={'2': live_match(2, 2, 1, 'FINISHED')}
+    )
+    poller = LivePoller(scraper, db)
+
+    poller.poll_once()
+    poller.poll_once()
+
+    rows = db.get_match_events(limit=10)
+    assert sorted((row['match_id'], row['event_type']) for row in rows) == [
+        ('1', 'match_live'), ('1', 'score_change'),
+        ('2', 'match_ended'), ('2', 'match_live'), ('2', 'score_change')
+    ]
+    ended = next(row for row in rows if row['event_type'] == 'match_ended')
+    assert (ended['home_score'], ended['away_score'], ended['status']) == (2, 1, 'FINISHED')
+    assert json.loads(ended['details']) == {'previous_status': 'IN_PLAY'}
+
+    stored = {match['id']: match for match in db.get_matches(limit=10, columns=['id', 'home_score', 'status'])}
+    assert stored['1']['home_score'] == 1
+    assert stored['2'] == {'id': '2', 'home_score': 2, 'status': 'finished'}
+
+
+def test_unchanged_cycle_emits_nothing(live_match):
+    scraper = StubScraper(live_cycles=[[live_match(1, 0, 0)], [live_match(1, 0, 0)]])
+    poller = LivePoller(scraper)
+
+    poller.poll_once()
+
+    assert poller.poll_once() == []
+
+
+def test_status_change_at_half_time(live_match):
+    scraper = StubScraper(live_cycles=[[live_match(1, 0, 0)], [live_match(1, 0, 0, 'PAUSED')]])
+    poller = LivePoller(scraper)
+
+    poller.poll_once()
+    events = poller.poll_once()
+
+    assert event_types(events) == [('1', 'status_change')]
+
+
+def test_ended_fetch_failure_keeps_tracking(live_match):
+    scraper = StubScraper(live_cycles=[[live_match(1, 0, 0)], []], fail_ended=True)
+    poller = LivePoller(scraper)
+
+    poller.poll_once()
+    events = poller.poll_once()
+
+    assert events == []
+    assert list(poller.state) == ['1']
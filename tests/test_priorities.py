@@ -0,0 +1,132 @@
+# test_priorities.py
+import threading
+import time
+
+from config import Config
+from priorities import RequestScheduler, _Ticket, current_request_context, request_priority
+
+
+class FakeKeyPool:
+    """Pool de clés dont les jetons sont distribués à la main par le test"""
+
+    def __init__(self, tokens=0):
+        self.tokens = tokens
+        self._lock = threading.Lock()
+
+    def give(self, count=1):
+        with self._lock:
+            self.tokens += count
+
+    def reserve(self):
+        with self._lock:
+            if self.tokens > 0:
+                self.tokens -= 1
+                return 'key', 0.0
+            return None, 0.01
+
+
+def ticket(kind, championship=None, seq=0, waited=0.0, now=1000.0):
+    queued = _Ticket(kind, Config.REQUEST_PRIORITIES[kind], championship, seq)
+    queued.enqueued_at = now - waited
+    return queued
+
+
+def test_ranks_follow_requested_order():
+    ranks = Config.REQUEST_PRIORITIES
+    assert ranks['live'] < ranks['fixtures'] < ranks['standings'] < ranks['interactive'] < ranks['backfill']
+
+
+def test_request_priority_nests_and_restores():
+    assert current_request_context() == ('interactive', None)
+    with request_priority('backfill', 'Ligue 1'):
+        with request_priority(championship='Serie A'):
+            assert current_request_context() == ('backfill', 'Serie A')
+        assert current_request_context() == ('backfill', 'Ligue 1')
+    assert current_request_context() == ('interactive', None)
+
+
+def test_head_is_most_urgent_kind():
+    scheduler = RequestScheduler(FakeKeyPool())
+    scheduler._waiting = [ticket('backfill', seq=0), ticket('standings', seq=1),
+                          ticket('live', seq=2), ticket('interactive', seq=3)]
+
+    assert scheduler._head(1000.0).kind == 'live'
+
+
+def test_same_kind_served_in_arrival_order():
+    scheduler = RequestScheduler(FakeKeyPool())
+    scheduler._waiting = [ticket('interactive', seq=5), ticket('interactive', seq=2)]
+
+    assert scheduler._head(1000.0).seq == 2
+
+
+def test_aging_promotes_waiting_backfill(monkeypatch):
+    monkeypatch.setattr(Config, 'PRIORITY_AGING_SECONDS', 30)
+    scheduler = RequestScheduler(FakeKeyPool())
+    backfill = ticket('backfill', seq=0, waited=31)
+    interactive = ticket('interactive', seq=1)
+
+    # Un cran gagné: à égalité, l'ordre d'arrivée départage
+    scheduler._waiting = [interactive, backfill]
+    assert scheduler._head(1000.0) is backfill
+
+    backfill.enqueued_at = 1000.0 - 29
+    assert scheduler._head(1000.0) is interactive
+
+
+def test_least_served_championship_goes_first():
+    scheduler = RequestScheduler(FakeKeyPool())
+    scheduler._recent.extend([(990.0, 'Ligue 1'), (995.0, 'Ligue 1'), (996.0, 'Serie A')])
+    scheduler._waiting = [ticket('backfill', 'Ligue 1', seq=0), ticket('backfill', 'Serie A', seq=1),
+                          ticket('backfill', 'La Liga', seq=2)]
+
+    assert scheduler._head(1000.0).championship == 'La Liga'
+
+
+def test_fairness_window_is_one_minute():
+    scheduler = RequestScheduler(FakeKeyPool())
+    scheduler._recent.extend([(900.0, 'Ligue 1'), (900.0, 'Ligue 1'), (990.0, 'Serie A')])
+    scheduler._waiting = [ticket('backfill', 'Serie A', seq=0), ticket('backfill', 'Ligue 1', seq=1)]
+
+    assert scheduler._head(1000.0).championship == 'Ligue 1'
+    assert scheduler._recent_grants(1000.0) == {'Serie A': 1}
+
+
+def test_acquire_grants_tokens_by_priority():
+    pool = FakeKeyPool()
+    scheduler = RequestScheduler(pool)
+    granted = []
+    kinds = ['backfill', 'interactive', 'standings', 'live', 'fixtures']
+
+    def request(kind):
+        with request_priority(kind):
+            scheduler.acquire()
+        granted.append(kind)
+
+    threads = [threading.Thread(target=request, args=(kind,)) for kind in kinds]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while sum(scheduler.get_queue_stats().values()) < len(kinds):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    for served in range(1, len(kinds) + 1):
+        pool.give()
+        while len(granted) < served:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert granted == ['live', 'fixtures', 'standings', 'interactive', 'backfill']
+    assert scheduler.get_queue_stats() == {}
+
+
+def test_acquire_returns_immediately_with_tokens():
+    scheduler = RequestScheduler(FakeKeyPool(tokens=1))
+
+    with request_priority('backfill', 'Ligue 1'):
+        assert scheduler.acquire() == 'key'
+    assert scheduler._recent_grants(time.monotonic()) == {'Ligue 1': 1}
+
@@ -0,0 +1,104 @@
+# test_rate_limiter.py
+import pytest
+
+from scraper import RateLimiter
+
+
+def quota_headers(available, reset=60):
+    return {'X-Requests-Available-Minute': str(available), 'X-RequestCounter-Reset': str(reset)}
+
+
+def test_reserve_consumes_tokens_then_waits():
+    limiter = RateLimiter(2)
+
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.in_flight == 2
+    # Seau vide: environ 30 s pour un jeton à 2 requêtes / minute
+    assert limiter.reserve() == pytest.approx(30.0, rel=0.01)
+
+
+def test_release_ends_request_without_refund():
+    limiter = RateLimiter(2)
+    limiter.reserve()
+
+    limiter.release()
+
+    assert limiter.in_flight == 0
+    assert limiter.tokens == pytest.approx(1.0, abs=0.01)
+
+
+def test_headers_align_tokens_on_server_minus_in_flight():
+    limiter = RateLimiter(10)
+    for _ in range(3):
+        limiter.reserve()
+
+    # Réponse de la 1re requête: 9 restantes côté serveur, 2 encore en vol
+    limiter.update_from_headers(quota_headers(9), 200)
+
+    assert limiter.in_flight == 2
+    assert limiter.tokens == 7
+    assert limiter.reset_at is not None
+
+
+def test_in_flight_requests_do_not_raise_capacity():
+    limiter = RateLimiter(10)
+    for _ in range(5):
+        limiter.reserve()
+
+    limiter.update_from_headers(quota_headers(9), 200)
+    limiter.update_from_headers(quota_headers(8), 200)
+
+    assert limiter.capacity == 10
+    assert limiter.tokens <= limiter.capacity
+
+
+def test_capacity_follows_largest_quota_seen():
+    limiter = RateLimiter(10)
+
+    limiter.reserve()
+    limiter.update_from_headers(quota_headers(29), 200)
+    assert limiter.capacity == 30
+
+    # Une valeur plus basse plus tard dans la fenêtre ne réduit pas le quota
+    limiter.reserve()
+    limiter.update_from_headers(quota_headers(3), 200)
+    assert limiter.capacity == 30
+    assert limiter.tokens == 3
+
+
+def test_late_response_does_not_refund_tokens():
+    limiter = RateLimiter(10)
+    for _ in range(4):
+        limiter.reserve()
+
+    # 6 restantes côté serveur, 3 requêtes encore en vol
+    limiter.update_from_headers(quota_headers(6), 200)
+    assert limiter.tokens == 3
+
+    # Réponse d'une requête partie plus tôt, arrivée après
+    limiter.update_from_headers(quota_headers(8), 200)
+    assert limiter.tokens == 3
+
+
+def test_429_blocks_until_announced_reset():
+    limiter = RateLimiter(10)
+    limiter.reserve()
+
+    limiter.update_from_headers({'Retry-After': '42'}, 429)
+
+    assert limiter.tokens == 0
+    assert limiter.capacity == 10
+    assert limiter.reserve() == pytest.approx(42.0, abs=0.5)
+
+
+def test_refill_to_capacity_after_reset():
+    limiter = RateLimiter(10)
+    limiter.reserve()
+    limiter.update_from_headers(quota_headers(0, reset=5), 200)
+    assert limiter.reserve() > 0
+
+    limiter.reset_at -= 10
+
+    assert limiter.reserve() == 0.0
+    assert limiter.tokens == limiter.capacity - 1
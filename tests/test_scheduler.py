@@ -0,0 +1,167 @@
+# test_scheduler.py
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from config import Config
+from scheduler import FixtureScheduler, ISO_FORMAT
+
+NOW = datetime(2025, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+def at(hours=0, minutes=0):
+    return NOW + timedelta(hours=hours, minutes=minutes)
+
+
+def fixture(kickoff, status='scheduled', matchday=27, championship='Ligue 1'):
+    return {'date': kickoff.strftime(ISO_FORMAT), 'status': status, 'matchday': matchday,
+            'championship': championship}
+
+
+class StubDatabase:
+    def __init__(self, fixtures=()):
+        self.fixtures = list(fixtures)
+        self.saved_standings = []
+
+    def get_fixtures(self, date_from, date_to, championships=None):
+        return [item for item in self.fixtures if date_from <= item['date'] <= date_to]
+
+    def save_standings(self, championship, standings):
+        self.saved_standings.append((championship, standings))
+        return True
+
+
+class StubScraper:
+    def __init__(self, standings=()):
+        self.standings = list(standings)
+
+    def get_standings(self, championship):
+        return self.standings
+
+
+@pytest.fixture
+def make_scheduler():
+    def make(fixtures=(), standings=()):
+        return FixtureScheduler(StubScraper(standings), StubDatabase(fixtures), ['Ligue 1'])
+    return make
+
+
+def tasks_of(tasks, kind):
+    return [task for task in tasks if task.kind == kind]
+
+
+def test_overlapping_live_windows_are_merged(make_scheduler):
+    scheduler = make_scheduler([fixture(at(2)), fixture(at(3)), fixture(at(8))])
+
+    windows = tasks_of(scheduler.plan(NOW), 'live_window')
+
+    pre_kickoff = timedelta(minutes=Config.SCHEDULER_PRE_KICKOFF)
+    duration = timedelta(minutes=Config.SCHEDULER_MATCH_DURATION)
+    assert [(task.run_at, task.until) for task in windows] == [
+        (at(2) - pre_kickoff, at(3) + duration),
+        (at(8) - pre_kickoff, at(8) + duration)
+    ]
+
+
+def test_window_in_progress_starts_now(make_scheduler):
+    scheduler = make_scheduler([fixture(at(minutes=-30), status='live')])
+
+    window, = tasks_of(scheduler.plan(NOW), 'live_window')
+
+    assert window.run_at == NOW
+    assert window.until == at(minutes=-30 + Config.SCHEDULER_MATCH_DURATION)
+
+
+def test_standings_after_last_match_of_matchday(make_scheduler):
+    scheduler = make_scheduler([fixture(at(2)), fixture(at(5)), fixture(at(4), matchday=28)])
+
+    standings = {task.key: task.run_at for task in tasks_of(scheduler.plan(NOW), 'standings')}
+
+    delay = timedelta(minutes=Config.SCHEDULER_MATCH_DURATION + Config.SCHEDULER_STANDINGS_DELAY)
+    assert standings == {
+        'standings:Ligue 1:27:2025-03-15': at(5) + delay,
+        'standings:Ligue 1:28:2025-03-15': at(4) + delay
+    }
+
+
+def test_open_matchday_past_due_waits_for_delay(make_scheduler):
+    # Match fini depuis longtemps mais pas encore clôturé en base
+    scheduler = make_scheduler([fixture(at(-6), status='live')])
+
+    task, = tasks_of(scheduler.plan(NOW), 'standings')
+
+    assert task.run_at == at(minutes=Config.SCHEDULER_STANDINGS_DELAY)
+
+
+def test_empty_standings_are_retried_later(make_scheduler):
+    scheduler = make_scheduler([fixture(at(-5), status='finished')])
+    task, = tasks_of(scheduler.plan(NOW), 'standings')
+    assert task.run_at <= NOW
+
+    executed_at = datetime.now(timezone.utc)
+    scheduler.execute(task, None)
+
+    assert task.key not in scheduler.done
+    retried, = tasks_of(scheduler.plan(NOW), 'standings')
+    assert retried.key == task.key
+    # Nouvel essai SCHEDULER_STANDINGS_DELAY après l'échec (horloge réelle d'exécution)
+    assert retried.run_at >= executed_at + timedelta(minutes=Config.SCHEDULER_STANDINGS_DELAY)
+
+
+def test_saved_standings_mark_matchday_done(make_scheduler):
+    scheduler = make_scheduler([fixture(at(-5), status='finished')], standings=[{'team': 'PSG'}])
+    task, = tasks_of(scheduler.plan(NOW), 'standings')
+
+    scheduler.execute(task, None)
+
+    assert scheduler.db.saved_standings == [('Ligue 1', [{'team': 'PSG'}])]
+    assert tasks_of(scheduler.plan(NOW), 'standings') == []
+
+
+def test_done_keys_pruned_after_lookback(make_scheduler):
+    scheduler = make_scheduler([fixture(at(-5), status='finished')], standings=[{'team': 'PSG'}])
+    task, = tasks_of(scheduler.plan(NOW), 'standings')
+    scheduler.execute(task, None)
+    assert scheduler.done == {task.key}
+
+    # Deux jours plus tard, la journée est hors de la période relue
+    scheduler.db.fixtures.append(fixture(at(50)))
+    scheduler.plan(at(48))
+
+    assert scheduler.done == set()
+
+
+def test_fixtures_refresh_interval(make_scheduler):
+    scheduler = make_scheduler([fixture(at(2))])
+
+    assert tasks_of(scheduler.plan(NOW), 'fixtures')[0].run_at == NOW
+
+    scheduler.last_fixtures_refresh = at(-1)
+    refresh, = tasks_of(scheduler.plan(NOW), 'fixtures')
+    assert refresh.run_at == at(-1) + timedelta(minutes=Config.SCHEDULER_FIXTURES_INTERVAL)
+
+
+def test_stale_fixture_triggers_immediate_refresh(make_scheduler):
+    # Match censé fini il y a une heure, toujours 'live' en base
+    kickoff = at(minutes=-60 - Config.SCHEDULER_MATCH_DURATION)
+    scheduler = make_scheduler([fixture(kickoff, status='live')])
+    scheduler.last_fixtures_refresh = at(-3)
+
+    tasks = scheduler.plan(NOW)
+
+    assert tasks_of(tasks, 'live_window') == []
+    assert tasks_of(tasks, 'fixtures')[0].run_at == NOW
+
+    # Déjà rafraîchi après la fin estimée: cadence normale
+    scheduler.last_fixtures_refresh = at(minutes=-30)
+    refresh, = tasks_of(scheduler.plan(NOW), 'fixtures')
+    assert refresh.run_at == at(minutes=-30 + Config.SCHEDULER_FIXTURES_INTERVAL)
+
+
+def test_plan_sorted_by_run_at(make_scheduler):
+    scheduler = make_scheduler([fixture(at(8)), fixture(at(2), matchday=28)])
+    scheduler.last_fixtures_refresh = NOW
+
+    tasks = scheduler.plan(NOW)
+
+    assert [task.run_at for task in tasks] == sorted(task.run_at for task in tasks)
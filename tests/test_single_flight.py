@@ -0,0 +1,95 @@
+# test_single_flight.py
+import threading
+import time
+
+from scraper import SingleFlight
+
+CALLERS = 8
+
+
+def run_concurrently(flight, key, fn):
+    """Lancer CALLERS appels de la même clé; renvoie (résultats, exceptions)"""
+    results, errors = [], []
+    lock = threading.Lock()
+
+    def call():
+        try:
+            result = flight.do(key, fn)
+            with lock:
+                results.append(result)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def blocking_call(flight, key, outcome):
+    """Fonction qui attend que tous les appelants aient rejoint l'appel en vol"""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        deadline = time.monotonic() + 5
+        while flight._calls[key].waiters < CALLERS - 1:
+            assert time.monotonic() < deadline
+            time.sleep(0.005)
+        return outcome()
+
+    return fn, calls
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    fn, calls = blocking_call(flight, 'matches', lambda: {'count': 3})
+
+    results, errors = run_concurrently(flight, 'matches', fn)
+
+    assert calls == [1]
+    assert errors == []
+    assert len(results) == CALLERS
+    assert all(result is results[0] for result in results)
+
+
+def test_error_reaches_every_waiter_and_is_not_kept():
+    flight = SingleFlight()
+
+    def fail():
+        raise ConnectionError("API indisponible")
+
+    fn, calls = blocking_call(flight, 'matches', fail)
+
+    results, errors = run_concurrently(flight, 'matches', fn)
+
+    assert calls == [1]
+    assert results == []
+    assert len(errors) == CALLERS
+    assert all(isinstance(error, ConnectionError) for error in errors)
+
+    # L'échec n'est pas mis en cache: l'appel suivant repart vers la fonction
+    assert flight._calls == {}
+    assert flight.do('matches', lambda: 'rétabli') == 'rétabli'
+
+
+def test_result_not_kept_after_the_call():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return len(calls)
+
+    assert flight.do('standings', fn) == 1
+    assert flight.do('standings', fn) == 2
+
+
+def test_distinct_keys_do_not_share():
+    flight = SingleFlight()
+
+    assert flight.do('a', lambda: 'a') == 'a'
+    assert flight.do('b', lambda: 'b') == 'b'